@@ -5,16 +5,35 @@ Data Ingestion Agent for Mutual Funds.
 Responsible for maintaining an always up-to-date dataset of the fund universe.
 Fetches real AMFI data via ai_layer and enriches it with metrics required
 for the quality filter (expense ratio, AUM, etc).
+
+The sync is incremental: the new AMFI snapshot is diffed against the
+previously published universe by ``scheme_code``, and only added or renamed
+schemes are re-categorized and get fresh fundamentals (the only inputs those
+depend on are the code and the name). Unchanged schemes keep their category,
+AUM and expense ratio and take today's raw AMFI fields. Performance metrics
+and risk follow the NAV history, so they are re-applied to the whole
+universe on every sync (a vectorized lookup). The simulated fundamentals are
+a deterministic function of the scheme code, so a scheme keeps the same
+values from one sync to the next regardless of row order.
 """
 
 import logging
+import re
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 import os
 
+from backend.data.benchmark_indices import fetch_benchmark_series
+from backend.data.fund_universe_store import publish_fund_universe
 from backend.data.mutual_fund_api import get_mutual_fund_universe
+from backend.data.nav_history_store import get_nav_history_store
+from backend.engines.fund_metrics_engine import update_running_metrics
 from backend.engines.fund_categorizer import categorize_funds
+from backend.engines.benchmark_analytics_engine import publish_benchmark_analytics
+from backend.engines.intelligence.minhash_index import publish_similarity_index
 from backend.engines.fund_performance_engine import apply_performance_metrics
 
 logger = logging.getLogger(__name__)
@@ -23,85 +42,266 @@ logger = logging.getLogger(__name__)
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
 FUNDS_DATA_FILE = os.path.join(DATA_DIR, "mutual_funds.csv")
 
+# AMCs with large systemic AUM generally
+LARGE_AMCS = ["SBI", "HDFC", "ICICI", "Nippon", "Kotak", "Axis"]
+
+REQUIRED_COLUMNS = ["scheme_name", "category", "1y", "3y", "5y", "volatility", "aum_crore", "expense_ratio"]
+# Derived from scheme_code / scheme_name only, so carried over for unchanged schemes
+STATIC_COLUMNS = ("category", "aum_crore", "expense_ratio")
+
+
+def _uniform(scheme_codes: pd.Series, salt: str, low: float, high: float) -> np.ndarray:
+    """
+    Deterministic pseudo-random draw in ``[low, high)`` per scheme code
+    (SipHash of the code under a per-field 16-byte key).
+    """
+    keys = scheme_codes.astype(str).to_numpy(dtype=object)
+    hashed = pd.util.hash_array(keys, hash_key=salt.ljust(16, "0")[:16])
+    unit = (hashed >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+    return low + unit * (high - low)
+
+
+def assign_aum(df: pd.DataFrame) -> np.ndarray:
+    """AUM in crores: larger ranges for the big AMCs."""
+    # The AMC names are matched as written against the upper-cased scheme
+    # name, as the original rule did: only the all-caps ones (SBI, HDFC,
+    # ICICI) ever match, and the simulated AUM bands depend on that
+    is_large = df["scheme_name"].astype(str).str.upper().str.contains(
+        "|".join(re.escape(amc) for amc in LARGE_AMCS), regex=True, na=False
+    ).to_numpy()
+    return np.where(
+        is_large,
+        np.round(_uniform(df["scheme_code"], "aum-large", 10000, 80000), 2),
+        np.round(_uniform(df["scheme_code"], "aum-small", 100, 5000), 2),
+    )
+
+
+def assign_expense_ratio(df: pd.DataFrame) -> np.ndarray:
+    """Expense ratio: different categories have different average ERs."""
+    category = df["category"].astype(str).str.lower()
+    draw = _uniform(df["scheme_code"], "expense-ratio", 0.0, 1.0)
+    return np.round(
+        np.select(
+            [
+                category.str.contains("debt|liquid", regex=True).to_numpy(),
+                category.str.contains("index|etf", regex=True).to_numpy(),
+            ],
+            [0.1 + draw * 0.7, 0.05 + draw * 0.35],
+            default=0.5 + draw * 2.0,
+        ),
+        2,
+    )
+
+
+def assign_risk(df: pd.DataFrame) -> np.ndarray:
+    """Explicit risk category based on category & volatility."""
+    category = df["category"].astype(str).str.lower()
+    volatility = pd.to_numeric(df["volatility"], errors="coerce").to_numpy(dtype=np.float64)
+    return np.select(
+        [category.str.contains("debt|liquid", regex=True).to_numpy(), volatility < 0.12],
+        ["low", "moderate"],
+        default="high",
+    )
+
+
+def assign_fundamentals(df: pd.DataFrame) -> pd.DataFrame:
+    """Category, AUM and expense ratio: functions of the scheme code and name only."""
+    df = categorize_funds(df)
+
+    # Derive simulated fundamentals mimicking Moneycontrol data
+    # In a fully productionized web-scraping setup, this would be scraped.
+    # Here we simulate true-to-life realistic parameters per AMC size.
+    df["aum_crore"] = assign_aum(df)
+    df["expense_ratio"] = assign_expense_ratio(df)
+    return df
+
+
+def apply_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Performance metrics, ranking score and risk (they follow the NAV history)."""
+    # Enhance with 1y, 3y, 5y returns and volatility
+    # Using the existing performace engine mapping logic (simulated from index proxies over AMFI)
+    df = apply_performance_metrics(df)
+
+    # Ensure all required features are present
+    for col in REQUIRED_COLUMNS:
+        if col not in df.columns:
+            df[col] = 0.0 if col != "category" else "Unknown"
+
+    df["risk"] = assign_risk(df)
+    return df
+
+
+def enrich_funds(df: pd.DataFrame) -> pd.DataFrame:
+    """Categorize raw AMFI rows and derive fundamentals, performance metrics and risk."""
+    return apply_metrics(assign_fundamentals(df))
+
+
+@dataclass(frozen=True)
+class UniverseDelta:
+    added: int
+    changed: int
+    removed: int
+    stale: np.ndarray  # mask over the new snapshot: rows that need fresh fundamentals
+
+
+def _by_scheme_code(previous: pd.DataFrame) -> pd.DataFrame:
+    previous = previous.drop_duplicates("scheme_code", keep="first")
+    return previous.set_index(previous["scheme_code"].astype(str))
+
+
+def diff_fund_universe(previous: pd.DataFrame, current: pd.DataFrame) -> UniverseDelta:
+    """
+    Compare the new AMFI snapshot with the previous universe by
+    ``scheme_code``. A scheme is stale when it is new or was renamed: the
+    name is the only input (besides the code) that the category and the
+    simulated fundamentals depend on. NAV moves are not a change here.
+    """
+    prev = _by_scheme_code(previous)
+    codes = current["scheme_code"].astype(str)
+    position = prev.index.get_indexer(codes)
+    known = position >= 0
+
+    old_name = prev["scheme_name"].astype(str).to_numpy(dtype=object)[position[known]]
+    new_name = current["scheme_name"].astype(str).to_numpy(dtype=object)[known]
+    renamed = old_name != new_name
+
+    stale = ~known
+    stale[np.flatnonzero(known)[renamed]] = True
+    return UniverseDelta(
+        added=int((~known).sum()),
+        changed=int(renamed.sum()),
+        removed=int(len(prev) - len(np.unique(position[known]))),
+        stale=stale,
+    )
+
+
+def load_previous_universe(path: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    The last synced universe, or None when there is none or it lacks the
+    enriched columns (which forces a full rebuild). Read from the CSV export
+    because it keeps the metrics at full precision.
+    """
+    path = path or FUNDS_DATA_FILE
+    if not os.path.exists(path):
+        return None
+    try:
+        previous = pd.read_csv(path, dtype={"scheme_code": str})
+    except Exception as e:
+        logger.warning(f"[FundDataAgent] Could not read previous universe, rebuilding in full: {e}")
+        return None
+    missing = {"scheme_code", "scheme_name", *STATIC_COLUMNS} - set(previous.columns)
+    if previous.empty or missing:
+        return None
+    return previous
+
+
+def merge_incremental(previous: pd.DataFrame, current: pd.DataFrame, delta: UniverseDelta) -> pd.DataFrame:
+    """
+    Fundamentals for the stale rows of ``current`` only; the rest keep the
+    previous ``STATIC_COLUMNS`` and take today's raw AMFI fields. Metrics
+    and risk are then applied to the whole universe.
+    """
+    unchanged = current.loc[~delta.stale]
+    prev = _by_scheme_code(previous)
+    carried = prev.loc[unchanged["scheme_code"].astype(str), list(STATIC_COLUMNS)]
+    carried.index = unchanged.index
+    carried = pd.concat([unchanged, carried], axis=1)
+
+    parts = [carried]
+    if delta.stale.any():
+        parts.append(assign_fundamentals(current.loc[delta.stale].copy()))
+    merged = apply_metrics(pd.concat(parts, ignore_index=True))
+    return merged[[c for c in dict.fromkeys([*previous.columns, *merged.columns]) if c in merged.columns]]
+
+
 class FundDataAgent:
     @staticmethod
-    def run() -> dict:
+    def run(full_refresh: bool = False) -> dict:
         """
-        Fetch the latest mutual fund universe, enrich with fundamentals, and persist.
+        Fetch the latest mutual fund universe, enrich new or changed schemes
+        with fundamentals, and publish. ``full_refresh`` re-enriches every
+        scheme (e.g. after changing the categorization rules).
         Returns a meta-dictionary about the sync.
         """
         logger.info("[FundDataAgent] Initiating daily fund data sync...")
-        
-        # 1. Fetch live AMFI NAVs and map to categories
+
+        # 1. Fetch live AMFI NAVs
         df, is_live = get_mutual_fund_universe()
         if df is None or df.empty:
             logger.error("Failed to fetch mutual fund universe.")
             return {"status": "error", "message": "Failed to fetch universe"}
-        
-        # Categorize to get 'category' column
-        df = categorize_funds(df)
-        
-        # 2. Derive simulated fundamentals mimicking Moneycontrol data
-        # In a fully productionized web-scraping setup, this would be scraped.
-        # Here we simulate true-to-life realistic parameters per AMC size.
-        np.random.seed(42)  # For reproducible simulation
-        
-        # AMCs with large systemic AUM generally
-        large_amcs = ["SBI", "HDFC", "ICICI", "Nippon", "Kotak", "Axis"]
-        
-        def assign_aum(scheme: str) -> float:
-            is_large = any(amc in str(scheme).upper() for amc in large_amcs)
-            # AUM in Crores
-            if is_large:
-                return round(np.random.uniform(10000, 80000), 2)
-            return round(np.random.uniform(100, 5000), 2)
-            
-        def assign_expense_ratio(category: str) -> float:
-            # Different categories have different average ERs
-            category = str(category).lower()
-            if "debt" in category or "liquid" in category:
-                return round(np.random.uniform(0.1, 0.8), 2)
-            elif "index" in category or "etf" in category:
-                return round(np.random.uniform(0.05, 0.4), 2)
-            else:
-                return round(np.random.uniform(0.5, 2.5), 2)
-
-        df["aum_crore"] = df["scheme_name"].apply(assign_aum)
-        df["expense_ratio"] = df["category"].apply(assign_expense_ratio)
-        
-        # 3. Enhance with 1y, 3y, 5y returns and volatility
-        # Using the existing performace engine mapping logic (simulated from index proxies over AMFI)
-        df = apply_performance_metrics(df)
-        
-        # Ensure all required features are present
-        required_cols = ["scheme_name", "category", "1y", "3y", "5y", "volatility", "aum_crore", "expense_ratio"]
-        for col in required_cols:
-            if col not in df.columns:
-                df[col] = 0.0 if col != "category" else "Unknown"
-        
-        # Determine explicit risk category based on category & volatility
-        def assign_risk(row) -> str:
-            cat = str(row["category"]).lower()
-            if "debt" in cat or "liquid" in cat:
-                return "low"
-            elif row["volatility"] < 0.12:
-                return "moderate"
-            else:
-                return "high"
-                
-        df["risk"] = df.apply(assign_risk, axis=1)
-        
-        # 4. Save to CSV
+
+        # Persist today's NAVs into the per-scheme history (append-only) and
+        # fold the settled days into the running metrics
+        try:
+            nav_store = get_nav_history_store(readonly=False)
+            nav_store.append_snapshot(df["date"], df["scheme_code"], df["nav"])
+            update_running_metrics(nav_store, written_from=nav_store.last_written_from)
+        except Exception as e:
+            logger.error(f"[FundDataAgent] Failed to append NAV history: {e}")
+
+        # 2. Diff against the previous universe; new or renamed schemes get fundamentals
+        previous = None if full_refresh else load_previous_universe()
+        if previous is None:
+            delta = UniverseDelta(added=len(df), changed=0, removed=0, stale=np.ones(len(df), dtype=bool))
+            df = enrich_funds(df.copy())
+        else:
+            delta = diff_fund_universe(previous, df)
+            df = merge_incremental(previous, df, delta)
+        logger.info(
+            f"[FundDataAgent] {delta.added} added, {delta.changed} changed, "
+            f"{delta.removed} removed, {len(df) - int(delta.stale.sum())} carried over"
+        )
+
+        # 3. Benchmark-relative analytics (beta, tracking error, IR, alpha) per scheme
+        try:
+            fetch_benchmark_series()
+            publish_benchmark_analytics(df)
+        except Exception as e:
+            logger.error(f"[FundDataAgent] Benchmark analytics refresh failed: {e}")
+
+        # 4. Save to CSV — write aside and rename so in-process universe
+        #    stores never parse a half-written file
         os.makedirs(DATA_DIR, exist_ok=True)
-        df.to_csv(FUNDS_DATA_FILE, index=False)
-        
+        tmp_path = f"{FUNDS_DATA_FILE}.tmp"
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, FUNDS_DATA_FILE)
+
+        # 5. Publish the binary columnar snapshot that readers memory-map;
+        #    its version id is what FundUniverseStore watches
+        snapshot_version = None
+        try:
+            snapshot_version = publish_fund_universe(
+                df,
+                meta={
+                    "is_live_amfi": is_live,
+                    "added": delta.added,
+                    "changed": delta.changed,
+                    "removed": delta.removed,
+                },
+            )
+        except Exception as e:
+            logger.error(f"[FundDataAgent] Failed to publish fund universe snapshot: {e}")
+
+        # 6. MinHash signatures of the scheme names, so recommendations skip share-class variants
+        similarity_version = None
+        try:
+            similarity_version = publish_similarity_index(df)
+        except Exception as e:
+            logger.error(f"[FundDataAgent] Failed to publish similarity index: {e}")
+
         logger.info(f"[FundDataAgent] Successfully synced {len(df)} funds to {FUNDS_DATA_FILE}")
-        
+
         return {
             "status": "success",
             "funds_count": len(df),
             "timestamp": datetime.now().isoformat(),
-            "is_live_amfi": is_live
+            "is_live_amfi": is_live,
+            "snapshot_version": snapshot_version,
+            "similarity_version": similarity_version,
+            "added": delta.added,
+            "changed": delta.changed,
+            "removed": delta.removed,
         }
 
 # Singleton instance
@@ -13,6 +13,8 @@ from fastapi.responses import JSONResponse
 from ai_agents.db import storage
 from ai_agents.tasks import run_pipeline
 from ai_agents.config.celery_config import REDIS_URL
+from backend.utils.circuit_breaker import source_health
+from data.cache.tiered_cache import get_intelligence_cache
 import redis
 
 logger = logging.getLogger(__name__)
@@ -38,7 +40,13 @@ async def health_check():
         cache_status = "ok" if _redis and _redis.ping() else "down"
     except Exception:
         cache_status = "down"
-    return {"status": "ok", "redis_cache": cache_status, "agent_version": "1.0"}
+    return {
+        "status": "ok",
+        "redis_cache": cache_status,
+        "agent_version": "1.0",
+        "data_sources": source_health(),
+        "intelligence_cache": get_intelligence_cache().stats(),
+    }
 
 @app.get("/live-advice")
 async def get_live_advice():
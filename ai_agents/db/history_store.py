@@ -0,0 +1,234 @@
+"""
+ai_agents/db/history_store.py
+─────────────────────────────
+Segmented, indexed history of pipeline runs.
+
+Records are appended to one NDJSON segment per day under ``HISTORY_DIR``;
+each segment has a sidecar index of fixed-width entries::
+
+    <day>.ndjson       ← records for that day (``<day>.ndjson.gz`` once rolled over)
+    <day>.idx          ← (timestamp µs, byte offset, length) per record
+
+"latest" reads the last index entry of the newest segment and seeks straight
+to that record. Time-range queries binary-search the per-segment indexes and
+read only the matching byte ranges. Segments from previous days are gzipped
+on rollover; index offsets refer to the uncompressed stream.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "history"))
+LEGACY_HISTORY_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "history.ndjson"))
+
+INDEX_DTYPE = np.dtype([("ts", "<i8"), ("offset", "<i8"), ("length", "<u4")])
+
+TimeLike = Union[str, date, datetime]
+
+
+def _to_micros(value: TimeLike) -> int:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return int(np.datetime64(value.replace(tzinfo=None), "us").astype(np.int64))
+
+
+def _day_of(value: TimeLike) -> str:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.strftime("%Y-%m-%d")
+
+
+class HistoryStore:
+    def __init__(self, root: str = HISTORY_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+
+    # ── Paths ────────────────────────────────────────────────────────────────
+
+    def _segment_path(self, day: str) -> str:
+        return os.path.join(self.root, f"{day}.ndjson")
+
+    def _index_path(self, day: str) -> str:
+        return os.path.join(self.root, f"{day}.idx")
+
+    def segments(self) -> List[str]:
+        """Days that have a segment, oldest first."""
+        try:
+            entries = os.listdir(self.root)
+        except OSError:
+            return []
+        return sorted(name[:-4] for name in entries if name.endswith(".idx"))
+
+    def _load_index(self, day: str) -> np.ndarray:
+        try:
+            return np.fromfile(self._index_path(day), dtype=INDEX_DTYPE)
+        except (OSError, ValueError):
+            return np.empty(0, dtype=INDEX_DTYPE)
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Append one record to its day's segment. Records carry an ISO
+        ``timestamp`` and are expected in time order (the pipeline's cadence).
+        """
+        timestamp = record.get("timestamp") or datetime.now().isoformat()
+        day = _day_of(timestamp)
+        line = (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            is_new_day = not os.path.exists(self._index_path(day))
+            with open(self._segment_path(day), "ab") as seg, open(self._index_path(day), "ab") as idx:
+                if fcntl is not None:
+                    fcntl.flock(seg.fileno(), fcntl.LOCK_EX)
+                try:
+                    seg.seek(0, os.SEEK_END)
+                    offset = seg.tell()
+                    seg.write(line)
+                    seg.flush()
+                    entry = np.array([(_to_micros(timestamp), offset, len(line))], dtype=INDEX_DTYPE)
+                    idx.write(entry.tobytes())
+                    idx.flush()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(seg.fileno(), fcntl.LOCK_UN)
+
+        if is_new_day:
+            self.compress_old_segments(keep=day)
+
+    def compress_old_segments(self, keep: Optional[str] = None) -> int:
+        """Gzip every uncompressed segment except ``keep`` (today's). Returns the count."""
+        compressed = 0
+        for day in self.segments():
+            path = self._segment_path(day)
+            if day == keep or not os.path.exists(path):
+                continue
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f".{day}-")
+            try:
+                with open(path, "rb") as src, os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp_path, path + ".gz")
+                os.unlink(path)
+                compressed += 1
+            except OSError as e:
+                logger.warning(f"[HistoryStore] Could not compress segment {day}: {e}")
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+        if compressed:
+            logger.info(f"[HistoryStore] Compressed {compressed} old segment(s)")
+        return compressed
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def _open_segment(self, day: str):
+        path = self._segment_path(day)
+        if os.path.exists(path):
+            return open(path, "rb")
+        return gzip.open(path + ".gz", "rb")
+
+    def _read_entries(self, day: str, entries: np.ndarray) -> Iterator[Dict[str, Any]]:
+        if len(entries) == 0:
+            return
+        start = int(entries["offset"][0])
+        end = int(entries["offset"][-1] + entries["length"][-1])
+        with self._open_segment(day) as fh:
+            fh.seek(start)
+            block = fh.read(end - start)
+        for offset, length in zip(entries["offset"].tolist(), entries["length"].tolist()):
+            rel = offset - start
+            yield json.loads(block[rel:rel + length])
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Most recent record via the newest index entry (one seek + one read)."""
+        for day in reversed(self.segments()):
+            index = self._load_index(day)
+            if len(index):
+                try:
+                    return next(self._read_entries(day, index[-1:]))
+                except (OSError, ValueError, StopIteration) as e:
+                    logger.error(f"[HistoryStore] Could not read latest record from {day}: {e}")
+                    return None
+        return None
+
+    def range(
+        self,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Records with ``start <= timestamp <= end`` in time order. ``fields``
+        limits each result to ``timestamp`` plus the named sections
+        (e.g. ``("signals",)``).
+        """
+        lo = _to_micros(start) if start is not None else np.iinfo(np.int64).min
+        hi = _to_micros(end) if end is not None else np.iinfo(np.int64).max
+        first_day = _day_of(start) if start is not None else None
+        last_day = _day_of(end) if end is not None else None
+
+        results: List[Dict[str, Any]] = []
+        for day in self.segments():
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            index = self._load_index(day)
+            i = int(np.searchsorted(index["ts"], lo, side="left"))
+            j = int(np.searchsorted(index["ts"], hi, side="right"))
+            for record in self._read_entries(day, index[i:j]):
+                if fields is not None:
+                    record = {"timestamp": record.get("timestamp"), **{f: record.get(f) for f in fields}}
+                results.append(record)
+        return results
+
+    def import_ndjson(self, path: str) -> int:
+        """One-off import of a flat NDJSON history file. Returns records imported."""
+        count = 0
+        with open(path, "r") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self.append(json.loads(line))
+                    count += 1
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"[HistoryStore] Skipping unreadable history line: {e}")
+        return count
+
+
+_default_store: Optional[HistoryStore] = None
+_default_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """
+    Process-wide store. On first use an existing flat ``history.ndjson`` is
+    imported into segments (the legacy file itself is left untouched).
+    """
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            store = HistoryStore(HISTORY_DIR)
+            if not store.segments() and os.path.exists(LEGACY_HISTORY_FILE):
+                imported = store.import_ndjson(LEGACY_HISTORY_FILE)
+                logger.info(f"[HistoryStore] Imported {imported} records from {LEGACY_HISTORY_FILE}")
+            _default_store = store
+        return _default_store
@@ -2,41 +2,27 @@
 ai_agents/db/storage.py
 ───────────────────────
 Persists system outputs for tracking.
-1. JSON lines on-disk storage
-2. Redis cache for instantaneous API retrieval
+1. Segmented, indexed on-disk history (see ai_agents/db/history_store.py)
+2. Shared intelligence cache (in-process L1 → Redis → file, see
+   data/cache/tiered_cache.py) for instantaneous API retrieval. The latest
+   record is stored one field per section, so readers that only need
+   ``signals`` fetch and decode just that.
 """
 
-import json
 import logging
-import os
 from datetime import datetime
-from typing import Any, Dict, Optional
-import redis
+from typing import Any, Dict, List, Optional, Sequence
 
-# Get REDIS_URL directly without importing celery_config which requires celery
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+from ai_agents.db.history_store import TimeLike, get_history_store
+from data.cache.tiered_cache import get_intelligence_cache
 
 logger = logging.getLogger(__name__)
 
 # Constants
-DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
-HISTORY_FILE = os.path.join(DATA_DIR, "history.ndjson")
-LATEST_KEY = "ai_agents:latest"
-
-# In-memory fallback for local development without Redis
-_LOCAL_FUND_CACHE = {}
-_REDIS_UNAVAILABLE_LOGGED = False
-
-# Redis Client
-try:
-    _redis = redis.Redis.from_url(REDIS_URL, decode_responses=True, socket_connect_timeout=1)
-    # Ping to verify connection immediately
-    _redis.ping()
-except Exception as e:
-    if not _REDIS_UNAVAILABLE_LOGGED:
-        logger.info("Redis unavailable — using in-memory cache")
-        _REDIS_UNAVAILABLE_LOGGED = True
-    _redis = None
+LATEST_NAME = "latest"
+RECORD_SECTIONS = ("timestamp", "market", "signals", "prediction", "decision")
+# Expire after 2 hours if scheduler dies
+LATEST_TTL_SECONDS = 7200
 
 
 def save(
@@ -46,8 +32,8 @@ def save(
     decision: Dict[str, Any]
 ) -> None:
     """
-    Store pipeline results in both JSON lines file (persistent)
-    and Redis cache (fast retrieval).
+    Store pipeline results in both the on-disk history (persistent)
+    and the intelligence cache (fast retrieval).
     """
     record = {
         "timestamp": datetime.now().isoformat(),
@@ -57,56 +43,78 @@ def save(
         "decision": decision,
     }
     
-    # 1. JSON on-disk
-    os.makedirs(DATA_DIR, exist_ok=True)
+    # 1. On-disk history
     try:
-        with open(HISTORY_FILE, "a") as f:
-            f.write(json.dumps(record) + "\n")
+        get_history_store().append(record)
     except Exception as e:
-        logger.error(f"Failed to write to JSON history: {e}")
+        logger.error(f"Failed to write to history store: {e}")
         
-    # 2. Redis cache (or local fallback)
-    if _redis:
-        try:
-            # Expire after 2 hours if scheduler dies
-            _redis.set(LATEST_KEY, json.dumps(record), ex=7200)
-            logger.info("[Storage] Saved results to Redis.")
-        except Exception as e:
-            logger.error(f"Failed to write to Redis: {e}")
-    else:
-        # Fallback to local in-memory dict
-        _LOCAL_FUND_CACHE[LATEST_KEY] = record
-        logger.debug("[Storage] Saved results to local in-memory cache.")
+    # 2. Intelligence cache: the record one section per field, plus signals on
+    #    their own persisted key for the file-backed fallback
+    try:
+        cache = get_intelligence_cache()
+        cache.set_sections(LATEST_NAME, record, ttl=LATEST_TTL_SECONDS)
+        cache.set("signals", signals)
+        logger.info("[Storage] Saved results to intelligence cache.")
+    except Exception as e:
+        logger.error(f"Failed to write to intelligence cache: {e}")
 
 
 def get_latest() -> Optional[Dict[str, Any]]:
     """
-    Retrieve latest from Redis. If Redis is down, fall back to JSON file.
+    Retrieve latest from the intelligence cache. If it has expired, fall back
+    to the newest record in the on-disk history.
     """
-    # 1. Try Redis
-    if _redis:
-        try:
-            val = _redis.get(LATEST_KEY)
-            if val:
-                return json.loads(val)
-        except Exception as e:
-            logger.error(f"Failed to read from Redis (falling back to file): {e}")
-    elif LATEST_KEY in _LOCAL_FUND_CACHE:
-        # 1b. Try local in-memory cache
-        return _LOCAL_FUND_CACHE[LATEST_KEY]
-
-    # 2. Try JSON file fallback (read last line efficiently)
-    if not os.path.exists(HISTORY_FILE):
-        return None
-        
     try:
-        # Simple read all lines and pick last. 
-        # For production with large files, use `tail` or seek.
-        with open(HISTORY_FILE, "r") as f:
-            lines = f.readlines()
-            if lines:
-                return json.loads(lines[-1].strip())
+        latest, _ = get_intelligence_cache().get_sections(LATEST_NAME, RECORD_SECTIONS)
+        if latest.get("timestamp"):
+            return latest
     except Exception as e:
-        logger.error(f"Failed to read from JSON history: {e}")
-        
+        logger.error(f"Failed to read from intelligence cache (falling back to file): {e}")
+
+    try:
+        return get_history_store().latest()
+    except Exception as e:
+        logger.error(f"Failed to read from history store: {e}")
     return None
+
+
+def get_section(section: str) -> Any:
+    """
+    One section of the latest record (e.g. ``"signals"``) without fetching
+    or decoding the others. Falls back to the newest on-disk record.
+    """
+    try:
+        cache = get_intelligence_cache()
+        value = cache.get_section(LATEST_NAME, section)
+        if value is not None:
+            return value
+    except Exception as e:
+        logger.error(f"Failed to read from intelligence cache (falling back to file): {e}")
+
+    try:
+        return (get_history_store().latest() or {}).get(section)
+    except Exception as e:
+        logger.error(f"Failed to read from history store: {e}")
+    return None
+
+
+def get_latest_version() -> Optional[int]:
+    """
+    Version stamp of the latest cached record. Cheap to poll: consumers can
+    compare it with the version they last processed and skip re-reading.
+    """
+    try:
+        return get_intelligence_cache().get_version(LATEST_NAME)
+    except Exception as e:
+        logger.error(f"Failed to read latest version: {e}")
+        return None
+
+
+def get_history(
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Pipeline records between ``start`` and ``end``, optionally limited to some sections."""
+    return get_history_store().range(start, end, fields=fields)
@@ -55,7 +55,7 @@ def get_live_intelligence(
         ``debt_delta``           – debt adjustment in pp
         ``gold_delta``           – gold adjustment in pp
         ``adjustment_reasons``   – list of plain-English reason strings
-        ``ranked_funds``         – funds re-scored for current market
+        ``ranked_funds``         – funds re-scored for current market (no ``ai_reason``)
         ``investment_mode_recommendation`` – smart deployment recommendation
         ``narratives``           – dict of market_summary, allocation_rationale, risk_narrative
         ``last_updated``         – ISO timestamp of underlying data
@@ -86,7 +86,8 @@ def get_live_intelligence(
 
         # ── Fund scoring ──────────────────────────────────────────────────────
         from ai_layer.scoring_engine.fund_scoring import rank_funds
-        ranked_funds = rank_funds(recommended_funds, signals)
+        # ai_reason is rendered by the UI for the funds it shows (score_reason)
+        ranked_funds = rank_funds(recommended_funds, signals, reasons=False)
 
         # ── Smart deployment mode ────────────────────────────────────────────
         from backend.engines.investment_mode_engine import recommend_investment_mode
@@ -0,0 +1,161 @@
+"""
+ai_layer/data_ingestion/fred_cache.py
+─────────────────────────────────────
+Local per-series cache of FRED observations.
+
+Each series id is stored as one compact JSON file under ``FRED_CACHE_DIR``::
+
+    {"series_id": "...", "dates": ["2025-01-01", ...], "values": [..], "updated_at": "..."}
+
+A refresh asks ``fredgraph.csv`` only for observations on/after the day
+following the last cached date (``cosd=``), so a steady-state refresh parses
+a header and a handful of rows instead of the full decades-long history.
+Last-value and YoY queries are answered from the cache.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+FRED_CSV_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv"
+FRED_CACHE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "cache", "fred")
+)
+_REQUEST_TIMEOUT = 10
+
+_LOCKS: Dict[str, threading.Lock] = {}
+_LOCKS_GUARD = threading.Lock()
+
+Observations = Tuple[List[str], List[float]]
+
+
+def _series_lock(series_id: str) -> threading.Lock:
+    with _LOCKS_GUARD:
+        return _LOCKS.setdefault(series_id, threading.Lock())
+
+
+def _cache_path(series_id: str) -> str:
+    return os.path.join(FRED_CACHE_DIR, f"{series_id}.json")
+
+
+def load_series(series_id: str) -> Observations:
+    """Cached ``(dates, values)`` for ``series_id``; empty lists when nothing is cached."""
+    try:
+        with open(_cache_path(series_id), "r") as fh:
+            payload = json.load(fh)
+        return list(payload["dates"]), [float(v) for v in payload["values"]]
+    except (OSError, ValueError, KeyError):
+        return [], []
+
+
+def _save_series(series_id: str, dates: List[str], values: List[float]) -> None:
+    os.makedirs(FRED_CACHE_DIR, exist_ok=True)
+    payload = {
+        "series_id": series_id,
+        "dates": dates,
+        "values": values,
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=FRED_CACHE_DIR, prefix=f".{series_id}-")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp_path, _cache_path(series_id))
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def parse_fredgraph_csv(text: str) -> Observations:
+    """
+    Parse a ``fredgraph.csv`` body. The first column is the observation date
+    (header ``DATE`` or ``observation_date``), the second the value; FRED
+    marks missing observations with ``.``.
+    """
+    dates: List[str] = []
+    values: List[float] = []
+    lines = text.splitlines()
+    for line in lines[1:]:
+        parts = line.split(",")
+        if len(parts) < 2:
+            continue
+        raw = parts[1].strip()
+        if raw in (".", ""):
+            continue
+        try:
+            values.append(float(raw))
+        except ValueError:
+            continue
+        dates.append(parts[0].strip()[:10])
+    return dates, values
+
+
+def _default_get(url: str) -> Optional[requests.Response]:
+    try:
+        resp = requests.get(url, timeout=_REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        return resp
+    except Exception as exc:
+        logger.warning("fred_cache: request failed (%s): %s", url, exc)
+        return None
+
+
+def refresh_series(
+    series_id: str,
+    http_get: Optional[Callable[[str], Optional[requests.Response]]] = None,
+) -> Observations:
+    """
+    Bring the cache for ``series_id`` up to date and return all observations.
+
+    Only observations after the last cached date are requested. On network
+    failure the cached observations are returned unchanged.
+    """
+    http_get = http_get or _default_get
+    with _series_lock(series_id):
+        dates, values = load_series(series_id)
+        url = f"{FRED_CSV_URL}?id={series_id}"
+        if dates:
+            start = date.fromisoformat(dates[-1]) + timedelta(days=1)
+            url += f"&cosd={start.isoformat()}"
+
+        resp = http_get(url)
+        if resp is None:
+            return dates, values
+        new_dates, new_values = parse_fredgraph_csv(resp.text)
+
+        fresh = [(d, v) for d, v in zip(new_dates, new_values) if not dates or d > dates[-1]]
+        if fresh or not dates:
+            dates = dates + [d for d, _ in fresh]
+            values = values + [v for _, v in fresh]
+            _save_series(series_id, dates, values)
+            logger.info("fred_cache: %s +%d observations (%d cached)", series_id, len(fresh), len(dates))
+        return dates, values
+
+
+def last_value(series_id: str, refresh: bool = True, **kwargs) -> Optional[float]:
+    """Most recent observation of ``series_id``."""
+    _, values = refresh_series(series_id, **kwargs) if refresh else load_series(series_id)
+    return values[-1] if values else None
+
+
+def yoy_change_pct(series_id: str, periods: int = 12, refresh: bool = True, **kwargs) -> Optional[float]:
+    """
+    % change between the latest observation and the one ``periods`` earlier
+    (12 for a monthly series).
+    """
+    _, values = refresh_series(series_id, **kwargs) if refresh else load_series(series_id)
+    if len(values) <= periods:
+        return None
+    year_ago = values[-1 - periods]
+    if year_ago == 0:
+        return None
+    return round(((values[-1] - year_ago) / year_ago) * 100, 2)
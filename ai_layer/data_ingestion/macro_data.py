@@ -5,7 +5,8 @@ Fetches macroeconomic indicators for India from real public sources:
 
   Source 1  — FRED (St. Louis Fed): CPI India YoY % change
               URL: https://fred.stlouisfed.org/graph/fredgraph.csv?id=INDCPIALLMINMEI
-              No API key required. Returns a CSV with date,value columns.
+              No API key required. Observations are kept in a local
+              per-series cache (fred_cache) and refreshed incrementally.
 
   Source 2  — FBIL (Financial Benchmarks India): Repo rate
               URL: https://fbil.org.in/sbr/  — public page, scrape the rate.
@@ -16,19 +17,32 @@ Fetches macroeconomic indicators for India from real public sources:
 
 All sources are wrapped in try/except with sensible fallback values so
 a network outage never crashes the dashboard.
+
+Sources are fetched concurrently under one overall deadline
+(``MACRO_FETCH_DEADLINE_SECONDS``); a source that is late or fails degrades
+to its last cached value, so a refresh is bounded by the slowest source
+rather than the sum of all of them.
 """
 
-import csv
-import io
 import logging
+import os
 import re
-import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import requests
 import yfinance as yf
 
+from ai_layer.data_ingestion.fred_cache import last_value, yoy_change_pct
+from backend.utils.circuit_breaker import (
+    NO_RETRY,
+    CircuitOpenError,
+    RetryPolicy,
+    breaker_for_url,
+    yahoo_breaker,
+)
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
@@ -36,20 +50,17 @@ INITIAL_BACKOFF = 2
 
 # ── Constants & fallback values ──────────────────────────────────────────────
 
-# FRED public CSV endpoints (no API key needed)
-_FRED_CPI_URL = (
-    "https://fred.stlouisfed.org/graph/fredgraph.csv"
-    "?id=INDCPIALLMINMEI"  # India CPI All Items (monthly index level)
-)
-_FRED_BOND_URL = (
-    "https://fred.stlouisfed.org/graph/fredgraph.csv"
-    "?id=INDIRLTLT01STM"  # India Long-Term Government Bond Yield %
-)
+# FRED series ids (public fredgraph.csv, no API key needed)
+_FRED_CPI_SERIES = "INDCPIALLMINMEI"  # India CPI All Items (monthly index level)
+_FRED_BOND_SERIES = "INDIRLTLT01STM"  # India Long-Term Government Bond Yield %
 
 # FBIL repo rate page (public)
 _FBIL_REPO_URL = "https://fbil.org.in/sbr/"
 
 _REQUEST_TIMEOUT = 10
+
+# Overall budget for one macro refresh when sources are fetched concurrently
+MACRO_FETCH_DEADLINE_SECONDS = float(os.getenv("MACRO_FETCH_DEADLINE_SECONDS", "20"))
 _HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -72,46 +83,29 @@ _FALLBACKS = {
 def _retry_request(
     url: str, max_retries: int = MAX_RETRIES
 ) -> Optional[requests.Response]:
-    """Make HTTP request with retry and exponential backoff."""
-    last_error = None
-    for attempt in range(max_retries):
-        try:
-            resp = requests.get(url, timeout=_REQUEST_TIMEOUT, headers=_HEADERS)
-            resp.raise_for_status()
-            return resp
-        except Exception as e:
-            last_error = e
-            if attempt < max_retries - 1:
-                wait_time = INITIAL_BACKOFF * (2**attempt)
-                logger.warning(
-                    f"Request to {url} failed (attempt {attempt + 1}): {e}. Retrying in {wait_time}s..."
-                )
-                time.sleep(wait_time)
-            else:
-                logger.error(f"All {max_retries} attempts failed for {url}: {e}")
+    """HTTP GET through the shared per-host circuit breaker and retry policy."""
+
+    def _get() -> requests.Response:
+        resp = requests.get(url, timeout=_REQUEST_TIMEOUT, headers=_HEADERS)
+        resp.raise_for_status()
+        return resp
+
+    policy = RetryPolicy(max_attempts=max_retries, initial_backoff=INITIAL_BACKOFF)
+    try:
+        return breaker_for_url(url).call(_get, policy=policy)
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping {url}: {e}")
+    except Exception as e:
+        logger.error(f"Request to {url} failed: {e}")
     return None
 
 
-def _fetch_fred_last_value(url: str) -> Optional[float]:
-    """
-    Download a FRED CSV and return the most recent non-null value.
-    FRED CSVs have two columns: DATE, VALUE (with '.' for missing).
-    """
-    resp = _retry_request(url)
-    if resp is None:
-        return None
+def _fetch_fred_last_value(series_id: str) -> Optional[float]:
+    """Most recent non-null value of a FRED series, refreshed incrementally."""
     try:
-        reader = csv.DictReader(io.StringIO(resp.text))
-        rows = [r for r in reader if r.get("VALUE", ".") not in (".", "", None)]
-        if not rows:
-            return None
-        return float(rows[-1]["VALUE"])
-    except Exception as exc:
-        logger.warning("macro_data: FRED parse failed (%s): %s", url, exc)
-        return None
-        return float(rows[-1]["VALUE"])
+        return last_value(series_id, http_get=_retry_request)
     except Exception as exc:
-        logger.warning("macro_data: FRED fetch failed (%s): %s", url, exc)
+        logger.warning("macro_data: FRED fetch failed (%s): %s", series_id, exc)
         return None
 
 
@@ -120,24 +114,8 @@ def _compute_cpi_yoy() -> Optional[float]:
     Compute YoY inflation from FRED India CPI index levels.
     Returns the % change between the latest month and 12 months prior.
     """
-    resp = _retry_request(_FRED_CPI_URL)
-    if resp is None:
-        return None
     try:
-        reader = list(csv.DictReader(io.StringIO(resp.text)))
-        valid = [
-            {"date": r["DATE"], "value": float(r["VALUE"])}
-            for r in reader
-            if r.get("VALUE", ".") not in (".", "", None)
-        ]
-        if len(valid) < 13:
-            return None
-
-        latest = valid[-1]["value"]
-        year_ago = valid[-13]["value"]
-        if year_ago == 0:
-            return None
-        return round(((latest - year_ago) / year_ago) * 100, 2)
+        return yoy_change_pct(_FRED_CPI_SERIES, periods=12, http_get=_retry_request)
     except Exception as exc:
         logger.warning("macro_data: CPI YoY compute failed: %s", exc)
         return None
@@ -190,19 +168,92 @@ def _fetch_bond_yield() -> Optional[float]:
     """
     # Try yfinance first (faster)
     try:
-        ticker = yf.Ticker("^INDIAVIX")
-        hist = ticker.history(period="5d")
+        hist = yahoo_breaker("^INDIAVIX").call(
+            lambda: yf.Ticker("^INDIAVIX").history(period="5d"), policy=NO_RETRY
+        )
         if not hist.empty:
             return round(float(hist["Close"].dropna().iloc[-1]), 2)
     except Exception:
         pass  # Fall through to FRED
 
-    val = _fetch_fred_last_value(_FRED_BOND_URL)
+    val = _fetch_fred_last_value(_FRED_BOND_SERIES)
     if val is not None:
         return round(val, 2)
     return None
 
-def get_macro_indicators(use_cache: bool = True) -> Dict[str, Any]:
+# metric key → (fetcher, live source label); fetchers are looked up at call time
+_MACRO_SOURCES: Dict[str, Tuple[Callable[[], Optional[float]], str]] = {
+    "cpi_yoy_pct": (lambda: _compute_cpi_yoy(), "FRED"),
+    "repo_rate_pct": (lambda: _fetch_repo_rate(), "RBI"),
+    "bond_yield_pct": (lambda: _fetch_bond_yield(), "FRED/yfinance"),
+}
+
+# Shared pool: a source that overruns the deadline keeps its worker until its
+# own request timeout expires, so size it for one overrunning refresh.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=2 * len(_MACRO_SOURCES), thread_name_prefix="macro-fetch"
+)
+
+
+def _call_source(key: str) -> Optional[float]:
+    try:
+        return _MACRO_SOURCES[key][0]()
+    except Exception as exc:
+        logger.warning("macro_data: %s fetch failed: %s", key, exc)
+        return None
+
+
+def _fetch_sources_concurrently(deadline: float) -> Dict[str, Optional[float]]:
+    """
+    Run every macro source in parallel and wait at most ``deadline`` seconds.
+    Sources that have not finished by then are reported as None.
+    """
+    futures = {_EXECUTOR.submit(_call_source, key): key for key in _MACRO_SOURCES}
+    done, pending = wait(futures, timeout=deadline)
+    if pending:
+        logger.warning(
+            "macro_data: %s missed the %.0fs deadline — using last cached values",
+            ", ".join(sorted(futures[f] for f in pending)), deadline,
+        )
+    values: Dict[str, Optional[float]] = {key: None for key in _MACRO_SOURCES}
+    for future in done:
+        values[futures[future]] = future.result()
+    return values
+
+
+def _fetch_sources_sequentially() -> Dict[str, Optional[float]]:
+    return {key: _call_source(key) for key in _MACRO_SOURCES}
+
+
+def _last_known_points() -> Dict[str, Dict[str, Any]]:
+    """Per-metric payloads from the most recent macro cache entry (any age)."""
+    try:
+        from data.cache.tiered_cache import get_intelligence_cache
+
+        return (get_intelligence_cache().get("macro", allow_stale=True) or {}).get("data_points", {})
+    except Exception as e:
+        logger.warning(f"Macro cache read failed: {e}")
+        return {}
+
+
+def _degraded_point(key: str, cached_points: Dict[str, Dict[str, Any]], fetched_at: str) -> Dict[str, Any]:
+    """
+    Payload for a source that failed or ran late: the last value actually
+    fetched live (marked ``source="cache"``), else the hardcoded fallback.
+    """
+    point = cached_points.get(key) or {}
+    if point.get("value") is not None and point.get("source") not in (None, "fallback"):
+        return _build_metric_payload(
+            point["value"], "cache", point.get("fetched_at") or fetched_at, True
+        )
+    return _build_metric_payload(_FALLBACKS[key], "fallback", fetched_at, True)
+
+
+def get_macro_indicators(
+    use_cache: bool = True,
+    concurrent: bool = True,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
     """
     Fetch real-time macroeconomic indicators for India.
 
@@ -210,6 +261,10 @@ def get_macro_indicators(use_cache: bool = True) -> Dict[str, Any]:
     ----------
     use_cache : bool
         If True, try cache first before live fetch (default True).
+    concurrent : bool
+        Fetch all sources in parallel under one deadline (default True).
+    deadline : float, optional
+        Overall budget in seconds; defaults to ``MACRO_FETCH_DEADLINE_SECONDS``.
 
     Returns
     -------
@@ -224,12 +279,12 @@ def get_macro_indicators(use_cache: bool = True) -> Dict[str, Any]:
     """
     if use_cache:
         try:
-            from data.cache.cache_manager import load_macro_data, save_macro_data
+            from data.cache.tiered_cache import get_intelligence_cache
 
-            cached = load_macro_data(max_age_seconds=43200)
+            cached = get_intelligence_cache().get("macro")
             if cached:
                 logger.info("Using cached macro data")
-                return cached
+                return dict(cached)
         except Exception as e:
             logger.warning(f"Macro cache read failed: {e}")
 
@@ -238,53 +293,24 @@ def get_macro_indicators(use_cache: bool = True) -> Dict[str, Any]:
     fetched_at = datetime.now().isoformat(timespec="seconds")
     data_points: Dict[str, Dict[str, Any]] = {}
 
-    try:
-        cpi_live = _compute_cpi_yoy()
-    except Exception:
-        cpi_live = None
-    cpi = _FALLBACKS["cpi_yoy_pct"] if cpi_live is None else cpi_live
-    cpi_is_fallback = cpi_live is None
-    if not cpi_is_fallback:
-        live_count += 1
-    data_points["cpi_yoy_pct"] = _build_metric_payload(
-        cpi,
-        "FRED" if not cpi_is_fallback else "fallback",
-        fetched_at,
-        cpi_is_fallback,
-    )
-    results["cpi_yoy_pct"] = cpi
-
-    try:
-        repo_live = _fetch_repo_rate()
-    except Exception:
-        repo_live = None
-    repo = _FALLBACKS["repo_rate_pct"] if repo_live is None else repo_live
-    repo_is_fallback = repo_live is None
-    if not repo_is_fallback:
-        live_count += 1
-    data_points["repo_rate_pct"] = _build_metric_payload(
-        repo,
-        "RBI" if not repo_is_fallback else "fallback",
-        fetched_at,
-        repo_is_fallback,
-    )
-    results["repo_rate_pct"] = repo
-
-    try:
-        bond_live = _fetch_bond_yield()
-    except Exception:
-        bond_live = None
-    bond = _FALLBACKS["bond_yield_pct"] if bond_live is None else bond_live
-    bond_is_fallback = bond_live is None
-    if not bond_is_fallback:
-        live_count += 1
-    data_points["bond_yield_pct"] = _build_metric_payload(
-        bond,
-        "FRED/yfinance" if not bond_is_fallback else "fallback",
-        fetched_at,
-        bond_is_fallback,
-    )
-    results["bond_yield_pct"] = bond
+    if concurrent:
+        live_values = _fetch_sources_concurrently(
+            MACRO_FETCH_DEADLINE_SECONDS if deadline is None else deadline
+        )
+    else:
+        live_values = _fetch_sources_sequentially()
+
+    cached_points: Optional[Dict[str, Dict[str, Any]]] = None
+    for key, (_, live_source) in _MACRO_SOURCES.items():
+        value = live_values.get(key)
+        if value is not None:
+            live_count += 1
+            data_points[key] = _build_metric_payload(value, live_source, fetched_at, False)
+        else:
+            if cached_points is None:
+                cached_points = _last_known_points()
+            data_points[key] = _degraded_point(key, cached_points, fetched_at)
+        results[key] = data_points[key]["value"]
 
     cpi_val = results["cpi_yoy_pct"]
     if cpi_val > 6.5:
@@ -314,9 +340,9 @@ def get_macro_indicators(use_cache: bool = True) -> Dict[str, Any]:
     logger.info("macro_data: indicators ready — source=%s", results["source"])
 
     try:
-        from data.cache.cache_manager import save_macro_data
+        from data.cache.tiered_cache import get_intelligence_cache
 
-        save_macro_data(results)
+        get_intelligence_cache().set("macro", results)
     except Exception as e:
         logger.warning(f"Macro cache save failed: {e}")
 
@@ -6,17 +6,20 @@ AI Layer signal and decision engines.
 
 Data is fetched via yfinance (already a project dependency).
 Every fetch is wrapped in a try/except so a single ticker failure
-never blocks the rest of the pipeline.
+never blocks the rest of the pipeline. Each ticker has its own
+"yfinance:<ticker>" circuit breaker (``yahoo_breaker``), so a symbol that
+keeps failing fails fast without tripping the downloads of the others.
 """
 
 import logging
-import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
 import numpy as np
 import yfinance as yf
 
+from backend.utils.circuit_breaker import CircuitOpenError, RetryPolicy, yahoo_breaker
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
@@ -63,82 +66,73 @@ def _fetch_instrument(key: str, ticker: str) -> Dict[str, Any]:
 
     Returns a dict. Falls back to _FALLBACKS on any error.
     """
-    last_error = None
-    for attempt in range(MAX_RETRIES):
-        try:
-            end = datetime.today()
-            start = end - timedelta(days=210)
-
-            df = yf.download(
-                ticker,
-                start=start.strftime("%Y-%m-%d"),
-                end=end.strftime("%Y-%m-%d"),
-                progress=False,
-                auto_adjust=True,
-                timeout=10,
-            )
-
-            if df is None or df.empty or len(df) < 5:
-                logger.warning(
-                    "market_data: No data for %s (%s) — using fallback", key, ticker
-                )
-                return {**_FALLBACKS[key], "source": "fallback", "ticker": ticker}
-
-            if hasattr(df.columns, "levels"):
-                close = df["Close"].squeeze()
-            else:
-                close = df["Close"].squeeze()
-
-            close = close.dropna()
-
-            if len(close) < 5:
-                return {**_FALLBACKS[key], "source": "fallback", "ticker": ticker}
-
-            price = float(close.iloc[-1])
-            prev_price = float(close.iloc[-2]) if len(close) >= 2 else price
-            change_pct = (
-                round(((price - prev_price) / prev_price) * 100, 2)
-                if prev_price != 0
-                else 0.0
-            )
-
-            dma_50 = (
-                round(float(close.tail(50).mean()), 2)
-                if len(close) >= 50
-                else round(float(close.mean()), 2)
+    end = datetime.today()
+    start = end - timedelta(days=210)
+    policy = RetryPolicy(max_attempts=MAX_RETRIES, initial_backoff=INITIAL_BACKOFF)
+    try:
+        df = yahoo_breaker(ticker).call(
+            yf.download,
+            ticker,
+            start=start.strftime("%Y-%m-%d"),
+            end=end.strftime("%Y-%m-%d"),
+            progress=False,
+            auto_adjust=True,
+            timeout=10,
+            policy=policy,
+        )
+    except CircuitOpenError as exc:
+        logger.warning("market_data: %s (%s) skipped — %s", key, ticker, exc)
+        return _fallback(key, ticker)
+    except Exception as exc:
+        logger.error("market_data: Fetch failed for %s (%s): %s", key, ticker, exc)
+        return _fallback(key, ticker)
+
+    try:
+        if df is None or df.empty or len(df) < 5:
+            logger.warning(
+                "market_data: No data for %s (%s) — using fallback", key, ticker
             )
-            dma_200 = (
-                round(float(close.tail(200).mean()), 2) if len(close) >= 200 else dma_50
-            )
-
-            return {
-                "price": round(price, 2),
-                "change_pct": change_pct,
-                "dma_50": dma_50,
-                "dma_200": dma_200,
-                "source": "live",
-                "fetched_at": datetime.now().isoformat(timespec="seconds"),
-                "is_fallback": False,
-                "ticker": ticker,
-                "as_of": str(close.index[-1].date()),
-            }
-
-        except Exception as exc:
-            last_error = exc
-            if attempt < MAX_RETRIES - 1:
-                wait_time = INITIAL_BACKOFF * (2**attempt)
-                logger.warning(
-                    f"market_data: Fetch failed for {key} (attempt {attempt + 1}): {exc}. Retrying in {wait_time}s..."
-                )
-                time.sleep(wait_time)
-
-    logger.error(
-        "market_data: All %d attempts failed for %s (%s): %s",
-        MAX_RETRIES,
-        key,
-        ticker,
-        last_error,
-    )
+            return {**_FALLBACKS[key], "source": "fallback", "ticker": ticker}
+
+        close = df["Close"].squeeze().dropna()
+
+        if len(close) < 5:
+            return {**_FALLBACKS[key], "source": "fallback", "ticker": ticker}
+
+        price = float(close.iloc[-1])
+        prev_price = float(close.iloc[-2]) if len(close) >= 2 else price
+        change_pct = (
+            round(((price - prev_price) / prev_price) * 100, 2)
+            if prev_price != 0
+            else 0.0
+        )
+
+        dma_50 = (
+            round(float(close.tail(50).mean()), 2)
+            if len(close) >= 50
+            else round(float(close.mean()), 2)
+        )
+        dma_200 = (
+            round(float(close.tail(200).mean()), 2) if len(close) >= 200 else dma_50
+        )
+
+        return {
+            "price": round(price, 2),
+            "change_pct": change_pct,
+            "dma_50": dma_50,
+            "dma_200": dma_200,
+            "source": "live",
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            "is_fallback": False,
+            "ticker": ticker,
+            "as_of": str(close.index[-1].date()),
+        }
+    except Exception as exc:
+        logger.error("market_data: Could not process %s (%s): %s", key, ticker, exc)
+        return _fallback(key, ticker)
+
+
+def _fallback(key: str, ticker: str) -> Dict[str, Any]:
     return {
         **_FALLBACKS[key],
         "source": "fallback",
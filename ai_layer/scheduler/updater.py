@@ -3,13 +3,19 @@ ai_layer/scheduler/updater.py
 ──────────────────────────────
 Background scheduler that keeps AI layer data fresh.
 
-Uses APScheduler BackgroundScheduler to:
-  1. Fetch market snapshot + macro indicators every 15 minutes.
-  2. Recompute signals.
-  3. Store results in a thread-safe module-level cache dict.
+Uses APScheduler BackgroundScheduler to run one job per data source:
+  1. Market snapshot every ``_REFRESH_INTERVAL_MINUTES`` (20 min).
+  2. Macro indicators every ``_MACRO_REFRESH_INTERVAL_HOURS`` (6 h) — CPI and
+     the repo rate change monthly at most.
+  3. Signals are recomputed only when an input actually changed.
+  4. Results are published as an immutable snapshot (a read-only mapping
+     swapped in by reference), so readers never lock or copy.
 
-The dashboard calls ``get_cached_intelligence()`` which returns
-immediately from the cache — it never blocks on a network call.
+The dashboard calls ``get_cached_intelligence()`` which returns the current
+snapshot immediately. If the snapshot is stale it is still served while a
+single background revalidation runs; if the cache is empty, callers share one
+in-flight refresh and wait for it only up to a bounded time before falling
+back to the shared intelligence cache (data/cache/tiered_cache.py).
 
 Usage:
     from ai_layer.scheduler.updater import start_scheduler, get_cached_intelligence
@@ -17,58 +23,218 @@ Usage:
     intel = get_cached_intelligence()
 """
 
+import hashlib
+import json
 import logging
 import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
 logger = logging.getLogger(__name__)
 
-# ── Thread-safe cache ─────────────────────────────────────────────────────────
+# ── Immutable snapshot cache ──────────────────────────────────────────────────
+# Readers take ``_SNAPSHOT`` by reference; writers build a new mapping under
+# ``_LOCK`` and swap it in. Nested payloads are shared and must be treated as
+# read-only by consumers.
 _LOCK = threading.Lock()
-_CACHE: Dict[str, Any] = {}
+_SNAPSHOT: Mapping[str, Any] = MappingProxyType({})
+_PUBLISHED_AT = 0.0  # time.monotonic() of the last publish
 _SCHEDULER_STARTED = False
 
+# Single-flight refresh: set while a full refresh runs, waiters block on it
+_FLIGHT_LOCK = threading.Lock()
+_IN_FLIGHT: Optional[threading.Event] = None
+
 # ── Refresh interval ──────────────────────────────────────────────────────────
 _REFRESH_INTERVAL_MINUTES = 20
 _MACRO_REFRESH_INTERVAL_HOURS = 6
 
+# Snapshot older than this is served stale while a background revalidation runs
+_STALE_AFTER_SECONDS = 2 * _REFRESH_INTERVAL_MINUTES * 60
+# How long a caller facing an empty cache waits for the in-flight refresh
+_EMPTY_CACHE_WAIT_SECONDS = 30.0
 
-def _do_refresh() -> None:
+
+def _publish(updates: Dict[str, Any]) -> Mapping[str, Any]:
+    """Swap in a new snapshot = current snapshot + ``updates``."""
+    global _SNAPSHOT, _PUBLISHED_AT
+    with _LOCK:
+        merged = dict(_SNAPSHOT)
+        merged.update(updates)
+        _SNAPSHOT = MappingProxyType(merged)
+        _PUBLISHED_AT = time.monotonic()
+        return _SNAPSHOT
+
+
+def _fetch_market() -> Dict[str, Any]:
+    from ai_layer.data_ingestion.market_data import get_market_snapshot
+
+    return get_market_snapshot(use_cache=False)
+
+
+def _fetch_macro() -> Dict[str, Any]:
+    from ai_layer.data_ingestion.macro_data import get_macro_indicators
+
+    return get_macro_indicators(use_cache=False)
+
+
+# source → cache key, fetcher, job interval and freshness budget. A job skips
+# its fetch while the cached value is younger than ``max_age_seconds`` (e.g.
+# right after a forced start-up refresh).
+_SOURCES: Dict[str, Dict[str, Any]] = {
+    "market": {
+        "cache_key": "market_snapshot",
+        "fetch": lambda: _fetch_market(),
+        "interval_seconds": _REFRESH_INTERVAL_MINUTES * 60,
+        "max_age_seconds": (_REFRESH_INTERVAL_MINUTES - 5) * 60,
+    },
+    "macro": {
+        "cache_key": "macro_indicators",
+        "fetch": lambda: _fetch_macro(),
+        "interval_seconds": _MACRO_REFRESH_INTERVAL_HOURS * 3600,
+        "max_age_seconds": (_MACRO_REFRESH_INTERVAL_HOURS - 1) * 3600,
+    },
+}
+
+# source → {"fingerprint", "refreshed_at" (monotonic)}; plus the fingerprint
+# of the inputs the current signals were computed from
+_SOURCE_STATE: Dict[str, Dict[str, Any]] = {}
+_SIGNALS_INPUT_FINGERPRINT: Optional[str] = None
+_VOLATILE_KEYS = frozenset({"fetched_at"})
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in _VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+def _fingerprint(payload: Dict[str, Any]) -> str:
+    """Content hash of a source payload, ignoring fetch timestamps."""
+    encoded = json.dumps(_strip_volatile(payload), sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def _refresh_source(name: str, force: bool = False) -> bool:
     """
-    Fetch fresh data from all sources and update the cache.
-    Called by the scheduler on a background thread; errors are caught so
-    a transient network failure never kills the scheduler job.
+    Fetch one source into the cache unless it is still within its freshness
+    budget. Returns True if the payload changed.
     """
+    config = _SOURCES[name]
+    state = _SOURCE_STATE.get(name)
+    if not force and state and time.monotonic() - state["refreshed_at"] < config["max_age_seconds"]:
+        logger.info("ai_layer scheduler: %s still fresh — skipping fetch", name)
+        return False
+
+    payload = config["fetch"]()
+    fingerprint = _fingerprint(payload)
+    changed = state is None or state["fingerprint"] != fingerprint
+    _SOURCE_STATE[name] = {"fingerprint": fingerprint, "refreshed_at": time.monotonic()}
+    _publish({
+        config["cache_key"]: payload,
+        "last_updated": datetime.now().isoformat(timespec="seconds"),
+    })
+
+    if name == "market":
+        try:
+            from data.cache.tiered_cache import get_intelligence_cache
+
+            get_intelligence_cache().set("market_snapshot", payload)
+        except Exception as e:
+            logger.warning(f"Failed to write market snapshot to cache: {e}")
+    logger.info("ai_layer scheduler: %s refreshed (%s)", name, "changed" if changed else "unchanged")
+    return changed
+
+
+def _recompute_signals(force: bool = False) -> bool:
+    """Regenerate signals if any input changed since the last computation."""
+    global _SIGNALS_INPUT_FINGERPRINT
+    from ai_layer.signal_engine.market_signals import generate_signals
+
+    snapshot = _SNAPSHOT
+    market_snapshot = snapshot.get("market_snapshot")
+    macro_indicators = snapshot.get("macro_indicators")
+    input_fingerprint = "|".join(
+        _SOURCE_STATE.get(name, {}).get("fingerprint", "") for name in _SOURCES
+    )
+    if market_snapshot is None or macro_indicators is None:
+        return False
+    if not force and input_fingerprint == _SIGNALS_INPUT_FINGERPRINT and "signals" in snapshot:
+        logger.info("ai_layer scheduler: inputs unchanged — keeping current signals")
+        return False
+
+    signals = generate_signals(market_snapshot, macro_indicators)
+    _publish({"signals": signals})
+    _SIGNALS_INPUT_FINGERPRINT = input_fingerprint
+
     try:
-        from ai_layer.data_ingestion.market_data import get_market_snapshot
-        from ai_layer.data_ingestion.macro_data import get_macro_indicators
-        from ai_layer.signal_engine.market_signals import generate_signals
+        from data.cache.tiered_cache import get_intelligence_cache
 
-        logger.info("ai_layer scheduler: starting data refresh...")
+        get_intelligence_cache().set("signals", signals)
+    except Exception as e:
+        logger.warning(f"Failed to write signals to cache: {e}")
+    return True
 
-        market_snapshot = get_market_snapshot(use_cache=False)
-        macro_indicators = get_macro_indicators(use_cache=False)
-        signals = generate_signals(market_snapshot, macro_indicators)
 
-        with _LOCK:
-            _CACHE["market_snapshot"] = market_snapshot
-            _CACHE["macro_indicators"] = macro_indicators
-            _CACHE["signals"] = signals
-            _CACHE["last_updated"] = datetime.now().isoformat(timespec="seconds")
+def _restore_from_cache() -> None:
+    """Fill whatever the live refresh could not provide from the shared cache (stale allowed)."""
+    try:
+        from data.cache.cache_manager import DEFAULT_SIGNALS, load_macro_fallback
+        from data.cache.tiered_cache import get_intelligence_cache
 
-        try:
-            from data.cache.cache_manager import save_signals, save_macro_data
+        cache = get_intelligence_cache()
+        snapshot = _SNAPSHOT
+        updates: Dict[str, Any] = {}
+        if "signals" not in snapshot:
+            updates["signals"] = cache.get("signals", allow_stale=True) or dict(DEFAULT_SIGNALS)
+        if "macro_indicators" not in snapshot:
+            updates["macro_indicators"] = cache.get("macro", allow_stale=True) or load_macro_fallback()
+        if "last_updated" not in snapshot:
+            updates["last_updated"] = datetime.now().isoformat(timespec="seconds")
+        if updates:
+            _publish(updates)
+        logger.info(
+            "ai_layer scheduler: restored from cache after refresh failure"
+        )
+    except Exception as e:
+        logger.error("ai_layer scheduler: even cache fallback failed — %s", e)
 
-            save_signals(signals)
-            save_macro_data(macro_indicators)
-        except Exception as e:
-            logger.warning(f"Failed to save to file cache: {e}")
 
+def _refresh_job(name: str) -> None:
+    """
+    Scheduler job for one source. Errors are caught so a transient network
+    failure never kills the scheduler job.
+    """
+    try:
+        if _refresh_source(name):
+            _recompute_signals()
+    except Exception as exc:
+        logger.error("ai_layer scheduler: %s refresh failed — %s", name, exc)
+        _restore_from_cache()
+
+
+def _do_refresh() -> None:
+    """
+    Fetch fresh data from all sources and update the cache.
+    Used at start-up and when the cache is empty.
+    """
+    try:
+        logger.info("ai_layer scheduler: starting data refresh...")
+        for name in _SOURCES:
+            _refresh_source(name, force=True)
+        _recompute_signals()
+
+        snapshot = _SNAPSHOT
+        market_snapshot = snapshot.get("market_snapshot", {})
+        macro_indicators = snapshot.get("macro_indicators", {})
         logger.info(
             "ai_layer scheduler: cache refreshed at %s. "
             "Live market: %s/%s tickers. Macro source: %s.",
-            _CACHE["last_updated"],
+            snapshot.get("last_updated"),
             market_snapshot.get("_meta", {}).get("live_count", 0),
             market_snapshot.get("_meta", {}).get("total_count", 6),
             macro_indicators.get("source", "unknown"),
@@ -76,28 +242,12 @@ def _do_refresh() -> None:
 
     except Exception as exc:
         logger.error("ai_layer scheduler: refresh failed — %s", exc)
-        try:
-            from data.cache.cache_manager import (
-                load_signals_fallback,
-                load_macro_fallback,
-            )
-
-            cached_signals = load_signals_fallback()
-            cached_macro = load_macro_fallback()
-            with _LOCK:
-                _CACHE["signals"] = cached_signals
-                _CACHE["macro_indicators"] = cached_macro
-                _CACHE["last_updated"] = datetime.now().isoformat(timespec="seconds")
-            logger.info(
-                "ai_layer scheduler: restored from file cache after refresh failure"
-            )
-        except Exception as e:
-            logger.error("ai_layer scheduler: even cache fallback failed — %s", e)
+        _restore_from_cache()
 
 
 def start_scheduler() -> None:
     """
-    Start the APScheduler background job if not already running.
+    Start the APScheduler background jobs if not already running.
     Also performs an immediate first refresh so the cache is populated
     before the first user sees the dashboard.
 
@@ -115,21 +265,24 @@ def start_scheduler() -> None:
         from apscheduler.schedulers.background import BackgroundScheduler
 
         scheduler = BackgroundScheduler(
-            job_defaults={"misfire_grace_time": 60},
+            job_defaults={"misfire_grace_time": 60, "coalesce": True},
             timezone="Asia/Kolkata",
         )
-        scheduler.add_job(
-            _do_refresh,
-            trigger="interval",
-            minutes=_REFRESH_INTERVAL_MINUTES,
-            id="ai_layer_refresh",
-            replace_existing=True,
-        )
+        for name, config in _SOURCES.items():
+            scheduler.add_job(
+                _refresh_job,
+                trigger="interval",
+                seconds=config["interval_seconds"],
+                args=[name],
+                id=f"ai_layer_refresh_{name}",
+                replace_existing=True,
+            )
         scheduler.start()
         _SCHEDULER_STARTED = True
         logger.info(
-            "ai_layer scheduler: started — refresh every %d min.",
+            "ai_layer scheduler: started — market every %d min, macro every %d h.",
             _REFRESH_INTERVAL_MINUTES,
+            _MACRO_REFRESH_INTERVAL_HOURS,
         )
 
     except ImportError:
@@ -140,43 +293,57 @@ def start_scheduler() -> None:
         _SCHEDULER_STARTED = True  # Prevent repeated attempts
 
 
-def get_cached_intelligence() -> Dict[str, Any]:
+def _start_refresh() -> threading.Event:
+    """
+    Join the in-flight full refresh or start one on a background thread.
+    Returns an event that is set when that refresh finishes.
+    """
+    global _IN_FLIGHT
+    with _FLIGHT_LOCK:
+        if _IN_FLIGHT is not None:
+            return _IN_FLIGHT
+        done = _IN_FLIGHT = threading.Event()
+
+    def _run() -> None:
+        global _IN_FLIGHT
+        try:
+            _do_refresh()
+        finally:
+            with _FLIGHT_LOCK:
+                _IN_FLIGHT = None
+            done.set()
+
+    threading.Thread(target=_run, name="ai_layer-refresh", daemon=True).start()
+    return done
+
+
+def get_cached_intelligence(wait_timeout: float = _EMPTY_CACHE_WAIT_SECONDS) -> Mapping[str, Any]:
     """
-    Return the most recently cached intelligence data.
+    Return the most recently published intelligence snapshot (read-only).
 
-    If the cache is empty (scheduler not yet started), performs a
-    synchronous fetch as fallback. If that fails, uses file cache.
+    A stale snapshot is returned as-is while one background revalidation
+    runs. If the cache is empty, callers share a single in-flight refresh
+    and wait up to ``wait_timeout`` seconds for it; after that the file
+    cached intelligence is served until the refresh lands.
 
     Returns
     -------
-    dict
+    Mapping
         ``market_snapshot``  – from market_data.py
         ``macro_indicators`` – from macro_data.py
         ``signals``          – from market_signals.py
         ``last_updated``     – ISO timestamp of last refresh
     """
-    with _LOCK:
-        if _CACHE:
-            return dict(_CACHE)
+    snapshot = _SNAPSHOT
+    if snapshot:
+        if time.monotonic() - _PUBLISHED_AT > _STALE_AFTER_SECONDS:
+            _start_refresh()
+        return snapshot
 
-    logger.info("ai_layer: cache empty, running synchronous fetch...")
-    try:
-        _do_refresh()
-    except Exception as e:
-        logger.warning(f"Synchronous fetch failed: {e}")
-        try:
-            from data.cache.cache_manager import (
-                load_signals_fallback,
-                load_macro_fallback,
-            )
+    logger.info("ai_layer: cache empty, waiting for refresh...")
+    if not _start_refresh().wait(wait_timeout):
+        logger.warning("ai_layer: refresh still running after %.0fs", wait_timeout)
 
-            with _LOCK:
-                _CACHE["signals"] = load_signals_fallback()
-                _CACHE["macro_indicators"] = load_macro_fallback()
-                _CACHE["last_updated"] = datetime.now().isoformat(timespec="seconds")
-            logger.info("ai_layer: restored from file cache")
-        except Exception as ce:
-            logger.error(f"File cache fallback failed: {ce}")
-
-    with _LOCK:
-        return dict(_CACHE)
+    if not _SNAPSHOT:
+        _restore_from_cache()
+    return _SNAPSHOT
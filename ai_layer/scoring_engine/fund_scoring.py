@@ -16,11 +16,19 @@ market_fit_score logic:
     rising_inf→ equity categories get +0.10 (inflation hedge)
 
 Returns a ranked list of funds with score and ai_reason.
+
+``rank_funds`` scores all funds in one vectorised pass (the signal
+conditions are evaluated once per call and the market fit once per
+category). Scoring only adds top-level keys, so funds are copied
+shallowly; ``rank_funds(..., reasons=False)`` skips the ``ai_reason``
+strings and ``score_reason`` renders one when it is actually shown.
 """
 
 import logging
-from copy import deepcopy
-from typing import Any, Dict, List
+import numbers
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -38,27 +46,15 @@ _CATEGORY_FIT: Dict[str, Dict[str, float]] = {
 }
 
 
-def _compute_market_fit_score(category: str, signals: Dict[str, Any]) -> float:
-    """
-    Compute a 0–1 market-fit score for a fund category given current signals.
-
-    Bonuses are additive, capped at 1.0.
-    """
-    fit_map = _CATEGORY_FIT.get(category, {})
-    if not fit_map:
-        return 0.50  # neutral for unknown categories
-
-    base = 0.50
-    bonus = 0.0
-
+def _active_conditions(signals: Dict[str, Any]) -> Dict[str, bool]:
+    """Which ``_CATEGORY_FIT`` conditions the current signals switch on."""
     trend = signals.get("market_trend", "bullish")
     vol   = signals.get("volatility", "medium")
     inf   = signals.get("inflation_trend", "stable")
     rates = signals.get("interest_rate_trend", "stable")
     sent  = signals.get("global_sentiment", "neutral")
 
-    # Active conditions from signals
-    active: Dict[str, bool] = {
+    return {
         "bullish":        trend == "bullish",
         "bearish":        trend == "bearish",
         "low_vol":        vol == "low",
@@ -71,6 +67,25 @@ def _compute_market_fit_score(category: str, signals: Dict[str, Any]) -> float:
         "negative_global": sent == "negative",
     }
 
+
+def _compute_market_fit_score(
+    category: str, signals: Dict[str, Any], active: Optional[Dict[str, bool]] = None
+) -> float:
+    """
+    Compute a 0–1 market-fit score for a fund category given current signals.
+
+    Bonuses are additive, capped at 1.0. ``active`` may carry the
+    precomputed ``_active_conditions(signals)``.
+    """
+    fit_map = _CATEGORY_FIT.get(category, {})
+    if not fit_map:
+        return 0.50  # neutral for unknown categories
+
+    base = 0.50
+    bonus = 0.0
+    if active is None:
+        active = _active_conditions(signals)
+
     for condition, weight in fit_map.items():
         if active.get(condition, False):
             bonus += weight
@@ -88,6 +103,48 @@ def _compute_consistency(volatility_pct: float) -> float:
     return round(max(0.0, 1.0 - (volatility_pct / 40.0)), 3)
 
 
+def _metric(fund: Dict[str, Any], key: str, default: float) -> float:
+    """A numeric fund metric; anything else (e.g. None) is rejected on every scoring path."""
+    value = fund.get(key, default)
+    if not isinstance(value, numbers.Real):
+        raise TypeError(f"fund metric {key!r} must be a number, got {value!r}")
+    return value
+
+
+def _ai_reason(
+    ai_score: float,
+    ret_1y: Any,
+    ret_3y: Any,
+    consistency: float,
+    market_fit: float,
+    category: str,
+    signals: Dict[str, Any],
+) -> str:
+    """Human-readable scoring rationale for one fund."""
+    trend   = signals.get("market_trend", "bullish")
+    vol_sig = signals.get("volatility", "medium")
+    reason_parts = []
+
+    reason_parts.append(
+        f"Scored {ai_score:.1f}/100 based on 1Y/3Y returns ({ret_1y}% / {ret_3y}%), "
+        f"consistency ({consistency:.0%}), and market-fit ({market_fit:.0%})."
+    )
+
+    # Market fit narrative
+    if market_fit > 0.65:
+        reason_parts.append(
+            f"This category ({category}) is a strong fit for the current "
+            f"{'bearish' if trend == 'bearish' else 'bullish'} market with "
+            f"{'high' if vol_sig == 'high' else vol_sig} volatility."
+        )
+    elif market_fit < 0.50:
+        reason_parts.append(
+            f"This category ({category}) is a partial fit under current conditions — "
+            "consider weighting other funds higher if risk is a concern."
+        )
+    return " ".join(reason_parts)
+
+
 def score_fund(fund: Dict[str, Any], signals: Dict[str, Any]) -> Dict[str, Any]:
     """
     Compute a market-aware score for a single fund.
@@ -110,11 +167,11 @@ def score_fund(fund: Dict[str, Any], signals: Dict[str, Any]) -> Dict[str, Any]:
         ``consistency``      – 0–1 inverse volatility measure
         ``ai_reason``        – plain-English scoring rationale
     """
-    scored = deepcopy(fund)
+    scored = dict(fund)
 
-    ret_1y     = fund.get("1y", 0.0)
-    ret_3y     = fund.get("3y", 0.0)
-    vol_pct    = fund.get("volatility", 15.0)
+    ret_1y     = _metric(fund, "1y", 0.0)
+    ret_3y     = _metric(fund, "3y", 0.0)
+    vol_pct    = _metric(fund, "volatility", 15.0)
     category   = fund.get("category", "")
 
     consistency       = _compute_consistency(vol_pct)
@@ -130,40 +187,36 @@ def score_fund(fund: Dict[str, Any], signals: Dict[str, Any]) -> Dict[str, Any]:
 
     ai_score = round(max(0.0, raw_score), 2)
 
-    # ── Human-readable reason ─────────────────────────────────────────────────
-    trend   = signals.get("market_trend", "bullish")
-    vol_sig = signals.get("volatility", "medium")
-    reason_parts = []
-
-    reason_parts.append(
-        f"Scored {ai_score:.1f}/100 based on 1Y/3Y returns ({ret_1y}% / {ret_3y}%), "
-        f"consistency ({consistency:.0%}), and market-fit ({market_fit:.0%})."
-    )
-
-    # Market fit narrative
-    if market_fit > 0.65:
-        reason_parts.append(
-            f"This category ({category}) is a strong fit for the current "
-            f"{'bearish' if trend == 'bearish' else 'bullish'} market with "
-            f"{'high' if vol_sig == 'high' else vol_sig} volatility."
-        )
-    elif market_fit < 0.50:
-        reason_parts.append(
-            f"This category ({category}) is a partial fit under current conditions — "
-            "consider weighting other funds higher if risk is a concern."
-        )
-
     scored["ai_score"]         = ai_score
     scored["market_fit_score"] = market_fit
     scored["consistency"]      = consistency
-    scored["ai_reason"]        = " ".join(reason_parts)
+    scored["ai_reason"]        = _ai_reason(
+        ai_score, ret_1y, ret_3y, consistency, market_fit, category, signals
+    )
 
     return scored
 
 
+def score_reason(scored: Dict[str, Any], signals: Dict[str, Any]) -> str:
+    """
+    The ``ai_reason`` of a fund already scored by ``rank_funds`` or
+    ``score_fund``, for callers that ranked with ``reasons=False``.
+    """
+    return _ai_reason(
+        scored["ai_score"], scored.get("1y", 0.0), scored.get("3y", 0.0), scored["consistency"],
+        scored["market_fit_score"], scored.get("category", ""), signals,
+    )
+
+
+def _column(funds: List[Dict[str, Any]], key: str, default: float) -> np.ndarray:
+    return np.array([_metric(fund, key, default) for fund in funds], dtype=np.float64)
+
+
 def rank_funds(
     funds: List[Dict[str, Any]],
     signals: Dict[str, Any],
+    top_n: Optional[int] = None,
+    reasons: bool = True,
 ) -> List[Dict[str, Any]]:
     """
     Score and rank all funds by their market-aware AI score.
@@ -174,16 +227,59 @@ def rank_funds(
         List of fund dicts from recommendation_engine.
     signals : dict
         Output of ``market_signals.generate_signals()``.
+    top_n : int, optional
+        Return only the ``top_n`` best-scored funds. Every fund is scored,
+        but ``ai_reason`` is rendered only for the funds returned.
+    reasons : bool
+        Render ``ai_reason``. Pass False when only some funds are shown and
+        call ``score_reason`` for those.
 
     Returns
     -------
     list
         Same fund list, each extended with ``ai_score``, ``market_fit_score``,
-        ``consistency``, and ``ai_reason``. Sorted descending by ``ai_score``.
+        ``consistency``, and (with ``reasons``) ``ai_reason``. Sorted
+        descending by ``ai_score``.
     """
     if not funds:
         return []
 
-    scored = [score_fund(f, signals) for f in funds]
-    scored.sort(key=lambda x: x.get("ai_score", 0.0), reverse=True)
-    return scored
+    # Same arithmetic as score_fund, one array operation per term
+    ret_1y = _column(funds, "1y", 0.0)
+    ret_3y = _column(funds, "3y", 0.0)
+    vol_pct = _column(funds, "volatility", 15.0)
+    categories = [fund.get("category", "") for fund in funds]
+
+    active = _active_conditions(signals)
+    fit_by_category = {
+        category: _compute_market_fit_score(category, signals, active) for category in set(categories)
+    }
+    market_fit = np.array([fit_by_category[category] for category in categories], dtype=np.float64)
+    consistency_raw = np.fmax(0.0, 1.0 - (vol_pct / 40.0))
+    # Rounded with Python's round() so the values match score_fund exactly
+    consistency = [round(value, 3) for value in consistency_raw.tolist()]
+
+    raw_score = (
+        0.30 * ret_1y
+        + 0.30 * ret_3y
+        + 0.20 * np.array(consistency, dtype=np.float64) * 100
+        + 0.20 * market_fit * 100
+    )
+    ai_scores = [round(value, 2) for value in np.fmax(0.0, raw_score).tolist()]
+
+    # Stable sort on the score alone keeps score_fund's ordering of ties
+    order = sorted(range(len(funds)), key=ai_scores.__getitem__, reverse=True)
+    if top_n is not None:
+        order = order[:max(top_n, 0)]
+
+    ranked = []
+    for i in order:
+        fund, ai_score, fit = funds[i], ai_scores[i], fit_by_category[categories[i]]
+        scored = dict(fund)
+        scored["ai_score"] = ai_score
+        scored["market_fit_score"] = fit
+        scored["consistency"] = consistency[i]
+        if reasons:
+            scored["ai_reason"] = score_reason(scored, signals)
+        ranked.append(scored)
+    return ranked
@@ -4,10 +4,14 @@ from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).resolve().parent.parent.parent / ".env")
 
+import json
+import math
+import numbers
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -48,6 +52,21 @@ class EducationRequest(BaseModel):
     expected_return_rate: float
 
 
+class BatchRecommendationClient(BaseModel):
+    client_id: Union[int, str]
+    allocation: Dict[str, float]
+    risk_profile: str
+
+
+MAX_BATCH_CLIENTS = 10_000
+
+
+class BatchRecommendationRequest(BaseModel):
+    # Bounded so a single request cannot pin a worker
+    clients: List[BatchRecommendationClient] = Field(..., max_length=MAX_BATCH_CLIENTS)
+    market_signals: Optional[Dict[str, Any]] = None
+
+
 class ClientCreateRequest(BaseModel):
     name: str
     age: int
@@ -125,6 +144,29 @@ def _serialize_audit_log(entry: AuditLog) -> Dict[str, Any]:
     }
 
 
+def _json_default(value: Any) -> Any:
+    # NumPy scalars from the fund universe
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _finite_json(value: Any) -> Any:
+    """Map NaN / ±inf floats (missing fund metrics) to None, recursively."""
+    if isinstance(value, dict):
+        return {key: _finite_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite_json(item) for item in value]
+    if isinstance(value, numbers.Real) and not isinstance(value, numbers.Integral):
+        return float(value) if math.isfinite(value) else None
+    return value
+
+
+def _ndjson_line(record: Dict[str, Any]) -> str:
+    # Strict JSON: a bare NaN would break NDJSON consumers mid-stream
+    return json.dumps(_finite_json(record), default=_json_default, allow_nan=False) + "\n"
+
+
 def _is_admin(user: Advisor) -> bool:
     return str(user.role).lower() == "admin"
 
@@ -211,6 +253,27 @@ def get_allocation(risk_score: float):
     return get_asset_allocation(risk_score)
 
 
+@app.post("/api/recommendations/batch")
+def recommend_batch(req: BatchRecommendationRequest):
+    """
+    Fund recommendations for many clients, streamed as NDJSON: one line per
+    client in request order, then a ``{"summary": ...}`` line with the
+    throughput in clients per second.
+    """
+    # Lazy: the recommendation stack pulls in the market-data clients
+    from backend.engines.recommendation_engine import suggest_mutual_funds_batch
+
+    rows = [(client.client_id, client.allocation, client.risk_profile) for client in req.clients]
+
+    def stream():
+        stats: Dict[str, Any] = {}
+        for result in suggest_mutual_funds_batch(rows, market_signals=req.market_signals, stats=stats):
+            yield _ndjson_line(result)
+        yield _ndjson_line({"summary": stats})
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @app.post("/clients/")
 def create_client(
     payload: ClientCreateRequest,
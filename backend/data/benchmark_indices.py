@@ -1,6 +1,17 @@
 import json
+import logging
+import os
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.data.columnar_store import load_snapshot, publish_snapshot
+
+logger = logging.getLogger(__name__)
 
 
 _FIXTURE_PATH = (
@@ -20,7 +31,20 @@ _CATEGORY_BENCHMARKS = {
     "commodity": "Gold Price Index"
 }
 
+# Daily series used as stand-ins for each benchmark index (yfinance tickers)
+BENCHMARK_TICKERS = {
+    "Nifty 50 TRI": "^NSEI",
+    "Nifty Midcap 150 TRI": "MID150BEES.NS",
+    "CRISIL Short Term Bond Index": "LIQUIDBEES.NS",
+    "Gold Price Index": "GOLDBEES.NS",
+}
+
+BENCHMARK_SERIES_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "ai_agents", "data", "benchmark_series")
+)
+
 
+@lru_cache(maxsize=1)
 def load_benchmark_fixture() -> Dict[str, Dict[str, float]]:
     with open(_FIXTURE_PATH, "r", encoding="utf-8") as fh:
         return json.load(fh)
@@ -42,26 +66,126 @@ def benchmark_metrics_for_category(category: str) -> Dict[str, Any]:
 
 
 def enrich_with_benchmark_metrics(fund: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Attach benchmark-relative metrics to a fund dict.
+
+    When the fund carries a ``scheme_code`` with published NAV-based analytics
+    (see ``benchmark_analytics_engine``), beta, tracking error, information
+    ratio and trailing alphas come from the aligned return series, plus the
+    rolling 1Y alpha summary when available. Otherwise they are approximated
+    from the benchmark fixture.
+    """
     benchmark = benchmark_metrics_for_category(fund.get("category", ""))
     fund_1y = float(fund.get("1y", 0.0))
     fund_3y = float(fund.get("3y", 0.0))
     benchmark_1y = float(benchmark.get("1y_return", 0.0))
     benchmark_3y = float(benchmark.get("3y_return", 0.0))
-    fund_volatility = float(fund.get("volatility", 0.0))
-    benchmark_volatility = float(benchmark.get("volatility", 0.0))
-    tracking_error = max(abs(fund_volatility - benchmark_volatility), 0.01)
-    alpha_3y = fund_3y - benchmark_3y
 
-    return {
+    analytics = None
+    if fund.get("scheme_code") is not None:
+        from backend.engines.benchmark_analytics_engine import lookup_benchmark_analytics
+
+        analytics = lookup_benchmark_analytics(fund["scheme_code"])
+
+    enriched = {
         **fund,
         "benchmark_index": benchmark["benchmark_index"],
         "benchmark_1y_return": round(benchmark_1y, 2),
         "benchmark_3y_return": round(benchmark_3y, 2),
-        "alpha_1y": round(fund_1y - benchmark_1y, 2),
-        "alpha_3y": round(alpha_3y, 2),
-        "information_ratio": round(alpha_3y / tracking_error, 2),
-        "tracking_error": round(tracking_error, 2),
     }
+    if analytics and not np.isnan(analytics["tracking_error"]):
+        def _metric(name: str, fallback: float) -> float:
+            value = analytics.get(name, np.nan)
+            return round(float(fallback if np.isnan(value) else value), 2)
+
+        enriched.update(
+            {
+                "alpha_1y": _metric("alpha_1y", fund_1y - benchmark_1y),
+                "alpha_3y": _metric("alpha_3y", fund_3y - benchmark_3y),
+                "beta": _metric("beta", 1.0),
+                "information_ratio": _metric("information_ratio", 0.0),
+                "tracking_error": _metric("tracking_error", 0.0),
+                "benchmark_metrics_source": "nav_history",
+            }
+        )
+        for name in ("rolling_alpha_1y_median", "rolling_alpha_1y_positive"):
+            value = analytics.get(name, np.nan)
+            if not np.isnan(value):
+                enriched[name] = round(float(value), 2)
+        return enriched
+
+    fund_volatility = float(fund.get("volatility", 0.0))
+    benchmark_volatility = float(benchmark.get("volatility", 0.0))
+    tracking_error = max(abs(fund_volatility - benchmark_volatility), 0.01)
+    alpha_3y = fund_3y - benchmark_3y
+    enriched.update(
+        {
+            "alpha_1y": round(fund_1y - benchmark_1y, 2),
+            "alpha_3y": round(alpha_3y, 2),
+            # No return history to regress on: assume the fund moves with its benchmark
+            "beta": 1.0,
+            "information_ratio": round(alpha_3y / tracking_error, 2),
+            "tracking_error": round(tracking_error, 2),
+        }
+    )
+    return enriched
+
+
+def benchmark_names() -> Tuple[str, ...]:
+    return tuple(BENCHMARK_TICKERS)
+
+
+def fetch_benchmark_series(years: int = 5) -> Optional[str]:
+    """
+    Download daily closes for every benchmark index and publish them as a
+    columnar snapshot (``date`` + one float column per benchmark).
+    Returns the snapshot version, or None if nothing could be fetched.
+    """
+    import yfinance as yf
+
+    end = datetime.today()
+    start = end - timedelta(days=365 * years + 30)
+    closes = {}
+    for name, ticker in BENCHMARK_TICKERS.items():
+        try:
+            data = yf.download(
+                ticker,
+                start=start.strftime("%Y-%m-%d"),
+                end=end.strftime("%Y-%m-%d"),
+                progress=False,
+                auto_adjust=True,
+                timeout=10,
+            )
+            if data is None or data.empty:
+                logger.warning(f"No benchmark data for {name} ({ticker})")
+                continue
+            closes[name] = data["Close"].squeeze().dropna()
+        except Exception as e:
+            logger.error(f"Failed to fetch benchmark {name} ({ticker}): {e}")
+
+    if not closes:
+        return None
+
+    frame = pd.DataFrame(closes).sort_index()
+    columns = {"date": frame.index.values.astype("datetime64[D]")}
+    for name in BENCHMARK_TICKERS:
+        values = frame[name] if name in frame.columns else pd.Series(np.nan, index=frame.index)
+        columns[name] = values.to_numpy(dtype=np.float64)
+    return publish_snapshot(BENCHMARK_SERIES_DIR, columns, meta={"tickers": BENCHMARK_TICKERS})
+
+
+def load_benchmark_series() -> Optional[Tuple[np.ndarray, np.ndarray, Tuple[str, ...], str]]:
+    """
+    Return ``(dates, levels, names, version)`` from the persisted benchmark
+    snapshot, where ``levels`` is a (dates × benchmarks) matrix; None if absent.
+    """
+    snapshot = load_snapshot(BENCHMARK_SERIES_DIR)
+    if snapshot is None:
+        return None
+    columns, meta = snapshot
+    names = tuple(name for name in BENCHMARK_TICKERS if name in columns)
+    levels = np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in names])
+    return np.asarray(columns["date"], dtype="datetime64[D]"), levels, names, meta["version"]
 
 
 def infer_fund_type(name: str) -> str:
@@ -69,3 +193,14 @@ def infer_fund_type(name: str) -> str:
     if " etf" in normalized or normalized.endswith("etf") or "exchange traded fund" in normalized:
         return "ETF"
     return "Mutual Fund"
+
+
+def infer_fund_types(names: pd.Series) -> np.ndarray:
+    """``infer_fund_type`` over a whole column with vectorised string masks."""
+    normalized = names.fillna("").astype(str).str.lower()
+    is_etf = (
+        normalized.str.contains(" etf", regex=False)
+        | normalized.str.endswith("etf")
+        | normalized.str.contains("exchange traded fund", regex=False)
+    )
+    return np.where(is_etf.to_numpy(), "ETF", "Mutual Fund")
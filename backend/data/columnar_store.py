@@ -0,0 +1,199 @@
+"""
+backend/data/columnar_store.py
+──────────────────────────────
+Versioned, memory-mappable columnar snapshots built on plain NumPy ``.npy``
+files.
+
+Layout of a snapshot root::
+
+    <root>/CURRENT            ← name of the live version (swapped atomically)
+    <root>/<version>/_meta.json
+    <root>/<version>/<column>.npy                 (numeric / fixed-width text)
+    <root>/<version>/<column>.codes.npy           (dictionary-encoded text)
+    <root>/<version>/<column>.values.npy
+
+Readers open every column with ``mmap_mode="r"`` so several worker processes
+share one physical copy of the data through the page cache.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_CURRENT_FILE = "CURRENT"
+_META_FILE = "_meta.json"
+_KEEP_VERSIONS = 3
+
+
+def dictionary_encode(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split a text column into (int32 codes, unique values table)."""
+    table, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return codes.astype(np.int32), table
+
+
+def _atomic_write_text(path: str, text: str) -> None:
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def current_version(root: str) -> Optional[str]:
+    """Return the live version name under ``root`` or None if nothing is published."""
+    try:
+        with open(os.path.join(root, _CURRENT_FILE), "r") as fh:
+            version = fh.read().strip()
+    except OSError:
+        return None
+    return version or None
+
+
+def publish_snapshot(
+    root: str,
+    columns: Dict[str, np.ndarray],
+    dictionary_columns: Tuple[str, ...] = (),
+    meta: Optional[Dict[str, Any]] = None,
+    version: Optional[str] = None,
+) -> str:
+    """
+    Write ``columns`` as a new snapshot version and make it live atomically.
+
+    Text columns listed in ``dictionary_columns`` are stored as int32 codes plus
+    a values table (pass a ``(codes, values)`` tuple to skip re-encoding a
+    column that is already dictionary-encoded); all other columns are stored as-is (object arrays are
+    converted to fixed-width unicode so they stay memory-mappable).
+    Returns the published version name.
+    """
+    os.makedirs(root, exist_ok=True)
+    version = version or datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    staging = tempfile.mkdtemp(dir=root, prefix=".staging-")
+    schema: Dict[str, str] = {}
+    length = None
+
+    try:
+        for name, values in columns.items():
+            # Dictionary columns may arrive already encoded as (codes, values)
+            encoded = name in dictionary_columns and isinstance(values, tuple)
+            if encoded:
+                codes, table = np.asarray(values[0], dtype=np.int32), np.asarray(values[1], dtype=str)
+                values = codes
+            else:
+                values = np.asarray(values)
+                if values.dtype == object:
+                    values = values.astype(str)
+            length = len(values) if length is None else length
+            if len(values) != length:
+                raise ValueError(f"Column {name!r} has {len(values)} rows, expected {length}")
+
+            if name in dictionary_columns:
+                if not encoded:
+                    codes, table = dictionary_encode(values)
+                np.save(os.path.join(staging, f"{name}.codes.npy"), codes)
+                np.save(os.path.join(staging, f"{name}.values.npy"), table)
+                schema[name] = "dictionary"
+            else:
+                np.save(os.path.join(staging, f"{name}.npy"), values)
+                schema[name] = "plain"
+
+        payload = {
+            "version": version,
+            "rows": int(length or 0),
+            "schema": schema,
+            "published_at": datetime.now().isoformat(timespec="seconds"),
+            **(meta or {}),
+        }
+        with open(os.path.join(staging, _META_FILE), "w") as fh:
+            json.dump(payload, fh, separators=(",", ":"), default=str)
+
+        target = os.path.join(root, version)
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.replace(staging, target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    _atomic_write_text(os.path.join(root, _CURRENT_FILE), version)
+    _prune_versions(root, keep=version)
+    logger.info("[ColumnarStore] Published %s (%d rows) to %s", version, length or 0, root)
+    return version
+
+
+def update_snapshot_meta(root: str, updates: Dict[str, Any]) -> None:
+    """Merge ``updates`` into the live snapshot's metadata (e.g. refreshed HTTP validators)."""
+    version = current_version(root)
+    if version is None:
+        return
+    meta_path = os.path.join(root, version, _META_FILE)
+    with open(meta_path, "r") as fh:
+        meta = json.load(fh)
+    meta.update(updates)
+    _atomic_write_text(meta_path, json.dumps(meta, separators=(",", ":"), default=str))
+
+
+def _prune_versions(root: str, keep: str) -> None:
+    """Drop all but the newest few versions. Open memory maps stay valid on POSIX."""
+    versions = sorted(
+        entry for entry in os.listdir(root)
+        if not entry.startswith(".") and entry != _CURRENT_FILE
+        and os.path.isdir(os.path.join(root, entry))
+    )
+    for stale in versions[:-_KEEP_VERSIONS]:
+        if stale != keep:
+            shutil.rmtree(os.path.join(root, stale), ignore_errors=True)
+
+
+def load_snapshot_meta(root: str) -> Optional[Dict[str, Any]]:
+    """Read only the metadata of the live snapshot (cheap; no column I/O)."""
+    version = current_version(root)
+    if version is None:
+        return None
+    try:
+        with open(os.path.join(root, version, _META_FILE), "r") as fh:
+            return json.load(fh)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"[ColumnarStore] Unreadable snapshot metadata in {root}: {e}")
+        return None
+
+
+def load_snapshot(
+    root: str, mmap: bool = True, decode: bool = True
+) -> Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]:
+    """
+    Open the live snapshot under ``root``.
+
+    With ``mmap=True`` plain columns are returned as read-only memory maps.
+    Dictionary columns are expanded to full text arrays when ``decode`` is True;
+    otherwise they are returned as ``(codes, values)`` tuples.
+    """
+    meta = load_snapshot_meta(root)
+    if meta is None:
+        return None
+
+    directory = os.path.join(root, meta["version"])
+    mmap_mode = "r" if mmap else None
+    columns: Dict[str, Any] = {}
+    for name, kind in meta.get("schema", {}).items():
+        if kind == "dictionary":
+            codes = np.load(os.path.join(directory, f"{name}.codes.npy"), mmap_mode=mmap_mode)
+            table = np.load(os.path.join(directory, f"{name}.values.npy"))
+            columns[name] = table[codes] if decode else (codes, table)
+        else:
+            columns[name] = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+    return columns, meta
@@ -0,0 +1,246 @@
+"""
+backend/data/fund_universe_store.py
+───────────────────────────────────
+Process-wide, memory-resident copy of the fund universe written by the
+FundDataAgent.
+
+The agent publishes the processed universe twice:
+
+  ai_agents/data/mutual_funds.csv   ← human-readable export
+  ai_agents/data/fund_universe/     ← versioned columnar snapshot
+                                      (backend/data/columnar_store.py)
+
+Readers prefer the columnar snapshot. Its numeric columns are memory-mapped
+``.npy`` files, so every uvicorn / Streamlit / Celery process shares one
+physical copy through the page cache. The low-cardinality text columns are
+stored as int32 codes plus a values table and come back as categoricals.
+Without a snapshot the CSV is parsed once with the same compact dtypes:
+categoricals for the low-cardinality text columns and float32 for the
+metrics.
+
+``snapshot()`` checks for a new version at most every
+``_STAT_INTERVAL_SECONDS``. That is the snapshot's ``CURRENT`` pointer, or
+the CSV's mtime and size. A new version is loaded off to the side and
+swapped in with a single assignment, so callers always see either the old
+or the new frame, never a half-loaded one. Columns derived purely from the
+data (``fund_type`` from the scheme name) are computed once per version.
+
+The returned frame is shared (and partly backed by read-only memory maps):
+treat it as read-only and copy before mutating.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.data.columnar_store import current_version, load_snapshot, publish_snapshot
+
+logger = logging.getLogger(__name__)
+
+FUNDS_CSV_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "ai_agents", "data", "mutual_funds.csv")
+)
+FUNDS_SNAPSHOT_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "ai_agents", "data", "fund_universe")
+)
+
+CATEGORICAL_COLUMNS = ("amc", "category", "risk")
+METRIC_COLUMNS = (
+    "nav", "aum_crore", "expense_ratio", "1y", "3y", "5y", "volatility", "sharpe", "ranking_score",
+)
+UNIVERSE_DTYPES = {
+    **{name: "category" for name in CATEGORICAL_COLUMNS},
+    **{name: np.float32 for name in METRIC_COLUMNS},
+    # Codes stay text on every path (CSV, columnar snapshot, AMFI parse)
+    "scheme_code": str,
+    "isin": object,
+    "scheme_name": object,
+    "date": object,
+}
+# Text columns stored as codes + values table in the columnar snapshot
+_DICTIONARY_COLUMNS = (*CATEGORICAL_COLUMNS, "fund_type", "date")
+_STAT_INTERVAL_SECONDS = 1.0
+
+
+def _add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    from backend.data.benchmark_indices import infer_fund_types
+
+    if "scheme_name" in df.columns and "fund_type" not in df.columns:
+        df["fund_type"] = pd.Categorical(infer_fund_types(df["scheme_name"]))
+    return df
+
+
+def read_fund_universe(path: str) -> pd.DataFrame:
+    """Parse a fund universe CSV with the compact ``UNIVERSE_DTYPES`` and add derived columns."""
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {name: dtype for name, dtype in UNIVERSE_DTYPES.items() if name in header}
+    return _add_derived_columns(pd.read_csv(path, dtype=dtypes))
+
+
+def publish_fund_universe(
+    df: pd.DataFrame,
+    root: str = FUNDS_SNAPSHOT_DIR,
+    meta: Optional[Dict[str, Any]] = None,
+    version: Optional[str] = None,
+) -> str:
+    """
+    Publish ``df`` as a new columnar snapshot version (made live atomically).
+    Metrics are stored as float32, the low-cardinality text columns
+    dictionary-encoded. Returns the version name.
+    """
+    df = _add_derived_columns(df.copy())
+    columns: Dict[str, np.ndarray] = {}
+    for name in df.columns:
+        series = df[name]
+        if name in _DICTIONARY_COLUMNS or name == "scheme_code":
+            columns[name] = series.astype(str).to_numpy(dtype=object)
+        elif name in METRIC_COLUMNS:
+            columns[name] = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float32)
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            columns[name] = series.to_numpy()
+        else:
+            columns[name] = series.fillna("").astype(str).to_numpy(dtype=object)
+    return publish_snapshot(
+        root,
+        columns,
+        dictionary_columns=tuple(name for name in _DICTIONARY_COLUMNS if name in columns),
+        meta={"columns": list(df.columns), **(meta or {})},
+        version=version,
+    )
+
+
+def read_fund_universe_snapshot(root: str = FUNDS_SNAPSHOT_DIR) -> Optional[Tuple[str, pd.DataFrame]]:
+    """
+    ``(version, frame)`` for the live snapshot under ``root``, or None.
+    Numeric columns stay memory-mapped (no copy); dictionary columns become
+    categoricals over the stored codes. ``frame.attrs["is_live_amfi"]``
+    carries the flag the agent published with the version.
+    """
+    snapshot = load_snapshot(root, mmap=True, decode=False)
+    if snapshot is None:
+        return None
+    columns, meta = snapshot
+    data: Dict[str, Any] = {}
+    for name in meta.get("columns", list(columns)):
+        values = columns.get(name)
+        if values is None:
+            continue
+        if isinstance(values, tuple):
+            codes, table = values
+            data[name] = pd.Categorical.from_codes(np.asarray(codes), categories=pd.Index(table.astype(object)))
+        elif values.dtype.kind == "U":
+            data[name] = values.astype(object)
+        else:
+            data[name] = values
+    df = pd.DataFrame(data, copy=False)
+    # Whether the agent built this version from live AMFI data (not a fallback)
+    df.attrs["is_live_amfi"] = bool(meta.get("is_live_amfi", False))
+    return meta["version"], df
+
+
+class FundUniverseStore:
+    def __init__(
+        self,
+        path: str = FUNDS_CSV_PATH,
+        snapshot_root: Optional[str] = None,
+        stat_interval: float = _STAT_INTERVAL_SECONDS,
+    ):
+        self.path = path
+        self.snapshot_root = snapshot_root
+        self.stat_interval = stat_interval
+        self._lock = threading.Lock()
+        # (version, frame) — replaced as a unit so readers never see a mix
+        self._current: Optional[Tuple[str, pd.DataFrame]] = None
+        self._checked_at = float("-inf")
+
+    def _latest_version(self) -> Optional[Tuple[str, bool]]:
+        """``(version, is_columnar)`` of the newest available universe, or None."""
+        if self.snapshot_root is not None:
+            version = current_version(self.snapshot_root)
+            if version is not None:
+                return version, True
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return f"{st.st_mtime_ns}-{st.st_size}", False
+
+    @property
+    def version(self) -> Optional[str]:
+        """Version of the loaded universe, or None before the first load."""
+        current = self._current
+        return current[0] if current is not None else None
+
+    def snapshot(self) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+        """
+        ``(version, frame)`` of the current universe, reloading first if a new
+        version was published. Keeps the last good frame if a reload fails;
+        ``(None, None)`` if nothing was ever loaded.
+        """
+        current = self._current
+        now = time.monotonic()
+        if current is None or now - self._checked_at >= self.stat_interval:
+            current = self._refresh(now)
+        if current is None:
+            return None, None
+        return current
+
+    def frame(self) -> Optional[pd.DataFrame]:
+        """The current universe (see ``snapshot``)."""
+        return self.snapshot()[1]
+
+    def _refresh(self, now: float) -> Optional[Tuple[str, pd.DataFrame]]:
+        with self._lock:
+            current = self._current
+            if current is not None and now - self._checked_at < self.stat_interval:
+                return current
+            self._checked_at = now
+            latest = self._latest_version()
+            if latest is None:
+                if current is None:
+                    logger.warning(f"[FundUniverse] {self.path} not found! Did the fund_data_agent run?")
+                return current
+            version, is_columnar = latest
+            if current is not None and current[0] == version:
+                return current
+
+            started = time.perf_counter()
+            try:
+                if is_columnar:
+                    loaded = read_fund_universe_snapshot(self.snapshot_root)
+                    if loaded is None:
+                        return current
+                    version, df = loaded
+                else:
+                    df = read_fund_universe(self.path)
+            except Exception as e:
+                logger.error(f"[FundUniverse] Failed to load fund universe: {e}")
+                return current
+            self._current = (version, df)
+            logger.info(
+                f"[FundUniverse] Loaded {len(df)} funds ({'columnar snapshot' if is_columnar else 'CSV'} {version}) "
+                f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+            return self._current
+
+    def invalidate(self) -> None:
+        """Force the next ``snapshot()`` call to look for a new version."""
+        self._checked_at = float("-inf")
+
+
+_default_store: Optional[FundUniverseStore] = None
+_default_lock = threading.Lock()
+
+
+def get_fund_universe_store() -> FundUniverseStore:
+    """Process-wide store instance (columnar snapshot first, CSV fallback)."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = FundUniverseStore(FUNDS_CSV_PATH, snapshot_root=FUNDS_SNAPSHOT_DIR)
+        return _default_store
@@ -3,11 +3,12 @@ import pandas as pd
 import numpy as np
 import json
 import os
-import time
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 
+from backend.utils.circuit_breaker import RetryPolicy, yahoo_breaker
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
@@ -37,25 +38,22 @@ TICKER_MAP = {
 }
 
 
+def _save_market_data(stats: dict, correlation_matrix: pd.DataFrame) -> None:
+    """Write the proxy statistics through every intelligence-cache tier."""
+    from data.cache.tiered_cache import get_intelligence_cache
+
+    get_intelligence_cache().set(
+        "market_data", {"stats": stats, "correlation_matrix": correlation_matrix.to_dict()}
+    )
+
+
 def _retry_with_backoff(func, max_retries: int = MAX_RETRIES):
-    """Decorator: retry with exponential backoff."""
+    """Decorator: run through the proxy-batch yfinance circuit breaker with retry and backoff."""
+    policy = RetryPolicy(max_attempts=max_retries, initial_backoff=INITIAL_BACKOFF)
 
     def wrapper(*args, **kwargs):
-        last_error = None
-        for attempt in range(max_retries):
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    wait_time = INITIAL_BACKOFF * (2**attempt)
-                    logger.warning(
-                        f"Attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s..."
-                    )
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"All {max_retries} attempts failed: {e}")
-        raise last_error
+        # One breaker for the multi-ticker proxy download, separate from the per-ticker ones
+        return yahoo_breaker(",".join(TICKER_MAP.values())).call(func, *args, policy=policy, **kwargs)
 
     return wrapper
 
@@ -115,11 +113,11 @@ class MarketDataFetcher:
         return pd.DataFrame()
 
     def _load_from_cache(self) -> Optional[pd.DataFrame]:
-        """Load data from file cache."""
+        """Load data from the intelligence cache ("market_data"), stale entries included."""
         try:
-            from data.cache.cache_manager import load_market_data_fallback
+            from data.cache.tiered_cache import get_intelligence_cache
 
-            cached = load_market_data_fallback()
+            cached = get_intelligence_cache().get("market_data", allow_stale=True)
             if cached and "data" in cached:
                 return pd.DataFrame(cached["data"])
         except Exception as e:
@@ -127,9 +125,8 @@ class MarketDataFetcher:
         return None
 
     def _save_to_cache(self, data: pd.DataFrame) -> None:
-        """Save data to file cache."""
+        """Save data to the intelligence cache ("market_data")."""
         try:
-            from data.cache.cache_manager import save_market_data
             from data.cache.cache_manager import DEFAULT_MARKET_DATA
 
             stats = {
@@ -138,7 +135,7 @@ class MarketDataFetcher:
                 )
                 for k in TICKER_MAP.keys()
             }
-            save_market_data(stats, pd.DataFrame())
+            _save_market_data(stats, pd.DataFrame())
         except Exception as e:
             logger.warning(f"Cache save failed: {e}")
 
@@ -207,9 +204,7 @@ class MarketDataFetcher:
         stats, corr = self.compute_statistics()
 
         try:
-            from data.cache.cache_manager import save_market_data
-
-            save_market_data(stats, corr)
+            _save_market_data(stats, corr)
         except Exception as e:
             logger.warning(f"Failed to save to cache: {e}")
 
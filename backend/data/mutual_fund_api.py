@@ -1,15 +1,36 @@
 import requests
 import pandas as pd
-from typing import Optional
+import numpy as np
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
 import logging
+import os
 import streamlit as st
-import io
-import time
+
+from backend.data.columnar_store import (
+    load_snapshot,
+    load_snapshot_meta,
+    publish_snapshot,
+    update_snapshot_meta,
+)
+from backend.utils.circuit_breaker import CircuitOpenError, RetryPolicy, breaker_for_url
 
 logger = logging.getLogger(__name__)
 
 AMFI_URL = "https://www.amfiindia.com/spages/NAVAll.txt"
 
+# Parsed NAVAll.txt is persisted here as a memory-mappable columnar snapshot
+# together with the HTTP validators (ETag / Last-Modified) of the response.
+AMFI_SNAPSHOT_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "cache", "amfi_navall")
+)
+
+# Up to 3 attempts with 2s, 4s backoff on transport / HTTP errors
+_AMFI_RETRY_POLICY = RetryPolicy(
+    max_attempts=3, initial_backoff=2, retry_on=(requests.exceptions.RequestException,)
+)
+
 # Browser-like headers to avoid being blocked by AMFI on cloud servers
 REQUEST_HEADERS = {
     "User-Agent": (
@@ -23,88 +44,204 @@ REQUEST_HEADERS = {
 }
 
 
+def parse_navall_lines(lines: Iterable[str]) -> Dict[str, np.ndarray]:
+    """
+    Stream-parse NAVAll.txt lines straight into columnar arrays.
+
+    AMC header lines (no ';', containing "Mutual Fund") set the current AMC;
+    scheme lines are ``code;isin_growth;isin_reinvest;name;nav;date``.
+    Rows with a non-numeric NAV (e.g. "N.A.") are skipped.
+    AMC and date are dictionary-encoded while reading since they repeat
+    across thousands of rows, and are returned as ``(codes, values)`` so
+    ``publish_snapshot`` stores them without re-encoding.
+    """
+    scheme_codes = []
+    isins = []
+    names = []
+    navs = array("d")
+    date_codes = array("i")
+    amc_codes = array("i")
+    date_table: Dict[str, int] = {}
+    amc_table: Dict[str, int] = {"": 0}
+    current_amc = 0
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        if ";" not in line:
+            if "Mutual Fund" in line:
+                current_amc = amc_table.setdefault(line, len(amc_table))
+            continue
+
+        parts = line.split(";")
+        if len(parts) < 6 or parts[0] == "Scheme Code":
+            continue
+        try:
+            nav = float(parts[4])
+        except ValueError:
+            continue
+
+        date_str = parts[5].strip()
+        scheme_codes.append(parts[0].strip())
+        isins.append(parts[1].strip())
+        names.append(parts[3].strip())
+        navs.append(nav)
+        date_codes.append(date_table.setdefault(date_str, len(date_table)))
+        amc_codes.append(current_amc)
+
+    return {
+        "scheme_code": np.array(scheme_codes, dtype=str),
+        "isin": np.array(isins, dtype=str),
+        "scheme_name": np.array(names, dtype=str),
+        "nav": np.frombuffer(navs, dtype=np.float64),
+        "date": (np.frombuffer(date_codes, dtype=np.int32), np.array(list(date_table), dtype=str)),
+        "amc": (np.frombuffer(amc_codes, dtype=np.int32), np.array(list(amc_table), dtype=str)),
+    }
+
+
+def _columns_to_frame(columns: Dict[str, Any]) -> pd.DataFrame:
+    """Frame over parsed or loaded columns; ``(codes, values)`` columns are decoded here."""
+    data = {}
+    for name in ("scheme_code", "isin", "scheme_name", "nav", "date", "amc"):
+        values = columns[name]
+        if isinstance(values, tuple):
+            codes, table = values
+            values = table[np.asarray(codes)]
+        data[name] = values
+    return pd.DataFrame(data)
+
+
+def _conditional_headers(meta: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    headers = dict(REQUEST_HEADERS)
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def load_amfi_snapshot() -> Optional[pd.DataFrame]:
+    """Return the last persisted AMFI NAV snapshot (memory-mapped) or None."""
+    snapshot = load_snapshot(AMFI_SNAPSHOT_DIR, decode=False)
+    if snapshot is None:
+        return None
+    columns, _ = snapshot
+    return _columns_to_frame(columns)
+
+
+def _download_navall(meta: Optional[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    One conditional GET of NAVAll.txt. Raises ``requests.RequestException``
+    on transport / HTTP errors so the caller's retry policy can decide, and
+    ``ValueError`` when a response yields no NAV rows (e.g. an HTML error
+    page or a truncated body).
+    """
+    with requests.get(
+        AMFI_URL,
+        timeout=20,
+        headers=_conditional_headers(meta),
+        stream=True,
+    ) as response:
+        if response.status_code == 304:
+            df = load_amfi_snapshot()
+            if df is not None and not df.empty:
+                update_snapshot_meta(
+                    AMFI_SNAPSHOT_DIR,
+                    {"validated_at": datetime.now().isoformat(timespec="seconds")},
+                )
+                logger.info(f"AMFI NAVs unchanged (304); serving {len(df)} funds from snapshot")
+                return df
+            if meta is None:
+                raise ValueError("AMFI answered 304 to an unconditional request")
+            # Snapshot vanished underneath us: refetch unconditionally
+            return _download_navall(None)
+
+        response.raise_for_status()
+        response.encoding = response.encoding or "utf-8"
+        columns = parse_navall_lines(response.iter_lines(decode_unicode=True))
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "source_url": AMFI_URL,
+        }
+
+    if len(columns["nav"]) == 0:
+        raise ValueError("AMFI NAV response parsed to no rows")
+
+    try:
+        publish_snapshot(
+            AMFI_SNAPSHOT_DIR,
+            columns,
+            dictionary_columns=("date", "amc"),
+            meta=validators,
+        )
+    except OSError as e:
+        logger.warning(f"Could not persist AMFI snapshot: {e}")
+
+    df = _columns_to_frame(columns)
+    logger.info(f"Successfully fetched {len(df)} funds from AMFI")
+    return df
+
+
 @st.cache_data(ttl=3600, show_spinner="Fetching live AMFI NAV data...")
-def fetch_amfi_nav_data() -> Optional[pd.DataFrame]:
+def fetch_live_amfi_nav_data() -> pd.DataFrame:
     """
     Fetches live NAV data from AMFI endpoint with retry logic.
-    Parses the text response and converts it to a structured Pandas DataFrame.
+
+    Sends a conditional GET using the validators of the persisted snapshot;
+    a 304 answer is served from the memory-mapped snapshot. Otherwise the
+    response is stream-parsed into columns and published as the new snapshot.
+    Requests go through the shared AMFI circuit breaker, so while AMFI is
+    down this fails fast. Failures raise, so only live data is memoised.
     """
     logger.info("Fetching live AMFI NAV data")
+    meta = load_snapshot_meta(AMFI_SNAPSHOT_DIR)
+    return breaker_for_url(AMFI_URL).call(_download_navall, meta, policy=_AMFI_RETRY_POLICY)
 
-    # Retry up to 3 times with increasing delay
-    for attempt in range(3):
-        try:
-            response = requests.get(AMFI_URL, timeout=20, headers=REQUEST_HEADERS)
-            response.raise_for_status()
-
-            # Parse the text response
-            lines = response.text.split("\n")
-
-            data = []
-            current_amc = ""
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                if ";" not in line:
-                    if "Mutual Fund" in line:
-                        current_amc = line
-                    continue
-
-                parts = line.split(";")
-                if len(parts) >= 6 and parts[0] != "Scheme Code":
-                    scheme_code = parts[0].strip()
-                    isin_growth = parts[1].strip()
-                    scheme_name = parts[3].strip()
-                    nav_str = parts[4].strip()
-                    date_str = parts[5].strip()
-
-                    try:
-                        nav = float(nav_str)
-                        data.append(
-                            {
-                                "scheme_code": scheme_code,
-                                "isin": isin_growth,
-                                "scheme_name": scheme_name,
-                                "nav": nav,
-                                "date": date_str,
-                                "amc": current_amc,
-                            }
-                        )
-                    except ValueError:
-                        continue
-
-            df = pd.DataFrame(data)
-            if df.empty:
-                logger.warning("AMFI NAV data fetched but DataFrame is empty")
-                return None
-
-            logger.info(f"Successfully fetched {len(df)} funds from AMFI")
-            return df
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Attempt {attempt + 1}/3 failed to fetch AMFI data: {e}")
-            if attempt < 2:
-                time.sleep(2 * (attempt + 1))  # 2s, 4s backoff
-            continue
-        except Exception as e:
-            logger.error(f"Error parsing AMFI data: {e}")
-            return None
 
-    logger.error("All 3 attempts to fetch AMFI NAV data failed")
-    return None
+def fetch_amfi_nav_data() -> Optional[pd.DataFrame]:
+    """
+    Live AMFI NAVs (memoised for an hour by ``fetch_live_amfi_nav_data``).
+    On any failure the last published snapshot is served instead
+    (``df.attrs["stale"]`` is set), or None if there is none. The stale
+    fallback is never memoised, so recovery is picked up on the next call.
+    """
+    try:
+        return fetch_live_amfi_nav_data()
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping AMFI fetch: {e}")
+    except requests.exceptions.RequestException as e:
+        logger.error(f"All attempts to fetch AMFI NAV data failed: {e}")
+    except Exception as e:
+        logger.error(f"Error parsing AMFI data: {e}")
+    return _stale_snapshot()
+
+
+def _stale_snapshot() -> Optional[pd.DataFrame]:
+    """The last published snapshot, flagged as not live, when AMFI cannot be reached."""
+    try:
+        df = load_amfi_snapshot()
+    except Exception as e:
+        logger.error(f"Could not read the last AMFI snapshot: {e}")
+        return None
+    if df is None or df.empty:
+        return None
+    df.attrs["stale"] = True
+    logger.warning(f"Serving {len(df)} funds from the last AMFI snapshot")
+    return df
 
 
 def get_mutual_fund_universe() -> tuple[pd.DataFrame, bool]:
     """
     Returns the Mutual Fund universe dataframe and a boolean indicating
-    if it's live data from AMFI.
+    if it's live data from AMFI (False when served from the last snapshot).
     """
     df = fetch_amfi_nav_data()
     if df is not None and not df.empty:
-        return df, True
+        return df, not df.attrs.get("stale", False)
 
     # Empty DataFrame as fallback; UI will show warning
     return pd.DataFrame(), False
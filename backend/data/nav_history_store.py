@@ -0,0 +1,319 @@
+"""
+backend/data/nav_history_store.py
+─────────────────────────────────
+Append-only per-scheme NAV history built from daily AMFI snapshots.
+
+Storage layout (under ``NAV_HISTORY_DIR``)::
+
+    index.json   ← scheme_code → column map, ordered date list, capacities
+    navs.f32     ← raw float32 matrix, shape (date_capacity, scheme_capacity)
+
+Rows are dates, columns are schemes; unset cells are NaN. Appending a day
+writes one contiguous row. A scheme's full history is a column view of the
+memory map, so reading it copies nothing.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NAV_HISTORY_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "ai_agents", "data", "nav_history")
+)
+
+_INDEX_FILE = "index.json"
+_MATRIX_FILE = "navs.f32"
+_DATE_CHUNK = 256          # rows added per file extension (~1 trading year)
+_MIN_SCHEME_CAPACITY = 1024
+
+DateLike = Union[str, date, datetime, np.datetime64]
+
+
+def _to_day(value: DateLike) -> np.datetime64:
+    """Normalise AMFI ("23-Mar-2026"), ISO strings and date objects to datetime64[D]."""
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[D]")
+    if isinstance(value, datetime):
+        return np.datetime64(value.date(), "D")
+    if isinstance(value, date):
+        return np.datetime64(value, "D")
+    text = str(value).strip()
+    try:
+        return np.datetime64(datetime.strptime(text, "%d-%b-%Y").date(), "D")
+    except ValueError:
+        return np.datetime64(text[:10], "D")
+
+
+def _next_capacity(required: int, current: int = 0) -> int:
+    capacity = max(current, _MIN_SCHEME_CAPACITY)
+    while capacity < required:
+        capacity *= 2
+    return capacity
+
+
+class NavHistoryStore:
+    """
+    Date × scheme float32 NAV matrix backed by a memory-mapped file.
+
+    A single writer (the daily ``FundDataAgent`` sync) appends snapshots;
+    any number of readers may open the store with ``readonly=True``.
+    """
+
+    def __init__(self, root: str = NAV_HISTORY_DIR, readonly: bool = False):
+        self.root = root
+        self.readonly = readonly
+        self._lock = threading.Lock()
+        self._scheme_codes: List[int] = []
+        self._columns: Dict[int, int] = {}
+        self._dates: List[str] = []
+        self._date_capacity = 0
+        self._scheme_capacity = 0
+        self._matrix: Optional[np.memmap] = None
+        self._index_mtime = None
+        # First row the last append wrote to (rows before it are untouched)
+        self.last_written_from: Optional[int] = None
+        self._load_index()
+
+    # ── Index handling ───────────────────────────────────────────────────────
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.root, _INDEX_FILE)
+
+    @property
+    def _matrix_path(self) -> str:
+        return os.path.join(self.root, _MATRIX_FILE)
+
+    def _load_index(self) -> None:
+        try:
+            mtime = os.stat(self._index_path).st_mtime_ns
+            with open(self._index_path, "r") as fh:
+                index = json.load(fh)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        self._scheme_codes = [int(c) for c in index.get("scheme_codes", [])]
+        self._columns = {code: i for i, code in enumerate(self._scheme_codes)}
+        self._dates = list(index.get("dates", []))
+        self._date_capacity = int(index.get("date_capacity", 0))
+        self._scheme_capacity = int(index.get("scheme_capacity", 0))
+        self._index_mtime = mtime
+        self._matrix = None
+        if self._date_capacity and self._scheme_capacity and os.path.exists(self._matrix_path):
+            self._matrix = np.memmap(
+                self._matrix_path,
+                dtype=np.float32,
+                mode="r" if self.readonly else "r+",
+                shape=(self._date_capacity, self._scheme_capacity),
+            )
+
+    def _save_index(self) -> None:
+        payload = {
+            "scheme_codes": self._scheme_codes,
+            "dates": self._dates,
+            "date_capacity": self._date_capacity,
+            "scheme_capacity": self._scheme_capacity,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".index-")
+        with os.fdopen(fd, "w") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp_path, self._index_path)
+        self._index_mtime = os.stat(self._index_path).st_mtime_ns
+
+    def refresh(self) -> bool:
+        """Re-open the store if another process appended since we loaded. Returns True if reloaded."""
+        try:
+            mtime = os.stat(self._index_path).st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._index_mtime:
+            return False
+        with self._lock:
+            self._load_index()
+        return True
+
+    # ── Capacity management ──────────────────────────────────────────────────
+
+    def _ensure_capacity(self, n_dates: int, n_schemes: int) -> None:
+        if n_schemes > self._scheme_capacity:
+            self._relayout(_next_capacity(n_schemes, self._scheme_capacity), max(n_dates, self._date_capacity))
+        elif n_dates > self._date_capacity:
+            new_dates = self._date_capacity + _DATE_CHUNK * (
+                -(-(n_dates - self._date_capacity) // _DATE_CHUNK)
+            )
+            self._matrix.flush()
+            self._matrix = np.memmap(
+                self._matrix_path, dtype=np.float32, mode="r+",
+                shape=(new_dates, self._scheme_capacity),
+            )
+            self._matrix[self._date_capacity:] = np.nan
+            self._date_capacity = new_dates
+
+    def _relayout(self, scheme_capacity: int, min_dates: int) -> None:
+        """Widen the scheme dimension. Rare: only when the universe outgrows the capacity."""
+        date_capacity = max(_DATE_CHUNK, -(-min_dates // _DATE_CHUNK) * _DATE_CHUNK)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".navs-")
+        os.close(fd)
+        widened = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(date_capacity, scheme_capacity))
+        widened[:] = np.nan
+        if self._matrix is not None:
+            n_dates = min(len(self._dates), self._date_capacity)
+            widened[:n_dates, : self._scheme_capacity] = self._matrix[:n_dates]
+            self._matrix.flush()
+        widened.flush()
+        del widened
+        os.replace(tmp_path, self._matrix_path)
+        logger.info(
+            "[NavHistory] Re-laid out matrix to %d dates × %d schemes", date_capacity, scheme_capacity
+        )
+        self._date_capacity = date_capacity
+        self._scheme_capacity = scheme_capacity
+        self._matrix = np.memmap(
+            self._matrix_path, dtype=np.float32, mode="r+", shape=(date_capacity, scheme_capacity)
+        )
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def append_snapshot(
+        self,
+        nav_dates: Union[DateLike, Iterable[DateLike]],
+        scheme_codes: Iterable,
+        navs: Iterable[float],
+    ) -> int:
+        """
+        Append one AMFI snapshot. ``nav_dates`` is either a single as-of date
+        or one date per row (AMFI stamps each scheme with its own NAV date).
+
+        New dates after the last stored date become new rows; dates already
+        stored are updated in place; older unseen dates are skipped to keep
+        the date axis append-only. Returns the number of cells written.
+        """
+        if self.readonly:
+            raise PermissionError("NavHistoryStore opened read-only")
+
+        codes = np.asarray(scheme_codes).astype(np.int64)
+        values = np.asarray(navs, dtype=np.float32)
+        if len(codes) == 0:
+            return 0
+        if np.ndim(nav_dates) == 0 or isinstance(nav_dates, (str, date, datetime)):
+            days = np.full(len(codes), _to_day(nav_dates))
+        else:
+            raw = np.asarray(nav_dates)
+            unique_raw, inverse = np.unique(raw.astype(str), return_inverse=True)
+            days = np.array([_to_day(d) for d in unique_raw], dtype="datetime64[D]")[inverse]
+
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+
+            new_codes = [int(c) for c in np.unique(codes) if int(c) not in self._columns]
+            for code in new_codes:
+                self._columns[code] = len(self._scheme_codes)
+                self._scheme_codes.append(code)
+
+            stored_days = np.array(self._dates, dtype="datetime64[D]")
+            last_day = stored_days[-1] if len(stored_days) else None
+            incoming_days = np.unique(days)
+            for day in incoming_days:
+                if last_day is None or day > last_day:
+                    self._dates.append(str(day))
+                    last_day = day
+            stored_days = np.array(self._dates, dtype="datetime64[D]")
+
+            self._ensure_capacity(len(self._dates), len(self._scheme_codes))
+
+            row_pos = np.searchsorted(stored_days, days)
+            in_range = row_pos < len(stored_days)
+            known = np.zeros(len(days), dtype=bool)
+            known[in_range] = stored_days[row_pos[in_range]] == days[in_range]
+            skipped = int((~known).sum())
+            if skipped:
+                logger.warning("[NavHistory] Skipped %d NAVs dated before the stored history", skipped)
+
+            cols = np.fromiter((self._columns[int(c)] for c in codes[known]), dtype=np.int64, count=int(known.sum()))
+            self._matrix[row_pos[known], cols] = values[known]
+            self.last_written_from = int(row_pos[known].min()) if known.any() else None
+            self._matrix.flush()
+            self._save_index()
+
+        written = int(known.sum())
+        logger.info(
+            "[NavHistory] Appended %d NAVs (%d new schemes); history now %d dates × %d schemes",
+            written, len(new_codes), len(self._dates), len(self._scheme_codes),
+        )
+        return written
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    @property
+    def version(self) -> str:
+        """Changes whenever a snapshot is appended; usable as a cache key."""
+        last = self._dates[-1] if self._dates else "empty"
+        return f"{last}:{len(self._dates)}x{len(self._scheme_codes)}"
+
+    @property
+    def scheme_codes(self) -> np.ndarray:
+        return np.asarray(self._scheme_codes, dtype=np.int64)
+
+    @property
+    def dates(self) -> np.ndarray:
+        return np.array(self._dates, dtype="datetime64[D]")
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def __contains__(self, scheme_code) -> bool:
+        return int(scheme_code) in self._columns
+
+    def column_of(self, scheme_code) -> Optional[int]:
+        return self._columns.get(int(scheme_code))
+
+    def matrix(self) -> np.ndarray:
+        """Zero-copy view of the populated (dates × schemes) region."""
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._matrix[: len(self._dates), : len(self._scheme_codes)]
+
+    def series(self, scheme_code) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return ``(dates, navs)`` for one scheme. ``navs`` is a strided view into
+        the memory map (no copy); missing days are NaN.
+        """
+        col = self.column_of(scheme_code)
+        if col is None or self._matrix is None:
+            return np.array([], dtype="datetime64[D]"), np.array([], dtype=np.float32)
+        return self.dates, self._matrix[: len(self._dates), col]
+
+    def window(self, start: Optional[DateLike] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(dates, matrix)`` restricted to rows on/after ``start`` (still a view)."""
+        dates = self.dates
+        first = 0 if start is None else int(np.searchsorted(dates, _to_day(start)))
+        return dates[first:], self.matrix()[first:]
+
+
+_default_store: Optional[NavHistoryStore] = None
+_default_lock = threading.Lock()
+
+
+def get_nav_history_store(readonly: bool = True) -> NavHistoryStore:
+    """
+    Process-wide store handle. Read-only handles are shared and transparently
+    re-opened when the writer appends a new snapshot.
+    """
+    global _default_store
+    if not readonly:
+        return NavHistoryStore(NAV_HISTORY_DIR, readonly=False)
+    with _default_lock:
+        if _default_store is None:
+            _default_store = NavHistoryStore(NAV_HISTORY_DIR, readonly=True)
+        else:
+            _default_store.refresh()
+        return _default_store
@@ -0,0 +1,289 @@
+"""
+backend/engines/benchmark_analytics_engine.py
+─────────────────────────────────────────────
+Benchmark-relative analytics for every fund at once.
+
+Fund NAV returns (dates × funds) are aligned on date with the benchmark index
+series; each fund column is paired with the return column of its category
+benchmark, and all statistics are column-wise matrix reductions:
+
+  beta              = cov(r_f, r_b) / var(r_b)
+  tracking_error    = std(r_f − r_b) · √252            (% p.a.)
+  information_ratio = mean(r_f − r_b) · 252 / tracking_error
+  alpha_1y / 3y     = Jensen's alpha over the trailing 1Y / 3Y window (% p.a.)
+  rolling_alpha_1y_median / _positive
+                    = median of the 1Y Jensen's alpha rolled monthly over the
+                      history, and the share of those windows with alpha > 0
+
+Results are published as a columnar snapshot keyed by universe version, and
+``lookup_benchmark_analytics`` answers per-scheme queries from an in-process
+dict built once per version.
+"""
+
+import logging
+import os
+import threading
+import time
+import warnings
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.data.benchmark_indices import benchmark_for_category, load_benchmark_series
+from backend.data.columnar_store import current_version, load_snapshot, publish_snapshot
+from backend.engines.fund_metrics_engine import RISK_FREE_RATE, TRADING_DAYS, daily_returns, forward_fill
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_ANALYTICS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "ai_agents", "data", "benchmark_analytics")
+)
+ANALYTICS_COLUMNS = (
+    "beta", "tracking_error", "information_ratio", "alpha_1y", "alpha_3y",
+    "rolling_alpha_1y_median", "rolling_alpha_1y_positive",
+)
+_MIN_OVERLAP_DAYS = 20
+ROLLING_WINDOW_DAYS = TRADING_DAYS  # one year of common trading days
+ROLLING_STEP_DAYS = 21              # re-evaluated monthly
+_VERSION_CHECK_SECONDS = 30.0  # how often readers look for a newly published snapshot
+
+
+def align_returns(
+    fund_dates: np.ndarray,
+    fund_navs: np.ndarray,
+    bench_dates: np.ndarray,
+    bench_levels: np.ndarray,
+) -> tuple:
+    """
+    Intersect the two date axes and return ``(dates, fund_returns, bench_returns)``
+    with returns computed on the common calendar (NaN where a NAV is missing).
+    """
+    dates, fund_rows, bench_rows = np.intersect1d(
+        np.asarray(fund_dates, dtype="datetime64[D]"),
+        np.asarray(bench_dates, dtype="datetime64[D]"),
+        return_indices=True,
+    )
+    fund = np.asarray(fund_navs)[fund_rows]
+    bench = np.asarray(bench_levels, dtype=np.float64)[bench_rows]
+    fund_filled, _ = forward_fill(fund)
+    bench_filled, _ = forward_fill(bench)
+    return dates, daily_returns(fund, fund_filled), daily_returns(bench, bench_filled)
+
+
+def _regression_stats(fund_r: np.ndarray, bench_r: np.ndarray, daily_rf: float) -> Dict[str, np.ndarray]:
+    """Column-wise beta / active-return statistics over paired (dates × funds) matrices."""
+    mask = ~np.isnan(fund_r) & ~np.isnan(bench_r)
+    n = mask.sum(axis=0)
+    rf = np.where(mask, fund_r, 0.0)
+    rb = np.where(mask, bench_r, 0.0)
+    safe_n = np.maximum(n, 1)
+
+    mean_f = rf.sum(axis=0) / safe_n
+    mean_b = rb.sum(axis=0) / safe_n
+    cov = np.einsum("ij,ij->j", rf, rb) / safe_n - mean_f * mean_b
+    var_b = np.einsum("ij,ij->j", rb, rb) / safe_n - mean_b ** 2
+
+    active = rf - rb
+    mean_a = active.sum(axis=0) / safe_n
+    # Population moments throughout, like the covariance / variance behind beta
+    var_a = np.einsum("ij,ij->j", active, active) / safe_n - mean_a ** 2
+
+    enough = n >= _MIN_OVERLAP_DAYS
+    with np.errstate(invalid="ignore", divide="ignore"):
+        beta = np.where(enough & (var_b > 0), cov / var_b, np.nan)
+        te = np.sqrt(np.maximum(var_a, 0.0)) * np.sqrt(TRADING_DAYS)
+        alpha = ((mean_f - daily_rf) - beta * (mean_b - daily_rf)) * TRADING_DAYS
+        information_ratio = np.where(enough & (te > 0), mean_a * TRADING_DAYS / te, np.nan)
+    return {
+        "beta": beta,
+        "tracking_error": np.where(enough, te * 100.0, np.nan),
+        "information_ratio": information_ratio,
+        "alpha": np.where(enough, alpha * 100.0, np.nan),
+    }
+
+
+def rolling_alpha(
+    fund_r: np.ndarray,
+    bench_r: np.ndarray,
+    daily_rf: float,
+    window: int = ROLLING_WINDOW_DAYS,
+    step: int = ROLLING_STEP_DAYS,
+) -> np.ndarray:
+    """
+    Jensen's alpha (% p.a.) over windows of ``window`` rows ending every
+    ``step`` rows back from the last one: a (windows × funds) matrix. Each
+    window's moments are differences of column prefix sums, so all windows
+    cost one cumulative pass instead of a regression each.
+    """
+    n_rows = len(fund_r)
+    ends = np.arange(n_rows, window - 1, -step)[::-1]
+    if not len(ends):
+        return np.empty((0, fund_r.shape[1]))
+    mask = ~np.isnan(fund_r) & ~np.isnan(bench_r)
+    rf = np.where(mask, fund_r, 0.0)
+    rb = np.where(mask, bench_r, 0.0)
+
+    def window_sums(values: np.ndarray) -> np.ndarray:
+        prefix = np.zeros((n_rows + 1, values.shape[1]))
+        np.cumsum(values, axis=0, out=prefix[1:])
+        return prefix[ends] - prefix[ends - window]
+
+    n = window_sums(mask.astype(np.float64))
+    safe_n = np.maximum(n, 1)
+    mean_f = window_sums(rf) / safe_n
+    mean_b = window_sums(rb) / safe_n
+    cov = window_sums(rf * rb) / safe_n - mean_f * mean_b
+    var_b = window_sums(rb * rb) / safe_n - mean_b ** 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        beta = cov / var_b
+        alpha = ((mean_f - daily_rf) - beta * (mean_b - daily_rf)) * TRADING_DAYS * 100.0
+    return np.where((n >= _MIN_OVERLAP_DAYS) & (var_b > 0), alpha, np.nan)
+
+
+def compute_benchmark_analytics(
+    fund_dates: np.ndarray,
+    fund_navs: np.ndarray,
+    bench_dates: np.ndarray,
+    bench_levels: np.ndarray,
+    fund_benchmark: np.ndarray,
+    risk_free_rate: float = RISK_FREE_RATE,
+) -> Dict[str, np.ndarray]:
+    """
+    Parameters
+    ----------
+    fund_navs      : (dates × funds) NAV matrix, NaN where missing.
+    bench_levels   : (dates × benchmarks) index level matrix.
+    fund_benchmark : int array, benchmark column for each fund (−1 = none).
+
+    Returns
+    -------
+    dict of ``ANALYTICS_COLUMNS`` → float array, one value per fund.
+    """
+    fund_benchmark = np.asarray(fund_benchmark, dtype=np.int64)
+    n_funds = len(fund_benchmark)
+    empty = {name: np.full(n_funds, np.nan) for name in ANALYTICS_COLUMNS}
+    if n_funds == 0 or len(fund_dates) == 0 or len(bench_dates) == 0:
+        return empty
+
+    dates, fund_r, bench_r = align_returns(fund_dates, fund_navs, bench_dates, bench_levels)
+    if len(dates) < _MIN_OVERLAP_DAYS:
+        return empty
+
+    has_bench = fund_benchmark >= 0
+    # One benchmark return column per fund (gather, no per-fund loop)
+    paired_bench = bench_r[:, np.where(has_bench, fund_benchmark, 0)]
+    paired_bench[:, ~has_bench] = np.nan
+    daily_rf = risk_free_rate / TRADING_DAYS
+
+    full = _regression_stats(fund_r, paired_bench, daily_rf)
+    result = {name: full[name] for name in ("beta", "tracking_error", "information_ratio")}
+    for years in (1, 3):
+        start = dates[-1] - np.timedelta64(int(round(365.25 * years)), "D")
+        first = int(np.searchsorted(dates, start))
+        window = _regression_stats(fund_r[first:], paired_bench[first:], daily_rf)
+        result[f"alpha_{years}y"] = window["alpha"]
+
+    rolling = rolling_alpha(fund_r, paired_bench, daily_rf)
+    windows = (~np.isnan(rolling)).sum(axis=0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # funds with no full window
+        result["rolling_alpha_1y_median"] = np.nanmedian(rolling, axis=0) if len(rolling) else np.full(n_funds, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result["rolling_alpha_1y_positive"] = np.where(
+            windows > 0, (rolling > 0).sum(axis=0) / np.maximum(windows, 1), np.nan
+        )
+    return result
+
+
+def publish_benchmark_analytics(universe: pd.DataFrame, store=None) -> Optional[str]:
+    """
+    Compute analytics for every scheme in ``universe`` (needs ``scheme_code``
+    and ``category``) from the NAV history and the benchmark series, and
+    publish them. Returns the snapshot version or None if inputs are missing.
+    """
+    series = load_benchmark_series()
+    if series is None or universe is None or universe.empty:
+        logger.warning("[BenchmarkAnalytics] Benchmark series or universe unavailable; skipping")
+        return None
+    bench_dates, bench_levels, bench_names, bench_version = series
+
+    if store is None:
+        from backend.data.nav_history_store import get_nav_history_store
+
+        store = get_nav_history_store(readonly=True)
+    if len(store) == 0:
+        return None
+
+    numeric_codes = pd.to_numeric(universe["scheme_code"], errors="coerce")
+    valid = numeric_codes.notna().to_numpy()
+    codes = numeric_codes[valid].astype(np.int64).to_numpy()
+    categories = universe["category"].astype(str).to_numpy()[valid]
+    columns = np.array([store.column_of(c) if c in store else -1 for c in codes], dtype=np.int64)
+    known = columns >= 0
+    codes, categories, columns = codes[known], categories[known], columns[known]
+
+    bench_index = {name: i for i, name in enumerate(bench_names)}
+    category_bench = {
+        cat: bench_index.get(benchmark_for_category(cat), -1) for cat in np.unique(categories)
+    }
+    fund_benchmark = np.array([category_bench[c] for c in categories], dtype=np.int64)
+
+    dates, matrix = store.window()
+    analytics = compute_benchmark_analytics(dates, matrix[:, columns], bench_dates, bench_levels, fund_benchmark)
+
+    universe_version = f"{store.version}|{bench_version}"
+    payload = {"scheme_code": codes, **{k: np.round(v, 4) for k, v in analytics.items()}}
+    return publish_snapshot(
+        BENCHMARK_ANALYTICS_DIR, payload, meta={"universe_version": universe_version}
+    )
+
+
+_LOCK = threading.Lock()
+_INDEX: Dict[str, Any] = {"version": None, "rows": {}, "checked_at": 0.0}
+
+
+def get_benchmark_analytics() -> Dict[int, Dict[str, float]]:
+    """
+    scheme_code → analytics dict for the published snapshot. Built once per
+    snapshot version, so lookups on the recommendation path are O(1).
+    """
+    now = time.monotonic()
+    if _INDEX["version"] is not None and now - _INDEX["checked_at"] < _VERSION_CHECK_SECONDS:
+        return _INDEX["rows"]
+    _INDEX["checked_at"] = now
+
+    version = current_version(BENCHMARK_ANALYTICS_DIR)
+    if version is None:
+        return {}
+    if _INDEX["version"] == version:
+        return _INDEX["rows"]
+
+    with _LOCK:
+        if _INDEX["version"] == version:
+            return _INDEX["rows"]
+        snapshot = load_snapshot(BENCHMARK_ANALYTICS_DIR)
+        if snapshot is None:
+            return {}
+        columns, meta = snapshot
+        n_rows = len(columns["scheme_code"])
+        # Snapshots published before a column existed read it as NaN
+        values = np.column_stack([
+            np.asarray(columns[name], dtype=np.float64) if name in columns else np.full(n_rows, np.nan)
+            for name in ANALYTICS_COLUMNS
+        ])
+        rows = {
+            int(code): dict(zip(ANALYTICS_COLUMNS, row))
+            for code, row in zip(np.asarray(columns["scheme_code"]).tolist(), values.tolist())
+        }
+        _INDEX["rows"] = rows
+        _INDEX["version"] = meta["version"]
+        logger.info("[BenchmarkAnalytics] Loaded analytics for %d schemes (%s)", len(rows), meta.get("universe_version"))
+        return rows
+
+
+def lookup_benchmark_analytics(scheme_code: Any) -> Optional[Dict[str, float]]:
+    try:
+        return get_benchmark_analytics().get(int(scheme_code))
+    except (TypeError, ValueError):
+        return None
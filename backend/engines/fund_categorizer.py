@@ -1,8 +1,113 @@
+import numpy as np
 import pandas as pd
 import logging
+import re
+import threading
+from typing import Dict, Hashable, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Keyword rules in ascending precedence: when a scheme name matches several
+# rules, the last one wins (e.g. "Gold Liquid Fund" → Gold).
+CATEGORY_RULES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("Large Cap", ("large cap",)),
+    ("Mid Cap", ("mid cap",)),
+    ("Small Cap", ("small cap",)),
+    ("Flexi", ("flexi cap",)),
+    # Adding sectorals to aggressive mapping
+    ("Sectoral", ("sector", "thematic")),
+    ("Hybrid", ("hybrid", "balanced")),
+    ("Debt", ("liquid", "debt", "bond")),
+    ("Gold", ("gold",)),
+)
+DEFAULT_CATEGORY = "Other"
+
+
+def _compile_rules(rules) -> Tuple["re.Pattern[str]", Dict[str, int]]:
+    """
+    One regex over every keyword, wrapped in a lookahead so that overlapping
+    keywords are all reported (``findall`` advances one character at a time
+    instead of skipping past each match), plus keyword → rule rank.
+    """
+    ranks = {keyword: rank for rank, (_, keywords) in enumerate(rules) for keyword in keywords}
+    alternation = "|".join(re.escape(keyword) for keyword in ranks)
+    return re.compile(f"(?=({alternation}))"), ranks
+
+
+_KEYWORDS, _KEYWORD_RANKS = _compile_rules(CATEGORY_RULES)
+_RANKED_CATEGORIES = [category for category, _ in CATEGORY_RULES]
+# One keyword alternation per rule, for the column-wise pass
+_RULE_PATTERNS = tuple("|".join(re.escape(keyword) for keyword in keywords) for _, keywords in CATEGORY_RULES)
+# Indexed by rule rank; rank -1 (no match) picks the trailing default
+_CATEGORY_TABLE = np.array([*_RANKED_CATEGORIES, DEFAULT_CATEGORY], dtype=object)
+
+
+# scheme_code → (scheme_name, category), so daily syncs only classify new or
+# renamed schemes
+_MEMO: Dict[Hashable, Tuple[str, str]] = {}
+_MEMO_LOCK = threading.Lock()
+_MEMO_MAX_ENTRIES = 200_000
+
+
+def classify_scheme_name(name) -> str:
+    """Category for a single scheme name (``"Other"`` when no rule matches)."""
+    if not isinstance(name, str):
+        return DEFAULT_CATEGORY
+    # A single scan of the lowercased name; the highest-ranked hit wins
+    rank = max(map(_KEYWORD_RANKS.__getitem__, _KEYWORDS.findall(name.lower())), default=-1)
+    return _RANKED_CATEGORIES[rank] if rank >= 0 else DEFAULT_CATEGORY
+
+
+def classify_scheme_names(names) -> np.ndarray:
+    """
+    Categories for a column of scheme names, vectorized: the column is
+    lowercased once and each rule is one ``str.contains`` pass over it
+    (the keyword alternation of the rule), applied in ascending precedence
+    so the highest-ranked match wins. Non-string names get ``"Other"``.
+    """
+    lowered = pd.Series(names).reset_index(drop=True).str.lower()
+    ranks = np.full(len(lowered), -1, dtype=np.int64)
+    for rank, pattern in enumerate(_RULE_PATTERNS):
+        ranks[lowered.str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)] = rank
+    return _CATEGORY_TABLE[ranks]
+
+
+def _classify_with_memo(codes: List[Hashable], names: pd.Series) -> np.ndarray:
+    """Memo hits (same code, same name) reuse their category; the rest are classified in one pass."""
+    memo = _MEMO
+    categories = np.empty(len(names), dtype=object)
+    misses: List[int] = []
+    for i, (code, name) in enumerate(zip(codes, names.tolist())):
+        hit = memo.get(code)
+        if hit is not None and hit[0] == name:
+            categories[i] = hit[1]
+        else:
+            misses.append(i)
+    if not misses:
+        return categories
+
+    fresh_names = names.iloc[misses]
+    fresh_categories = classify_scheme_names(fresh_names)
+    categories[misses] = fresh_categories
+    fresh = {
+        codes[i]: (name, category)
+        for i, name, category in zip(misses, fresh_names.tolist(), fresh_categories)
+        if isinstance(name, str) and not pd.isna(codes[i])
+    }
+    if fresh:
+        with _MEMO_LOCK:
+            if len(_MEMO) + len(fresh) > _MEMO_MAX_ENTRIES:
+                _MEMO.clear()
+            _MEMO.update(fresh)
+        logger.debug(f"[FundCategorizer] Classified {len(fresh)} new or renamed schemes")
+    return categories
+
+
+def clear_category_memo() -> None:
+    """Forget every memoized scheme_code → category assignment."""
+    with _MEMO_LOCK:
+        _MEMO.clear()
+
 
 def categorize_funds(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -18,51 +123,11 @@ def categorize_funds(df: pd.DataFrame) -> pd.DataFrame:
     # Create a copy to avoid SettingWithCopyWarning
     categorized_df = df.copy()
 
-    # Initialize all with a default "Other" category
-    categorized_df["category"] = "Other"
-
-    # Keyword mappings (order matters for overlapping terms)
-    # Using lowercase for case-insensitive matching
-    categorized_df.loc[
-        categorized_df["scheme_name"].str.lower().str.contains("large cap", na=False),
-        "category",
-    ] = "Large Cap"
-    categorized_df.loc[
-        categorized_df["scheme_name"].str.lower().str.contains("mid cap", na=False),
-        "category",
-    ] = "Mid Cap"
-    categorized_df.loc[
-        categorized_df["scheme_name"].str.lower().str.contains("small cap", na=False),
-        "category",
-    ] = "Small Cap"
-    categorized_df.loc[
-        categorized_df["scheme_name"].str.lower().str.contains("flexi cap", na=False),
-        "category",
-    ] = "Flexi"
-    # Adding sectorals to aggressive mapping
-    categorized_df.loc[
-        categorized_df["scheme_name"].str.lower().str.contains("sector", na=False)
-        | categorized_df["scheme_name"].str.lower().str.contains("thematic", na=False),
-        "category",
-    ] = "Sectoral"
-
-    categorized_df.loc[
-        categorized_df["scheme_name"].str.lower().str.contains("hybrid", na=False)
-        | categorized_df["scheme_name"].str.lower().str.contains("balanced", na=False),
-        "category",
-    ] = "Hybrid"
-
-    categorized_df.loc[
-        categorized_df["scheme_name"].str.lower().str.contains("liquid", na=False)
-        | categorized_df["scheme_name"].str.lower().str.contains("debt", na=False)
-        | categorized_df["scheme_name"].str.lower().str.contains("bond", na=False),
-        "category",
-    ] = "Debt"
-
-    categorized_df.loc[
-        categorized_df["scheme_name"].str.lower().str.contains("gold", na=False),
-        "category",
-    ] = "Gold"
+    if "scheme_code" in categorized_df.columns:
+        categories = _classify_with_memo(categorized_df["scheme_code"].tolist(), categorized_df["scheme_name"])
+    else:
+        categories = classify_scheme_names(categorized_df["scheme_name"])
+    categorized_df["category"] = categories
 
     # Filter out unclassified ones if we only want our core categories
     # categorized_df = categorized_df[categorized_df['category'] != 'Other']
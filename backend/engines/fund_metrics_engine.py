@@ -0,0 +1,475 @@
+"""
+backend/engines/fund_metrics_engine.py
+──────────────────────────────────────
+Per-scheme performance metrics computed for the whole fund universe at once
+from the NAV history matrix (dates × schemes, NaN where no NAV was published).
+
+All reductions are NaN-aware and vectorised over the scheme axis:
+  - 1Y / 3Y / 5Y CAGR (%)      – last NAV vs. last NAV on/before the horizon date
+  - volatility (%)             – annualised std-dev of daily returns
+  - sharpe                     – (CAGR_3Y − Rf) / volatility (same definition as
+                                 the category-proxy engine)
+  - sortino                    – (CAGR_3Y − Rf) / annualised downside deviation
+  - max_drawdown (%)           – from the cumulative running peak
+
+``RunningMetrics`` carries the same return/drawdown statistics forward one
+day at a time. The nightly sync folds each settled day into a state file
+kept next to the NAV history (``update_running_metrics``), and readers only
+fold the few still-unsettled days on top of it instead of rescanning the
+window.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+RISK_FREE_RATE = 0.06  # 6% India risk-free rate, same as fund_performance_engine
+DEFAULT_LOOKBACK_YEARS = 5
+METRIC_COLUMNS = ("1y", "3y", "5y", "volatility", "sharpe", "sortino", "max_drawdown")
+
+# NAVs this recent may still be restated by AMFI; they are folded at read time
+SETTLE_DAYS = 7
+# Re-seed the running state once the lookback window has rolled this far past it
+RESEED_DAYS = 30
+RUNNING_STATE_FILE = "running_metrics.npz"
+_STATE_ARRAYS = ("count", "mean", "m2", "downside_sq", "last_nav", "peak", "max_drawdown")
+
+
+def forward_fill(navs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forward-fill NaNs down the date axis.
+    Returns ``(filled, first_valid_row)``; rows before a scheme's first NAV stay NaN.
+
+    Walks the (contiguous) date rows once, each step vectorised over all schemes.
+    """
+    filled = np.array(navs, dtype=np.float32, copy=True)
+    missing = np.isnan(filled)
+    for row in range(1, len(filled)):
+        np.copyto(filled[row], filled[row - 1], where=missing[row])
+    valid = ~missing
+    first_valid = np.where(valid.any(axis=0), valid.argmax(axis=0), len(filled))
+    return filled, first_valid
+
+
+def daily_returns(navs: np.ndarray, filled: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Simple returns between consecutive published NAVs.
+    Days without a NAV are NaN (not zero) so gaps do not dampen volatility.
+    """
+    if filled is None:
+        filled, _ = forward_fill(navs)
+    returns = np.full(navs.shape, np.nan, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = navs[1:] / filled[:-1] - 1.0
+    return returns
+
+
+def _window_first_row(dates: np.ndarray, lookback_years: int) -> int:
+    """First row of the trailing lookback window (plus a week of slack)."""
+    window_start = dates[-1] - np.timedelta64(int(round(365.25 * lookback_years)) + 7, "D")
+    return int(np.searchsorted(dates, window_start))
+
+
+def _horizon_row(dates: np.ndarray, end_row: int, years: int) -> int:
+    """Last row on/before ``years`` before ``end_row`` (-1 when the history is shorter)."""
+    target = dates[end_row] - np.timedelta64(int(round(365.25 * years)), "D")
+    return int(np.searchsorted(dates, target, side="right")) - 1
+
+
+def _cagr(
+    dates: np.ndarray,
+    filled: np.ndarray,
+    first_valid: np.ndarray,
+    end_row: int,
+    years: int,
+) -> np.ndarray:
+    start_row = _horizon_row(dates, end_row, years)
+    n_cols = filled.shape[1]
+    if start_row < 0:
+        return np.full(n_cols, np.nan)
+
+    start = filled[start_row].astype(np.float64)
+    end = filled[end_row].astype(np.float64)
+    span_years = (dates[end_row] - dates[start_row]).astype(np.int64) / 365.25
+    covered = first_valid <= start_row
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cagr = (np.power(end / start, 1.0 / span_years) - 1.0) * 100.0
+    cagr[~covered | ~np.isfinite(cagr)] = np.nan
+    return cagr
+
+
+def compute_universe_metrics(
+    dates: np.ndarray,
+    navs: np.ndarray,
+    risk_free_rate: float = RISK_FREE_RATE,
+    lookback_years: int = DEFAULT_LOOKBACK_YEARS,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute all metrics for every scheme column of ``navs`` in one pass.
+
+    Parameters
+    ----------
+    dates : array of datetime64[D], ascending, one per row of ``navs``.
+    navs  : (dates × schemes) float array, NaN where no NAV exists.
+
+    Returns
+    -------
+    dict of metric name → float64 array (one value per scheme, NaN when the
+    scheme's history is too short for that metric).
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    n_cols = navs.shape[1] if navs.ndim == 2 else 0
+    if len(dates) == 0 or n_cols == 0:
+        return {name: np.full(n_cols, np.nan) for name in METRIC_COLUMNS}
+
+    # Restrict to the trailing lookback window (a view, no copy)
+    first_row = _window_first_row(dates, lookback_years)
+    dates = dates[first_row:]
+    navs = navs[first_row:]
+
+    filled, first_valid = forward_fill(navs)
+    end_row = len(dates) - 1
+
+    metrics: Dict[str, np.ndarray] = {
+        "1y": _cagr(dates, filled, first_valid, end_row, 1),
+        "3y": _cagr(dates, filled, first_valid, end_row, 3),
+        "5y": _cagr(dates, filled, first_valid, end_row, 5),
+    }
+
+    returns = daily_returns(navs, filled)
+    valid = ~np.isnan(returns)
+    np.copyto(returns, 0.0, where=~valid)
+    counts = valid.sum(axis=0)
+    enough = counts >= 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = returns.sum(axis=0) / np.maximum(counts, 1)
+        sum_sq = np.einsum("ij,ij->j", returns, returns)
+        variance = np.maximum(sum_sq - counts * mean ** 2, 0.0) / np.maximum(counts - 1, 1)
+        np.minimum(returns, 0.0, out=returns)
+        downside = np.sqrt(np.einsum("ij,ij->j", returns, returns) / np.maximum(counts, 1))
+    volatility = np.where(enough, np.sqrt(variance) * np.sqrt(TRADING_DAYS) * 100.0, np.nan)
+    downside_dev = np.where(enough, downside * np.sqrt(TRADING_DAYS) * 100.0, np.nan)
+
+    # Same convention as the proxy engine: Sharpe on 3Y CAGR, falling back to 1Y
+    excess = np.where(np.isnan(metrics["3y"]), metrics["1y"], metrics["3y"]) - risk_free_rate * 100.0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        metrics["volatility"] = volatility
+        metrics["sharpe"] = np.where(volatility > 0, excess / volatility, np.nan)
+        metrics["sortino"] = np.where(downside_dev > 0, excess / downside_dev, np.nan)
+
+    metrics["max_drawdown"] = np.where(
+        first_valid < len(dates), max_drawdown(filled) * 100.0, np.nan
+    )
+    return metrics
+
+
+def max_drawdown(filled: np.ndarray) -> np.ndarray:
+    """Worst peak-to-trough decline per scheme (fraction ≤ 0) from a forward-filled matrix."""
+    n_cols = filled.shape[1]
+    peak = np.full(n_cols, np.nan, dtype=np.float64)
+    worst = np.zeros(n_cols, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for row in filled:
+            np.fmax(peak, row, out=peak)
+            np.fmin(worst, row / peak - 1.0, out=worst)
+    return worst
+
+
+class RunningMetrics:
+    """
+    Running daily-return and drawdown statistics for every scheme, updated
+    one snapshot row at a time (Welford mean/variance, downside sum of
+    squares, running peak and worst drawdown).
+
+    The statistics cover store rows ``[start_row, end_row)``. The nightly
+    sync extends them one settled day at a time and re-seeds them from the
+    window once it has rolled ``RESEED_DAYS`` past ``start_row`` (see
+    ``update_running_metrics``).
+    """
+
+    def __init__(self, n_schemes: int, start_row: int = 0):
+        self.start_row = start_row
+        self.end_row = start_row
+        self.count = np.zeros(n_schemes, dtype=np.int64)
+        self.mean = np.zeros(n_schemes, dtype=np.float64)
+        self.m2 = np.zeros(n_schemes, dtype=np.float64)
+        self.downside_sq = np.zeros(n_schemes, dtype=np.float64)
+        self.last_nav = np.full(n_schemes, np.nan, dtype=np.float64)
+        self.peak = np.full(n_schemes, np.nan, dtype=np.float64)
+        self.max_drawdown = np.zeros(n_schemes, dtype=np.float64)
+
+    @classmethod
+    def from_history(cls, navs: np.ndarray, start_row: int = 0) -> "RunningMetrics":
+        """Seed the running state from a (dates × schemes) NAV matrix with batch reductions."""
+        state = cls(navs.shape[1], start_row)
+        state.end_row = start_row + len(navs)
+        filled, _ = forward_fill(navs)
+        returns = daily_returns(navs, filled)
+        valid = ~np.isnan(returns)
+        state.count = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            state.mean = np.where(state.count > 0, np.nansum(returns, axis=0) / np.maximum(state.count, 1), 0.0)
+        state.m2 = np.nansum((returns - state.mean) ** 2, axis=0)
+        state.downside_sq = np.nansum(np.minimum(returns, 0.0) ** 2, axis=0)
+        if len(filled):
+            state.last_nav = filled[-1].astype(np.float64)
+            state.peak = np.fmax.reduce(filled, axis=0).astype(np.float64)
+            state.max_drawdown = max_drawdown(filled)
+        return state
+
+    @classmethod
+    def load(cls, path: str) -> Optional["RunningMetrics"]:
+        """State saved by ``save``, or None when the file is missing or unreadable."""
+        try:
+            with np.load(path) as saved:
+                state = cls(0, int(saved["start_row"]))
+                state.end_row = int(saved["end_row"])
+                for name in _STATE_ARRAYS:
+                    setattr(state, name, saved[name])
+        except (OSError, KeyError, ValueError) as e:
+            if os.path.exists(path):
+                logger.warning(f"[FundMetrics] Ignoring unreadable running state {path}: {e}")
+            return None
+        return state
+
+    def save(self, path: str) -> None:
+        """Atomically replace ``path`` with the current state."""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".running-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(
+                    fh, start_row=self.start_row, end_row=self.end_row,
+                    **{name: getattr(self, name) for name in _STATE_ARRAYS},
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def copy(self) -> "RunningMetrics":
+        state = RunningMetrics(0, self.start_row)
+        state.end_row = self.end_row
+        for name in _STATE_ARRAYS:
+            setattr(state, name, getattr(self, name).copy())
+        return state
+
+    def grow(self, n_schemes: int) -> None:
+        """Extend the state for schemes that appeared since it was seeded."""
+        extra = n_schemes - len(self.count)
+        if extra <= 0:
+            return
+        self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+        for name in ("mean", "m2", "downside_sq", "max_drawdown"):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra)]))
+        for name in ("last_nav", "peak"):
+            setattr(self, name, np.concatenate([getattr(self, name), np.full(extra, np.nan)]))
+
+    def update(self, nav_row: np.ndarray) -> None:
+        """Fold one day's NAVs (NaN where a scheme did not publish) into the state."""
+        nav_row = np.asarray(nav_row, dtype=np.float64)
+        self.grow(len(nav_row))
+
+        published = ~np.isnan(nav_row)
+        has_return = published & ~np.isnan(self.last_nav)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ret = nav_row / self.last_nav - 1.0
+
+        count = self.count + has_return
+        delta = np.where(has_return, ret - self.mean, 0.0)
+        mean = self.mean + np.where(has_return, delta / np.maximum(count, 1), 0.0)
+        self.m2 = self.m2 + np.where(has_return, delta * (ret - mean), 0.0)
+        self.downside_sq = self.downside_sq + np.where(has_return, np.minimum(ret, 0.0) ** 2, 0.0)
+        self.count, self.mean = count, mean
+        self.end_row += 1
+
+        self.last_nav = np.where(published, nav_row, self.last_nav)
+        self.peak = np.fmax(self.peak, nav_row)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            drawdown = np.where(published, nav_row / self.peak - 1.0, 0.0)
+        self.max_drawdown = np.minimum(self.max_drawdown, drawdown)
+
+    def volatility(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        return np.where(self.count >= 2, std * np.sqrt(TRADING_DAYS) * 100.0, np.nan)
+
+    def downside_deviation(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            dd = np.sqrt(self.downside_sq / self.count)
+        return np.where(self.count >= 2, dd * np.sqrt(TRADING_DAYS) * 100.0, np.nan)
+
+    def snapshot(self, cagr_pct: np.ndarray, risk_free_rate: float = RISK_FREE_RATE) -> Dict[str, np.ndarray]:
+        """Risk metrics given a per-scheme CAGR (% p.a.) to measure excess return from."""
+        vol = self.volatility()
+        downside = self.downside_deviation()
+        excess = np.asarray(cagr_pct, dtype=np.float64) - risk_free_rate * 100.0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return {
+                "volatility": vol,
+                "sharpe": np.where(vol > 0, excess / vol, np.nan),
+                "sortino": np.where(downside > 0, excess / downside, np.nan),
+                "max_drawdown": self.max_drawdown * 100.0,
+            }
+
+
+def _last_published(navs: np.ndarray, row: int, first_row: int, block: int = 32) -> np.ndarray:
+    """
+    Each scheme's last NAV on/before ``row`` (not before ``first_row``), NaN if
+    none. Scans back a block of rows at a time, only for schemes still missing,
+    so a typical lookup touches one block rather than the whole window.
+    """
+    values = np.full(navs.shape[1], np.nan)
+    missing = np.arange(navs.shape[1])
+    hi = row + 1
+    while hi > first_row and len(missing):
+        lo = max(first_row, hi - block)
+        chunk = navs[lo:hi][:, missing]
+        valid = ~np.isnan(chunk)
+        found = valid.any(axis=0)
+        last = len(chunk) - 1 - valid[::-1].argmax(axis=0)
+        values[missing[found]] = chunk[last[found], np.flatnonzero(found)]
+        missing = missing[~found]
+        hi = lo
+    return values
+
+
+def running_universe_metrics(
+    dates: np.ndarray,
+    navs: np.ndarray,
+    state: RunningMetrics,
+    risk_free_rate: float = RISK_FREE_RATE,
+    lookback_years: int = DEFAULT_LOOKBACK_YEARS,
+) -> Dict[str, np.ndarray]:
+    """
+    ``compute_universe_metrics`` from a persisted running ``state``: the rows
+    after ``state.end_row`` are folded into a copy, and the CAGRs read just
+    the horizon rows. Risk statistics cover the rows since ``state.start_row``,
+    which trails the window start by at most ``RESEED_DAYS``.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    state = state.copy()
+    for row in navs[state.end_row:]:
+        state.update(row)
+    state.grow(navs.shape[1])
+
+    first_row = _window_first_row(dates, lookback_years)
+    end_row = len(dates) - 1
+    metrics: Dict[str, np.ndarray] = {}
+    for years in (1, 3, 5):
+        start_row = _horizon_row(dates, end_row, years)
+        if start_row < first_row:
+            metrics[f"{years}y"] = np.full(navs.shape[1], np.nan)
+            continue
+        span_years = (dates[end_row] - dates[start_row]).astype(np.int64) / 365.25
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cagr = (np.power(state.last_nav / _last_published(navs, start_row, first_row), 1.0 / span_years) - 1.0) * 100.0
+        cagr[~np.isfinite(cagr)] = np.nan
+        metrics[f"{years}y"] = cagr
+
+    # Same convention as compute_universe_metrics: Sharpe on 3Y CAGR, falling back to 1Y
+    metrics.update(state.snapshot(np.where(np.isnan(metrics["3y"]), metrics["1y"], metrics["3y"]), risk_free_rate))
+    metrics["max_drawdown"] = np.where(np.isnan(state.peak), np.nan, metrics["max_drawdown"])
+    return metrics
+
+
+def running_state_path(store) -> str:
+    return os.path.join(store.root, RUNNING_STATE_FILE)
+
+
+def _state_covers(state: Optional[RunningMetrics], dates: np.ndarray, lookback_years: int) -> bool:
+    """Whether ``state`` can serve the current window without a re-seed."""
+    if state is None or not len(dates) or state.end_row > len(dates):
+        return False
+    first_row = _window_first_row(dates, lookback_years)
+    return state.start_row <= first_row and dates[first_row] - dates[state.start_row] <= np.timedelta64(RESEED_DAYS, "D")
+
+
+def update_running_metrics(
+    store,
+    written_from: Optional[int] = None,
+    lookback_years: int = DEFAULT_LOOKBACK_YEARS,
+) -> Optional[RunningMetrics]:
+    """
+    Writer side of the incremental path, called after each NAV append.
+    Folds the rows older than ``SETTLE_DAYS`` into the persisted state, one
+    row each. ``written_from`` is the first row the append touched. If it
+    rewrote an already folded row, or the window rolled past
+    ``RESEED_DAYS``, the state is re-seeded from the window instead.
+    """
+    dates = store.dates
+    if not len(dates):
+        return None
+    navs = store.matrix()
+    settled = int(np.searchsorted(dates, dates[-1] - np.timedelta64(SETTLE_DAYS, "D"), side="right"))
+    path = running_state_path(store)
+    state = RunningMetrics.load(path)
+
+    if (
+        not _state_covers(state, dates, lookback_years)
+        or state.end_row > settled
+        or (written_from is not None and written_from < state.end_row)
+    ):
+        first_row = min(_window_first_row(dates, lookback_years), settled)
+        if settled > first_row:
+            state = RunningMetrics.from_history(navs[first_row:settled], start_row=first_row)
+        else:
+            state = RunningMetrics(navs.shape[1], first_row)
+        logger.info("[FundMetrics] Re-seeded running metrics from rows %d-%d", first_row, settled)
+    else:
+        for row in navs[state.end_row:settled]:
+            state.update(row)
+    state.grow(navs.shape[1])
+    state.save(path)
+    return state
+
+
+def metrics_frame(scheme_codes: np.ndarray, metrics: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Arrange metric arrays as a DataFrame indexed by scheme_code (rounded like the CSV)."""
+    frame = pd.DataFrame({name: metrics[name] for name in METRIC_COLUMNS}, index=pd.Index(scheme_codes, name="scheme_code"))
+    return frame.round(2)
+
+
+_CACHE_LOCK = threading.Lock()
+_CACHED: Dict[str, object] = {"version": None, "frame": None}
+
+
+def get_scheme_metrics(store=None) -> Optional[pd.DataFrame]:
+    """
+    Per-scheme metrics for the current NAV history, recomputed only when the
+    store's version changes: from the persisted running state when it covers
+    the window, otherwise from a full window scan. Returns None when no
+    history has been recorded.
+    """
+    if store is None:
+        from backend.data.nav_history_store import get_nav_history_store
+
+        store = get_nav_history_store(readonly=True)
+    if len(store) == 0:
+        return None
+
+    with _CACHE_LOCK:
+        if _CACHED["version"] == store.version:
+            return _CACHED["frame"]
+
+        dates, navs = store.window()
+        state = RunningMetrics.load(running_state_path(store))
+        if _state_covers(state, dates, DEFAULT_LOOKBACK_YEARS):
+            metrics, source = running_universe_metrics(dates, navs, state), "running state"
+        else:
+            metrics, source = compute_universe_metrics(dates, navs), "full window"
+        frame = metrics_frame(store.scheme_codes, metrics)
+        _CACHED["version"] = store.version
+        _CACHED["frame"] = frame
+        logger.info(
+            "[FundMetrics] Computed metrics for %d schemes over %d dates from the %s (version %s)",
+            navs.shape[1], navs.shape[0], source, store.version,
+        )
+        return frame
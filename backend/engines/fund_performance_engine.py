@@ -112,25 +112,60 @@ def get_category_performance() -> dict:
     return category_metrics
 
 
+def _apply_scheme_metrics(df: pd.DataFrame) -> pd.Series:
+    """
+    Overlay per-scheme metrics from the NAV history store.
+    Returns a boolean mask of rows that received real per-fund values.
+    """
+    covered = pd.Series(False, index=df.index)
+    if "scheme_code" not in df.columns:
+        return covered
+    try:
+        from backend.engines.fund_metrics_engine import get_scheme_metrics
+
+        scheme_metrics = get_scheme_metrics()
+    except Exception as e:
+        logger.warning(f"Per-scheme metrics unavailable, using category proxies: {e}")
+        return covered
+    if scheme_metrics is None or scheme_metrics.empty:
+        return covered
+
+    codes = pd.to_numeric(df["scheme_code"], errors="coerce")
+    aligned = scheme_metrics.reindex(codes.to_numpy())
+    aligned.index = df.index
+    for col in aligned.columns:
+        df[col] = aligned[col].to_numpy()
+    # A scheme counts as covered once it has at least a 1Y return and a volatility
+    covered = aligned["1y"].notna() & aligned["volatility"].notna()
+    return covered
+
+
 def apply_performance_metrics(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Applies the proxy historical metrics to the mutual fund universe.
+    Applies per-scheme metrics computed from the NAV history where available,
+    and the proxy historical metrics for the remaining funds.
     Calculates the final ranking score.
     Final Score = (CAGR_3Y x 0.40) + (CAGR_5Y x 0.30) + (Sharpe x 0.20) - (Volatility x 0.10)
     """
     if df is None or df.empty or "category" not in df.columns:
         return df
 
-    metrics = get_category_performance()
-
-    # Apply metrics
-    df["1y"] = df["category"].apply(lambda x: metrics.get(x, {}).get("1y", 0.0))
-    df["3y"] = df["category"].apply(lambda x: metrics.get(x, {}).get("3y", 0.0))
-    df["5y"] = df["category"].apply(lambda x: metrics.get(x, {}).get("5y", 0.0))
-    df["volatility"] = df["category"].apply(
-        lambda x: metrics.get(x, {}).get("volatility", 0.0)
-    )
-    df["sharpe"] = df["category"].apply(lambda x: metrics.get(x, {}).get("sharpe", 0.0))
+    covered = _apply_scheme_metrics(df)
+
+    # Only schemes without enough NAV history fall back to the ETF proxies,
+    # so a fully covered universe needs no network call at all.
+    if not covered.all():
+        metrics = get_category_performance()
+        for col in ("1y", "3y", "5y", "volatility", "sharpe"):
+            lookup = {cat: values.get(col, 0.0) for cat, values in metrics.items()}
+            proxy = df["category"].map(lookup).fillna(0.0)
+            if col in df.columns:
+                df[col] = df[col].where(df[col].notna(), proxy)
+            else:
+                df[col] = proxy
+    for col in ("sortino", "max_drawdown"):
+        if col in df.columns:
+            df[col] = df[col].fillna(0.0)
 
     # Calculate Ranking Score
     df["ranking_score"] = (
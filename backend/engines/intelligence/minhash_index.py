@@ -0,0 +1,344 @@
+"""
+backend/engines/intelligence/minhash_index.py
+─────────────────────────────────────────────
+MinHash signatures plus a banded LSH index for near-duplicate and
+low-overlap queries over thousands of funds.
+
+Each fund's token set (its holdings, or the shingled scheme name) is reduced
+to ``num_perm`` MinHash values. Two signatures agree in a given position
+with probability equal to the Jaccard similarity of the two sets. The
+signature is cut into ``bands`` bands of ``rows`` values, and every band is
+folded into one 64-bit key. Funds that share any band key become candidates.
+The index keeps a sorted key array per band, so a query costs
+``bands × log(n)`` plus the size of the matching buckets, not a scan of the
+universe.
+
+The accuracy/speed trade-off is ``num_perm`` (longer signatures give better
+estimates and cost more to hash) together with ``threshold``. From the
+threshold, ``lsh_params`` picks the band layout that balances false
+positives against false negatives.
+
+The FundDataAgent publishes a scheme-name index next to the fund universe
+snapshot. Direct / Regular / IDCW / Growth variants of one scheme share a
+token set there, so ``near_duplicates`` finds them. Holdings-based indexes
+are built on demand with ``MinHashIndex.from_token_sets``.
+"""
+
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.data.columnar_store import current_version, load_snapshot, publish_snapshot
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_SNAPSHOT_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "..", "ai_agents", "data", "fund_similarity")
+)
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_THRESHOLD = 0.8
+
+# splitmix64 finalizer constants
+_MIX_SHIFTS = (np.uint64(30), np.uint64(27), np.uint64(31))
+_MIX_MULTIPLIERS = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+# Signature value of an empty token set
+_EMPTY = np.uint64(np.iinfo(np.uint64).max)
+_PERM_CHUNK = 16
+
+# Plan / option words that distinguish share classes of the same portfolio
+_VARIANT_WORDS = {
+    "direct", "regular", "plan", "option", "growth", "idcw", "dividend", "payout",
+    "reinvestment", "reinvest", "transfer", "of", "the", "and", "daily", "weekly",
+    "monthly", "quarterly", "half", "yearly", "annual", "bonus", "retail", "institutional",
+}
+_WORD = re.compile(r"[a-z0-9]+")
+_IDCW_PHRASE = re.compile(r"income\s+distribution\s+(?:cum\s+)?capital\s+withdrawal")
+
+
+def shingle_scheme_name(name: str) -> Set[str]:
+    """Words and word pairs of a scheme name, ignoring plan / option wording."""
+    text = _IDCW_PHRASE.sub(" idcw ", str(name).lower())
+    words = [w for w in _WORD.findall(text) if w not in _VARIANT_WORDS]
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def _area(y: np.ndarray, x: np.ndarray) -> float:
+    """Trapezoidal integral of ``y`` over ``x``."""
+    return float(((y[1:] + y[:-1]) * np.diff(x)).sum() / 2)
+
+
+@lru_cache(maxsize=32)
+def lsh_params(num_perm: int, threshold: float, false_positive_weight: float = 0.5) -> Tuple[int, int]:
+    """
+    ``(bands, rows)`` with ``bands × rows ≤ num_perm`` minimising the weighted
+    false-positive area below ``threshold`` plus false-negative area above it
+    (of the S-curve ``1 − (1 − s^rows)^bands``).
+    """
+    grid_low = np.linspace(0.0, threshold, 200)
+    grid_high = np.linspace(threshold, 1.0, 200)
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        if rows < 1:
+            break
+        false_positive = _area(1 - (1 - grid_low ** rows) ** bands, grid_low)
+        false_negative = _area((1 - grid_high ** rows) ** bands, grid_high)
+        error = false_positive_weight * false_positive + (1 - false_positive_weight) * false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer (wrapping uint64 arithmetic): a bijective avalanche mix."""
+    s1, s2, s3 = _MIX_SHIFTS
+    m1, m2 = _MIX_MULTIPLIERS
+    values = (values ^ (values >> s1)) * m1
+    values = (values ^ (values >> s2)) * m2
+    return values ^ (values >> s3)
+
+
+class MinHasher:
+    """
+    ``num_perm`` hash functions ``mix64(h(x) ⊕ seedᵢ)`` over 64-bit SipHash
+    token hashes. A linear ``(a·x + b) mod p`` family with short
+    coefficients is not min-wise independent enough and overestimates
+    similarity; the avalanche mix is.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        self.num_perm = num_perm
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._seeds = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True)
+
+    def signatures(self, token_sets: Sequence[Iterable[str]]) -> np.ndarray:
+        """``(len(token_sets), num_perm)`` uint64 signatures; empty sets get the ``_EMPTY`` row."""
+        token_lists = [list(tokens) for tokens in token_sets]
+        lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+        signatures = np.full((len(token_lists), self.num_perm), _EMPTY, dtype=np.uint64)
+        filled = lengths > 0
+        if not filled.any():
+            return signatures
+
+        flat = np.array([token for tokens in token_lists for token in tokens], dtype=object)
+        # SipHash with pandas' fixed default key: stable across processes
+        token_hashes = pd.util.hash_array(flat)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[filled]
+        for lo in range(0, self.num_perm, _PERM_CHUNK):
+            hi = min(lo + _PERM_CHUNK, self.num_perm)
+            permuted = _mix64(token_hashes[:, None] ^ self._seeds[None, lo:hi])
+            signatures[filled, lo:hi] = np.minimum.reduceat(permuted, starts, axis=0)
+        return signatures
+
+
+def union_signature(signatures: np.ndarray) -> np.ndarray:
+    """MinHash of the union of several sets (element-wise minimum of their signatures)."""
+    return np.asarray(signatures, dtype=np.uint64).min(axis=0)
+
+
+def _band_keys(signatures: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """``(n, bands)`` 64-bit FNV-style fold of each band's ``rows`` values."""
+    n = signatures.shape[0]
+    view = signatures[:, : bands * rows].reshape(n, bands, rows)
+    keys = np.full((n, bands), np.uint64(0xCBF29CE484222325), dtype=np.uint64)
+    for r in range(rows):
+        keys ^= view[:, :, r]
+        keys *= np.uint64(0x100000001B3)
+    return keys
+
+
+class MinHashIndex:
+    def __init__(
+        self,
+        signatures: np.ndarray,
+        keys: Sequence[Hashable],
+        threshold: float = DEFAULT_THRESHOLD,
+        hasher: Optional[MinHasher] = None,
+        false_positive_weight: float = 0.5,
+    ):
+        """
+        ``false_positive_weight`` below 0.5 favours recall: more candidates
+        to verify, fewer similar pairs missed.
+        """
+        self.signatures = np.asarray(signatures, dtype=np.uint64)
+        self.keys = np.asarray(keys)
+        self.hasher = hasher or MinHasher(self.signatures.shape[1])
+        self.threshold = threshold
+        self.bands, self.rows = lsh_params(self.signatures.shape[1], threshold, false_positive_weight)
+        self._row_of: Dict[Hashable, int] = {key: i for i, key in enumerate(self.keys.tolist())}
+
+        self._empty = (self.signatures == _EMPTY).all(axis=1)
+        indexed = np.flatnonzero(~self._empty)
+        band_keys = _band_keys(self.signatures[indexed], self.bands, self.rows)
+        # Per band: rows sorted by band key, and the sorted keys for searchsorted
+        self._order = []
+        self._sorted = []
+        for band in range(self.bands):
+            order = np.argsort(band_keys[:, band], kind="stable")
+            self._order.append(indexed[order])
+            self._sorted.append(band_keys[order, band])
+
+    @classmethod
+    def from_token_sets(
+        cls,
+        token_sets: Dict[Hashable, Iterable[str]],
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        false_positive_weight: float = 0.5,
+    ) -> "MinHashIndex":
+        """Index ``{key: tokens}`` (e.g. fund name → normalised holdings)."""
+        hasher = MinHasher(num_perm)
+        keys = list(token_sets)
+        return cls(
+            hasher.signatures([token_sets[k] for k in keys]), keys, threshold, hasher, false_positive_weight
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def signature_of(self, key: Hashable) -> Optional[np.ndarray]:
+        row = self._row_of.get(key)
+        return None if row is None else self.signatures[row]
+
+    def candidates(self, signature: np.ndarray) -> np.ndarray:
+        """Rows sharing at least one LSH band with ``signature`` (unverified)."""
+        signature = np.asarray(signature, dtype=np.uint64)
+        if (signature == _EMPTY).all():
+            return np.empty(0, dtype=np.int64)
+        query = _band_keys(signature[None, :], self.bands, self.rows)[0]
+        hits = []
+        for band in range(self.bands):
+            sorted_keys = self._sorted[band]
+            lo = np.searchsorted(sorted_keys, query[band], side="left")
+            hi = np.searchsorted(sorted_keys, query[band], side="right")
+            if hi > lo:
+                hits.append(self._order[band][lo:hi])
+        if not hits:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(hits))
+
+    def estimate(self, signature: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Estimated Jaccard similarity between ``signature`` and each of ``rows``."""
+        signature = np.asarray(signature, dtype=np.uint64)
+        rows = np.asarray(rows, dtype=np.int64)
+        if (signature == _EMPTY).all():
+            return np.zeros(len(rows))
+        estimates = (self.signatures[rows] == signature[None, :]).mean(axis=1)
+        return np.where(self._empty[rows], 0.0, estimates)
+
+    def query(
+        self, signature: np.ndarray, threshold: Optional[float] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """``(key, estimated Jaccard)`` of indexed funds similar to ``signature``, most similar first."""
+        threshold = self.threshold if threshold is None else threshold
+        rows = self.candidates(signature)
+        estimates = self.estimate(signature, rows)
+        keep = estimates >= threshold
+        rows, estimates = rows[keep], estimates[keep]
+        order = np.argsort(-estimates, kind="stable")
+        return [(self.keys[rows[i]].item(), float(estimates[i])) for i in order]
+
+    def near_duplicates(self, key: Hashable, threshold: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """Other indexed funds whose token sets are near-identical to ``key``'s."""
+        signature = self.signature_of(key)
+        if signature is None:
+            return []
+        return [(other, similarity) for other, similarity in self.query(signature, threshold) if other != key]
+
+    def low_overlap_candidates(
+        self,
+        signature: np.ndarray,
+        max_overlap: float,
+        order: Optional[Iterable[Hashable]] = None,
+        limit: int = 10,
+        exclude: Iterable[Hashable] = (),
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        The first ``limit`` ``(key, estimated Jaccard)`` pairs, in ``order``,
+        of funds whose overlap with ``signature`` is below ``max_overlap``.
+        These are not the ``limit`` lowest-overlap funds: pass ``order``
+        pre-ranked (best first, any iterable; index order by default).
+
+        Funds sharing an LSH band with the portfolio are the likely
+        high-overlap ones and are ruled out up front. Everything else is
+        low-overlap with high probability, and only the funds actually
+        returned get a signature check. ``order`` is consumed lazily and
+        the walk stops at ``limit``, so the cost grows with how far into
+        ``order`` the passing funds sit, not with the universe.
+        """
+        blocked = set(self.keys[self.candidates(signature)].tolist()) | set(exclude)
+        signature = np.asarray(signature, dtype=np.uint64)
+        results: List[Tuple[Hashable, float]] = []
+        for key in (iter(self.keys) if order is None else order):
+            if key in blocked:
+                continue
+            row = self._row_of.get(key)
+            if row is None or self._empty[row]:
+                continue
+            similarity = float(self.estimate(signature, np.array([row]))[0])
+            if similarity < max_overlap:
+                results.append((key, similarity))
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def publish_similarity_index(
+    universe: pd.DataFrame,
+    root: str = SIMILARITY_SNAPSHOT_DIR,
+    num_perm: int = DEFAULT_NUM_PERM,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Optional[str]:
+    """
+    Sign every scheme name in ``universe`` and publish the signatures as a
+    columnar snapshot (one 2-D ``signature`` column, memory-mapped on load).
+    """
+    if universe is None or universe.empty or "scheme_name" not in universe.columns:
+        return None
+    hasher = MinHasher(num_perm)
+    signatures = hasher.signatures([shingle_scheme_name(name) for name in universe["scheme_name"].tolist()])
+    key_column = "scheme_code" if "scheme_code" in universe.columns else "scheme_name"
+    return publish_snapshot(
+        root,
+        {"key": universe[key_column].astype(str).to_numpy(dtype=object), "signature": signatures},
+        meta={"num_perm": num_perm, "seed": hasher.seed, "threshold": threshold, "tokens": "scheme_name"},
+    )
+
+
+def load_similarity_index(root: str = SIMILARITY_SNAPSHOT_DIR) -> Optional[MinHashIndex]:
+    snapshot = load_snapshot(root, mmap=True)
+    if snapshot is None:
+        return None
+    columns, meta = snapshot
+    hasher = MinHasher(int(meta.get("num_perm", DEFAULT_NUM_PERM)), int(meta.get("seed", 1)))
+    return MinHashIndex(
+        columns["signature"], columns["key"], float(meta.get("threshold", DEFAULT_THRESHOLD)), hasher
+    )
+
+
+_default_index: Tuple[Optional[str], Optional[MinHashIndex]] = (None, None)
+_default_lock = threading.Lock()
+
+
+def get_similarity_index() -> Optional[MinHashIndex]:
+    """Process-wide scheme-name index for the live published version, or None."""
+    global _default_index
+    version = current_version(SIMILARITY_SNAPSHOT_DIR)
+    if version is None:
+        return None
+    with _default_lock:
+        if _default_index[0] != version:
+            try:
+                _default_index = (version, load_similarity_index(SIMILARITY_SNAPSHOT_DIR))
+            except Exception as e:
+                logger.error(f"[MinHashIndex] Failed to load similarity index {version}: {e}")
+                return _default_index[1]
+        return _default_index[1]
@@ -1,5 +1,16 @@
-from typing import Dict, Any, List, Set, Optional
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Set, Optional, Tuple, Union
+
 import numpy as np
+from scipy import sparse
+
+# Holdings as "A, B, C", a list of names, or a {name: weight} mapping
+Holdings = Union[str, List[str], Dict[str, float], None]
+
+_OVERLAP_CACHE_SIZE = 128
 
 
 def parse_holdings(holdings_str: str) -> Set[str]:
@@ -8,6 +19,100 @@ def parse_holdings(holdings_str: str) -> Set[str]:
     return set([h.strip().lower() for h in holdings_str.split(",") if h.strip()])
 
 
+def parse_weighted_holdings(holdings: Holdings) -> Dict[str, float]:
+    """
+    Normalised holdings → weight. Strings and lists give every holding weight
+    1.0; mappings keep their weights (duplicate names after normalisation are
+    summed, non-positive weights dropped).
+    """
+    if not holdings:
+        return {}
+    if isinstance(holdings, str):
+        return dict.fromkeys(parse_holdings(holdings), 1.0)
+    if isinstance(holdings, dict):
+        weights: Dict[str, float] = {}
+        for name, weight in holdings.items():
+            key = str(name).strip().lower()
+            try:
+                weight = float(weight)
+            except (TypeError, ValueError):
+                continue
+            if key and weight > 0:
+                weights[key] = weights.get(key, 0.0) + weight
+        return weights
+    return dict.fromkeys((str(h).strip().lower() for h in holdings if str(h).strip()), 1.0)
+
+
+def build_incidence_matrix(
+    holdings: List[Dict[str, float]],
+) -> Tuple[sparse.csr_matrix, Dict[str, int]]:
+    """
+    Intern every holding name into an integer id once and return the sparse
+    fund × holding matrix of weights, plus the name → id vocabulary.
+    """
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    data: List[float] = []
+    for row, fund_holdings in enumerate(holdings):
+        for name, weight in fund_holdings.items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(name, len(vocabulary)))
+            data.append(weight)
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(len(holdings), len(vocabulary)),
+    )
+    return matrix, vocabulary
+
+
+def jaccard_matrix(incidence: sparse.spmatrix) -> np.ndarray:
+    """
+    Pairwise Jaccard similarity of the rows of a fund × holding matrix. All
+    intersections come from one sparse product B·Bᵀ of the 0/1 pattern;
+    unions follow from the row sizes. Pairs with no holdings score 0.
+    """
+    binary = incidence.astype(bool).astype(np.float64)
+    intersection = (binary @ binary.T).toarray()
+    sizes = np.asarray(binary.sum(axis=1)).ravel()
+    union = sizes[:, None] + sizes[None, :] - intersection
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(union > 0, intersection / np.where(union > 0, union, 1.0), 0.0)
+
+
+def weighted_overlap_matrix(incidence: sparse.spmatrix) -> np.ndarray:
+    """
+    Pairwise weight-aware overlap Σₖ min(wᵢₖ, wⱼₖ) with each fund's weights
+    normalised to sum to 1 (so 1.0 means identical portfolios).
+
+    Only funds sharing a holding are ever compared, with no Python-level
+    loop. The entries are sorted by (holding, weight descending), so within
+    a holding each entry's minimum with every earlier entry is its own
+    weight. All (earlier, later) index pairs are generated at once and the
+    minima are summed per fund pair by one sparse COO → dense conversion.
+    """
+    n = incidence.shape[0]
+    totals = np.asarray(incidence.sum(axis=1)).ravel()
+    scaled = sparse.diags(np.where(totals > 0, 1.0 / np.where(totals > 0, totals, 1.0), 0.0)) @ incidence
+    columns = sparse.csc_matrix(scaled)
+    columns.eliminate_zeros()
+    sizes = np.diff(columns.indptr)
+    holding = np.repeat(np.arange(columns.shape[1]), sizes)
+    order = np.lexsort((-columns.data, holding))
+    funds, weights = columns.indices[order], columns.data[order]
+
+    # Entry e pairs with the later entries e+1 … end-1 of its holding
+    entry = np.arange(len(funds))
+    partners = np.repeat(columns.indptr[1:], sizes) - entry - 1
+    first = np.repeat(entry, partners)
+    second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(partners) - partners, partners)
+
+    pairs = sparse.coo_matrix((weights[second], (funds[first], funds[second])), shape=(n, n)).toarray()
+    overlap = pairs + pairs.T
+    overlap[np.diag_indices(n)] = np.asarray(scaled.sum(axis=1)).ravel()
+    return overlap
+
+
 def calculate_jaccard_similarity(set_a: Set[str], set_b: Set[str]) -> float:
     if not set_a and not set_b:
         return 0.0
@@ -78,42 +183,76 @@ def check_fund_overlap(
     }
 
 
+def _fingerprint(fund_names: List[str], holdings: List[Dict[str, float]], weighted: bool) -> str:
+    """Order-sensitive digest of the fund set (names and normalised holdings)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(b"w" if weighted else b"j")
+    for name, fund_holdings in zip(fund_names, holdings):
+        digest.update(repr((name, sorted(fund_holdings.items()))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+_OVERLAP_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_OVERLAP_LOCK = threading.Lock()
+
+
 def calculate_portfolio_overlap(
-    portfolio_funds: List[Dict[str, Any]], holdings_field: str = "top_holdings"
+    portfolio_funds: List[Dict[str, Any]],
+    holdings_field: str = "top_holdings",
+    weighted: Optional[bool] = None,
 ) -> Dict[str, Any]:
+    """
+    Pairwise holdings overlap for a portfolio. Jaccard similarity by default;
+    weight-aware overlap when ``weighted`` is True, or when left as None and
+    every fund lists its holdings as a ``{name: weight}`` mapping. Results
+    are cached per fund-set fingerprint.
+    """
     if len(portfolio_funds) < 2:
         return {"valid": False, "error": "Need at least 2 funds to calculate overlap"}
 
-    overlap_matrix = []
     fund_names = [
         f.get("fund_name", f"Fund_{i}") for i, f in enumerate(portfolio_funds)
     ]
+    raw_holdings = [f.get(holdings_field, "") for f in portfolio_funds]
+    if weighted is None:
+        weighted = all(isinstance(h, dict) and h for h in raw_holdings)
+    holdings = [parse_weighted_holdings(h) for h in raw_holdings]
+
+    key = _fingerprint(fund_names, holdings, weighted)
+    with _OVERLAP_LOCK:
+        cached = _OVERLAP_CACHE.get(key)
+        if cached is not None:
+            _OVERLAP_CACHE.move_to_end(key)
+    if cached is None:
+        cached = _portfolio_overlap(fund_names, holdings, weighted)
+        with _OVERLAP_LOCK:
+            _OVERLAP_CACHE[key] = cached
+            while len(_OVERLAP_CACHE) > _OVERLAP_CACHE_SIZE:
+                _OVERLAP_CACHE.popitem(last=False)
+    return copy.deepcopy(cached)
+
+
+def _portfolio_overlap(
+    fund_names: List[str], holdings: List[Dict[str, float]], weighted: bool
+) -> Dict[str, Any]:
+    incidence, _ = build_incidence_matrix(holdings)
+    similarity = weighted_overlap_matrix(incidence) if weighted else jaccard_matrix(incidence)
+    np.fill_diagonal(similarity, 1.0)
 
-    for i, fund_a in enumerate(portfolio_funds):
-        row = []
-        for j, fund_b in enumerate(portfolio_funds):
-            if i == j:
-                row.append(1.0)
-            else:
-                holdings_a = fund_a.get(holdings_field, "")
-                holdings_b = fund_b.get(holdings_field, "")
-                set_a = parse_holdings(holdings_a)
-                set_b = parse_holdings(holdings_b)
-                similarity = calculate_jaccard_similarity(set_a, set_b)
-                row.append(round(similarity, 4))
-        overlap_matrix.append(row)
+    n = len(fund_names)
+    overlap_matrix = [[round(value, 4) for value in row] for row in similarity.tolist()]
 
     avg_overlap = np.mean(
         [
             overlap_matrix[i][j]
-            for i in range(len(portfolio_funds))
-            for j in range(i + 1, len(portfolio_funds))
+            for i in range(n)
+            for j in range(i + 1, n)
         ]
     )
 
     high_overlap_pairs = []
-    for i in range(len(portfolio_funds)):
-        for j in range(i + 1, len(portfolio_funds)):
+    for i in range(n):
+        for j in range(i + 1, n):
             if overlap_matrix[i][j] > 0.3:
                 high_overlap_pairs.append(
                     {
@@ -142,6 +281,7 @@ def calculate_portfolio_overlap(
         "diversification_score": round(diversification_score, 2),
         "category": category,
         "average_overlap": round(avg_overlap * 100, 2),
+        "overlap_method": "weighted" if weighted else "jaccard",
         "overlap_matrix": overlap_matrix,
         "fund_names": fund_names,
         "high_overlap_pairs": high_overlap_pairs,
@@ -177,14 +317,49 @@ def _generate_overlap_recommendations(
     return recommendations
 
 
+def build_holdings_index(
+    funds: List[Dict[str, Any]],
+    holdings_field: str = "top_holdings",
+    threshold: float = 0.25,
+    num_perm: int = 128,
+):
+    """
+    MinHash/LSH index of the funds' normalised holdings keyed by
+    ``fund_name``, for ``suggest_diversification(..., index=...)``. Build it
+    once per universe; ``threshold`` should match the ``max_overlap`` it
+    will serve.
+    """
+    from backend.engines.intelligence.minhash_index import MinHashIndex
+
+    return MinHashIndex.from_token_sets(
+        {f.get("fund_name", ""): parse_weighted_holdings(f.get(holdings_field, "")) for f in funds},
+        threshold=threshold,
+        num_perm=num_perm,
+    )
+
+
 def suggest_diversification(
     current_funds: List[Dict[str, Any]],
     available_funds: List[Dict[str, Any]],
     holdings_field: str = "top_holdings",
     max_overlap: float = 0.25,
+    index=None,
 ) -> List[Dict[str, Any]]:
+    """
+    Up to 10 funds from ``available_funds`` whose holdings overlap the
+    combined current portfolio by less than ``max_overlap`` (Jaccard).
+
+    With a prebuilt ``index`` (``build_holdings_index``) the screen does not
+    compare against every candidate. Funds sharing an LSH band with the
+    portfolio are ruled out, and ``available_funds`` is walked lazily until
+    10 low-overlap funds are found. The result is then the first 10 passing
+    funds in ``available_funds`` order, not the 10 lowest-overlap ones, so
+    pass it pre-ranked (best first). Overlaps are MinHash estimates.
+    """
     if not current_funds or not available_funds:
         return []
+    if index is not None:
+        return _suggest_from_index(current_funds, available_funds, holdings_field, max_overlap, index)
 
     current_holdings = []
     for fund in current_funds:
@@ -227,6 +402,53 @@ def suggest_diversification(
     return suggestions[:10]
 
 
+def _suggest_from_index(
+    current_funds: List[Dict[str, Any]],
+    available_funds: List[Dict[str, Any]],
+    holdings_field: str,
+    max_overlap: float,
+    index,
+) -> List[Dict[str, Any]]:
+    combined_current: Set[str] = set()
+    for fund in current_funds:
+        combined_current |= set(parse_weighted_holdings(fund.get(holdings_field, "")))
+    signature = index.hasher.signatures([combined_current])[0]
+
+    # Only the funds walked before the 10th pass are ever looked at
+    by_name: Dict[str, Dict[str, Any]] = {}
+
+    def walk():
+        for fund in available_funds:
+            fund_name = fund.get("fund_name", "")
+            by_name.setdefault(fund_name, fund)
+            yield fund_name
+
+    candidates = index.low_overlap_candidates(
+        signature,
+        max_overlap,
+        order=walk(),
+        limit=10,
+        exclude={f.get("fund_name") for f in current_funds},
+    )
+
+    suggestions = []
+    for fund_name, overlap_with_portfolio in candidates:
+        fund = by_name[fund_name]
+        fund_holdings = set(parse_weighted_holdings(fund.get(holdings_field, "")))
+        suggestions.append(
+            {
+                "fund_name": fund_name,
+                "category": fund.get("category", "Unknown"),
+                "overlap_with_portfolio": round(overlap_with_portfolio * 100, 2),
+                "new_holdings_count": len(fund_holdings - combined_current),
+                "recommendation_score": round((1 - overlap_with_portfolio) * 100, 2),
+            }
+        )
+
+    suggestions.sort(key=lambda x: x["recommendation_score"], reverse=True)
+    return suggestions
+
+
 if __name__ == "__main__":
     fund_a = (
         "TCS, Infosys, HDFC Bank, ICICI Bank, Reliance, SBIN, Bajaj Finance, Axis Bank"
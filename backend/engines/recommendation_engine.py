@@ -20,44 +20,33 @@ def get_processed_fund_universe() -> tuple[pd.DataFrame, bool]:
 from backend.engines.recommendation_engine.dynamic_recommender import (
     run_dynamic_pipeline,
 )
-from ai_agents.db import storage
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 def _get_signals_with_fallback() -> Dict[str, Any]:
-    """Get market signals with full fallback hierarchy."""
+    """
+    Get market signals from the shared intelligence cache (one in-process hit
+    when warm; Redis / file tiers otherwise), falling back to defaults.
+    """
     try:
-        latest_intelligence = storage.get_latest()
-        if (
-            latest_intelligence
-            and "signals" in latest_intelligence
-            and latest_intelligence["signals"]
-        ):
-            signals = latest_intelligence["signals"]
+        from data.cache.tiered_cache import get_intelligence_cache
+
+        cache = get_intelligence_cache()
+        signals = cache.get("signals")
+        if signals:
             logger.info(
                 "[RecommendEngine] Using LIVE market signals for dynamic adjustments."
             )
-            try:
-                from data.cache.cache_manager import save_signals
-
-                save_signals(signals)
-            except Exception:
-                pass
             return signals
-    except Exception as e:
-        logger.warning(f"[RecommendEngine] Storage fetch failed: {e}")
-
-    try:
-        from data.cache.cache_manager import load_signals_fallback
 
-        cached_signals = load_signals_fallback()
+        cached_signals = cache.get("signals", allow_stale=True)
         if cached_signals and cached_signals.get("signal_source") != "fallback":
             logger.info("[RecommendEngine] Using CACHED market signals.")
             return cached_signals
     except Exception as e:
-        logger.warning(f"[RecommendEngine] Cache fallback failed: {e}")
+        logger.warning(f"[RecommendEngine] Intelligence cache lookup failed: {e}")
 
     logger.warning("[RecommendEngine] Using DEFAULT market signals (last resort).")
     return {
@@ -4,10 +4,12 @@ backend/engines/recommendation_engine/__init__.py
 Public surface of the recommendation_engine package.
 Exports suggest_mutual_funds so the rest of the app keeps the same import:
     from backend.engines.recommendation_engine import suggest_mutual_funds
+and suggest_mutual_funds_batch for bulk runs (e.g. nightly client reviews).
 """
 
 import logging
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
 
 import pandas as pd
 
@@ -15,15 +17,26 @@ from backend.engines.advanced_products_engine import (
     get_advanced_product_eligibility,
     recommend_bonds,
 )
+from backend.data.fund_universe_store import get_fund_universe_store
 from backend.data.mutual_fund_api import get_mutual_fund_universe
 from backend.engines.fund_categorizer import categorize_funds
 from backend.engines.fund_performance_engine import apply_performance_metrics
-from .dynamic_recommender import run_dynamic_pipeline
+from .dynamic_recommender import run_dynamic_batch, run_dynamic_pipeline
 
 logger = logging.getLogger(__name__)
 
 
 def get_processed_fund_universe() -> tuple[pd.DataFrame, bool]:
+    """
+    The categorized, metric-enriched universe. Served from the agent's
+    published snapshot (memory-mapped, shared across processes) when there
+    is one; otherwise rebuilt from AMFI. A published universe counts as
+    live only if the agent built it from live AMFI data.
+    """
+    _, published = get_fund_universe_store().snapshot()
+    if published is not None and not published.empty:
+        return published, bool(published.attrs.get("is_live_amfi", False))
+
     df, is_live = get_mutual_fund_universe()
     if df is not None and not df.empty:
         df = categorize_funds(df)
@@ -32,37 +45,25 @@ def get_processed_fund_universe() -> tuple[pd.DataFrame, bool]:
 
 
 def _get_signals_with_fallback() -> Dict[str, Any]:
-    """Get market signals with full fallback hierarchy."""
+    """
+    Get market signals from the shared intelligence cache (one in-process hit
+    when warm; Redis / file tiers otherwise), falling back to defaults.
+    """
     try:
-        from ai_agents.db import storage
-
-        latest_intelligence = storage.get_latest()
-        if (
-            latest_intelligence
-            and "signals" in latest_intelligence
-            and latest_intelligence["signals"]
-        ):
-            signals = latest_intelligence["signals"]
-            logger.info("[RecommendEngine] Using LIVE market signals.")
-            try:
-                from data.cache.cache_manager import save_signals
-
-                save_signals(signals)
-            except Exception:
-                pass
-            return signals
-    except Exception as e:
-        logger.warning(f"[RecommendEngine] Storage fetch failed: {e}")
+        from data.cache.tiered_cache import get_intelligence_cache
 
-    try:
-        from data.cache.cache_manager import load_signals_fallback
+        cache = get_intelligence_cache()
+        signals = cache.get("signals")
+        if signals:
+            logger.debug("[RecommendEngine] Using LIVE market signals.")
+            return signals
 
-        cached_signals = load_signals_fallback()
+        cached_signals = cache.get("signals", allow_stale=True)
         if cached_signals and cached_signals.get("signal_source") != "fallback":
             logger.info("[RecommendEngine] Using CACHED market signals.")
             return cached_signals
     except Exception as e:
-        logger.warning(f"[RecommendEngine] Cache fallback failed: {e}")
+        logger.warning(f"[RecommendEngine] Intelligence cache lookup failed: {e}")
 
     logger.warning("[RecommendEngine] Using DEFAULT market signals (last resort).")
     return {
@@ -94,6 +95,36 @@ def suggest_mutual_funds(
     return recommendations, is_live
 
 
+def suggest_mutual_funds_batch(
+    clients: Iterable[Tuple[Hashable, Dict[str, Any], str]],
+    market_signals: Optional[Dict[str, Any]] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Recommendations for many ``(client_id, allocation, risk_profile)`` rows,
+    streamed as one ``{"client_id", "recommendations", "is_live"}`` dict per
+    client in input order. Signals are resolved once and the universe is
+    scored once for the whole batch. When the stream is exhausted, ``stats``
+    (if given) receives the client count, elapsed seconds and clients/s.
+    """
+    signals = market_signals or _get_signals_with_fallback()
+    started = time.perf_counter()
+    count = 0
+    for client_id, recommendations in run_dynamic_batch(clients, signals):
+        count += 1
+        yield {
+            "client_id": client_id,
+            "recommendations": recommendations,
+            "is_live": len(recommendations) > 0,
+        }
+
+    elapsed = time.perf_counter() - started
+    throughput = count / elapsed if elapsed > 0 else 0.0
+    logger.info(f"[RecommendEngine] Batch of {count} clients in {elapsed:.2f}s ({throughput:.0f} clients/s)")
+    if stats is not None:
+        stats.update(clients=count, seconds=round(elapsed, 4), clients_per_second=round(throughput, 1))
+
+
 def suggest_advanced_products(
     allocation: Dict[str, Any],
     annual_income: float,
@@ -0,0 +1,146 @@
+"""
+backend/engines/recommendation_engine/category_index.py
+───────────────────────────────────────────────────────
+Score-ordered row ids per fund category.
+
+Rows are sorted once by (category, score desc) so that each category is
+one contiguous slice of a single int array. Selecting the best fund in a
+category is therefore a slice. Unions of categories (an asset class such as
+"Debt" → Debt + Liquid, further narrowed by the user's risk rules) are
+merged once and memoized under a caller-supplied key. ``top_k`` skips
+excluded keys (already-selected schemes) by looking only at the head of the
+slice.
+
+Row ids are positions (``iloc``) in the frame the index was built from.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Collection, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .category_lookup import category_codes
+
+_FRAME_INDEX_SLOTS = 4
+
+
+class CategoryIndex:
+    def __init__(
+        self,
+        categories: pd.Series,
+        scores: np.ndarray,
+        keys: Optional[np.ndarray] = None,
+        mask: Optional[np.ndarray] = None,
+    ):
+        codes, labels = category_codes(categories)
+        scores = np.asarray(scores, dtype=np.float64)
+        # NaN scores rank last
+        self._scores = np.where(np.isnan(scores), -np.inf, scores)
+        eligible = codes >= 0
+        if mask is not None:
+            eligible &= np.asarray(mask, dtype=bool)
+        rows = np.flatnonzero(eligible)
+        self._order = rows[np.lexsort((-self._scores[rows], codes[rows]))]
+
+        bounds = np.searchsorted(codes[self._order], np.arange(len(labels) + 1))
+        self._slices: Dict[str, Tuple[int, int]] = {
+            str(label): (int(bounds[i]), int(bounds[i + 1])) for i, label in enumerate(labels)
+        }
+        self.keys = np.asarray(keys) if keys is not None else None
+        self._merged: Dict[Hashable, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def categories(self) -> List[str]:
+        return [label for label, (start, end) in self._slices.items() if end > start]
+
+    def category_rows(self, category: str) -> np.ndarray:
+        """Rows of exactly ``category``, best score first (a view, no copy)."""
+        start, end = self._slices.get(str(category), (0, 0))
+        return self._order[start:end]
+
+    def rows(self, predicate: Callable[[str], bool], key: Optional[Hashable] = None) -> np.ndarray:
+        """
+        Rows of every category whose lowercased label satisfies ``predicate``,
+        best score first. Memoized under ``key`` when one is given.
+        """
+        if key is not None:
+            merged = self._merged.get(key)
+            if merged is not None:
+                return merged
+
+        parts = [self.category_rows(label) for label in self.categories if predicate(label.lower())]
+        if not parts:
+            merged = np.empty(0, dtype=self._order.dtype)
+        elif len(parts) == 1:
+            merged = parts[0]
+        else:
+            merged = np.concatenate(parts)
+            merged = merged[np.argsort(-self._scores[merged], kind="stable")]
+
+        if key is not None:
+            with self._lock:
+                self._merged[key] = merged
+        return merged
+
+    def top_k(self, rows: np.ndarray, k: int = 1, exclude: Collection = ()) -> np.ndarray:
+        """The first ``k`` of ``rows`` whose key is not in ``exclude``."""
+        if not exclude:
+            return rows[:k]
+        if self.keys is None:
+            raise ValueError("CategoryIndex was built without keys; cannot exclude")
+        excluded = np.asarray(list(exclude), dtype=self.keys.dtype)
+        limit = k + len(excluded)
+        while True:
+            head = rows[:limit]
+            kept = head[~np.isin(self.keys[head], excluded)]
+            if len(kept) >= k or limit >= len(rows):
+                return kept[:k]
+            limit *= 2
+
+
+_FRAME_INDEXES: "OrderedDict[Tuple[int, str, bool], Tuple[weakref.ref, CategoryIndex]]" = OrderedDict()
+_FRAME_LOCK = threading.Lock()
+
+
+def index_for_frame(
+    df: pd.DataFrame,
+    score_column: str,
+    key_column: str = "scheme_name",
+    exclude_etf: bool = False,
+) -> CategoryIndex:
+    """
+    Index over ``df`` ordered by ``score_column``, built once per frame
+    object and reused while that frame is alive. The frame must not be
+    mutated in place afterwards.
+    """
+    cache_key = (id(df), score_column, exclude_etf)
+    with _FRAME_LOCK:
+        hit = _FRAME_INDEXES.get(cache_key)
+        if hit is not None and hit[0]() is df:
+            _FRAME_INDEXES.move_to_end(cache_key)
+            return hit[1]
+
+    mask = None
+    if exclude_etf:
+        from backend.data.benchmark_indices import infer_fund_types
+
+        fund_types = df["fund_type"].to_numpy() if "fund_type" in df.columns else infer_fund_types(df["scheme_name"])
+        mask = fund_types != "ETF"
+    index = CategoryIndex(
+        df["category"],
+        pd.to_numeric(df[score_column], errors="coerce").to_numpy(),
+        keys=df[key_column].to_numpy() if key_column in df.columns else None,
+        mask=mask,
+    )
+    with _FRAME_LOCK:
+        _FRAME_INDEXES[cache_key] = (weakref.ref(df), index)
+        while len(_FRAME_INDEXES) > _FRAME_INDEX_SLOTS:
+            _FRAME_INDEXES.popitem(last=False)
+    return index
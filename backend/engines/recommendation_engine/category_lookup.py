@@ -0,0 +1,41 @@
+"""
+backend/engines/recommendation_engine/category_lookup.py
+────────────────────────────────────────────────────────
+Per-category lookup tables.
+
+Most per-fund rules in the pipeline depend only on the fund's category
+string, and the universe has a few dozen categories across ~14k funds. So
+each rule is evaluated once per distinct category. The results form a small
+table, and a NumPy gather over the category codes maps them back to rows.
+"""
+
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+
+def category_codes(series: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """``(codes, categories)`` for a text column; missing values get code −1."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Index(uniques)
+
+
+def map_categories(series: pd.Series, rule: Callable[[str], Any], dtype=None) -> np.ndarray:
+    """
+    ``rule(lowercased category)`` for every row of ``series``, evaluated
+    once per distinct category. Missing categories are passed as ``""``.
+    """
+    codes, categories = category_codes(series)
+    # The last slot holds the value for missing categories (code −1)
+    table = np.array([rule(str(c).lower()) for c in categories] + [rule("")], dtype=dtype)
+    return table[codes]
+
+
+def category_column(df: pd.DataFrame) -> pd.Series:
+    """The ``category`` column, or an all-empty one when the frame has none."""
+    if "category" in df.columns:
+        return df["category"]
+    return pd.Series("", index=df.index)
@@ -5,22 +5,165 @@ The core orchestrator for the new dynamic recommendation pipeline.
 Loads data, filters, scores, diversifies, and explains.
 """
 
-import os
-import pandas as pd
+import math
 import logging
-from typing import Dict, Any, List
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Any, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import pandas as pd
 
 from config import EXCLUDE_ETF_FROM_ADVISORY
-from backend.data.benchmark_indices import enrich_with_benchmark_metrics, infer_fund_type
+from backend.data.benchmark_indices import enrich_with_benchmark_metrics, infer_fund_type, infer_fund_types
+from backend.data.fund_universe_store import FUNDS_CSV_PATH, get_fund_universe_store  # noqa: F401 (re-exported)
+from .category_index import CategoryIndex
 from .quality_filter import apply_quality_filter
-from .scoring_engine import score_funds
-from .user_matching import apply_user_matching
+from .scoring_engine import regime_score_column, score_all_regimes, signal_regime
+from .user_matching import risk_bucket, risk_category_rule
 
 logger = logging.getLogger(__name__)
 
-FUNDS_CSV_PATH = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "..", "..", "..", "ai_agents", "data", "mutual_funds.csv")
-)
+# Eligible universe scored for every regime, plus one index per regime — current universe version only
+_RANKED: Dict[str, Any] = {"version": None, "frame": None, "indexes": {}}
+_RANKED_LOCK = threading.Lock()
+
+_RESULT_CACHE_SIZE = 256
+
+# Share-class variants of one scheme have identical scheme-name token sets
+_VARIANT_SIMILARITY = 0.9
+
+
+class _ResultCache:
+    """
+    Bounded LRU of finished recommendation lists for one universe version.
+    Entries are tuples of read-only mappings; a new universe version clears
+    everything, and older signal fingerprints age out of the LRU.
+    """
+
+    def __init__(self, maxsize: int = _RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, CachedResult]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: Optional[str], key: Hashable) -> Optional["CachedResult"]:
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, version: Optional[str], key: Hashable, result: "CachedResult") -> None:
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = result
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+
+# (asset class, read-only recommendation) pairs
+CachedResult = Tuple[Tuple[str, Mapping[str, Any]], ...]
+_RESULTS = _ResultCache()
+
+
+def _ranked_universe(
+    version: Optional[str], universe: pd.DataFrame, market_signals: Dict[str, Any]
+) -> Tuple[pd.DataFrame, CategoryIndex, str]:
+    """
+    ``(frame, index, score_column)`` for the active signal regime. The
+    eligible universe (ETF and quality filters applied) is scored for all
+    nine regimes once per universe version; a change of signals only
+    selects another precomputed column (and its index).
+    """
+    regime = signal_regime(market_signals)
+    score_column = regime_score_column(regime)
+
+    with _RANKED_LOCK:
+        if _RANKED["version"] != version:
+            df = universe
+            if "fund_type" not in df.columns:
+                df = df.assign(fund_type=infer_fund_types(df["scheme_name"]))
+            if EXCLUDE_ETF_FROM_ADVISORY:
+                df = df[df["fund_type"] != "ETF"]
+
+            # 2. Quality Filter (Drop bad funds)
+            df = apply_quality_filter(df)
+
+            # 3. Score Funds (With Market Awareness) — every regime up front
+            df = score_all_regimes(df)
+            _RANKED.update(version=version, frame=df, indexes={})
+
+        df = _RANKED["frame"]
+        index = _RANKED["indexes"].get(regime)
+        if index is None:
+            key_column = "scheme_code" if "scheme_code" in df.columns else "scheme_name"
+            index = CategoryIndex(df["category"], df[score_column].to_numpy(), keys=df[key_column].to_numpy())
+            _RANKED["indexes"][regime] = index
+    return df, index, score_column
+
+
+def _signal_fingerprint(market_signals: Dict[str, Any]) -> Tuple[str, str]:
+    """The signal values that reach the output (scoring regime and market-fit wording)."""
+    return (
+        str(market_signals.get("market_trend", "neutral")).lower(),
+        str(market_signals.get("volatility", "medium")).lower(),
+    )
+
+
+def _target_categories(asset_class: str) -> Tuple[str, ...]:
+    """Lowercased category tokens an MPT asset class maps to (empty = no fund block)."""
+    target_cats = set()
+    ac_lower = asset_class.lower()
+    if "equity" in ac_lower:
+        if "large cap" in ac_lower: target_cats = {"Large Cap"}
+        elif "flexi" in ac_lower: target_cats = {"Flexi"}
+        elif "small" in ac_lower: target_cats = {"Small Cap"}
+        elif "mid" in ac_lower: target_cats = {"Mid Cap"}
+        elif "hybrid" in ac_lower: target_cats = {"Hybrid"}
+        else: target_cats = {"Large Cap", "Flexi"}
+    elif "debt" in ac_lower:
+        target_cats = {"Debt", "Liquid"}
+    elif "gold" in ac_lower:
+        target_cats = {"Gold", "Commodity"}
+    return tuple(sorted(t.lower() for t in target_cats))
+
+
+def _metric(fund: Dict[str, Any], key: str, default: float = 0.0) -> float:
+    """Metric from a universe row as a plain float (the store keeps metrics as float32)."""
+    value = fund.get(key, default)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return value if math.isnan(value) else round(value, 4)
+
+
+def _share_class_variants(key: Hashable) -> List[Hashable]:
+    """
+    Keys of the Direct/Regular/IDCW variants of ``key`` in the published
+    scheme-name index, so one scheme is not recommended twice.
+    """
+    from backend.engines.intelligence.minhash_index import get_similarity_index
+
+    similarity_index = get_similarity_index()
+    if similarity_index is None:
+        return []
+    return [other for other, _ in similarity_index.near_duplicates(str(key), threshold=_VARIANT_SIMILARITY)]
 
 
 def _market_fit_reason(category: str, risk_profile: str, market_signals: Dict[str, Any]) -> str:
@@ -52,70 +195,116 @@ def run_dynamic_pipeline(
     6. Generate Explanations
     """
     
-    # 1. Load Data
-    try:
-        if not os.path.exists(FUNDS_CSV_PATH):
-            logger.warning("mutual_funds.csv not found! Did the fund_data_agent run?")
-            return []
-        df = pd.read_csv(FUNDS_CSV_PATH)
-    except Exception as e:
-        logger.error(f"Failed to load fund universe: {e}")
+    version, universe = get_fund_universe_store().snapshot()
+    if universe is None or universe.empty:
         return []
+    return _recommend(version, universe, allocation_weights, risk_profile, market_signals)
 
-    df = df.copy()
-    df["fund_type"] = df["scheme_name"].apply(infer_fund_type)
-    if EXCLUDE_ETF_FROM_ADVISORY:
-        df = df[df["fund_type"] != "ETF"].copy()
 
-    # 2. Quality Filter (Drop bad funds)
-    df = apply_quality_filter(df)
-    
-    # 3. Score Funds (With Market Awareness)
-    df = score_funds(df, market_signals)
-    
-    # 4. Filter by User Risk strictly
-    df = apply_user_matching(df, risk_profile)
-    
-    if df.empty:
+def run_dynamic_batch(
+    clients: Iterable[Tuple[Hashable, Dict[str, float], str]],
+    market_signals: Dict[str, Any],
+) -> Iterator[Tuple[Hashable, List[Dict[str, Any]]]]:
+    """
+    ``run_dynamic_pipeline`` for many ``(client_id, allocation, risk_profile)``
+    rows, yielded as ``(client_id, recommendations)`` in input order.
+
+    The universe snapshot is pinned for the whole batch and scored once for
+    the signal state. Risk matching is shared per risk bucket through the
+    category index, and clients with the same risk profile and active asset
+    classes share one recommendation build.
+    """
+    version, universe = get_fund_universe_store().snapshot()
+    if universe is None or universe.empty:
+        for client_id, _, _ in clients:
+            yield client_id, []
+        return
+
+    _ranked_universe(version, universe, market_signals)
+    groups: Dict[Hashable, CachedResult] = {}
+    for client_id, allocation_weights, risk_profile in clients:
+        yield client_id, _recommend(version, universe, allocation_weights, risk_profile, market_signals, groups)
+
+
+def _recommend(
+    version: Optional[str],
+    universe: pd.DataFrame,
+    allocation_weights: Dict[str, float],
+    risk_profile: str,
+    market_signals: Dict[str, Any],
+    groups: Optional[Dict[Hashable, CachedResult]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Memoized per (universe version, signals fingerprint, risk profile,
+    active asset classes). Weights only decide which asset classes are
+    active and are echoed back, so each copy is stamped with the caller's.
+    ``groups`` is a batch-local memo checked before the shared LRU.
+    """
+    active = tuple(asset_class for asset_class, weight in allocation_weights.items() if weight > 0)
+    key = (_signal_fingerprint(market_signals), risk_profile, active)
+
+    cached = groups.get(key) if groups is not None else None
+    if cached is None:
+        cached = _RESULTS.get(version, key)
+        if cached is None:
+            cached = tuple(
+                (asset_class, MappingProxyType(recommendation))
+                for asset_class, recommendation in _build_recommendations(
+                    version, universe, active, risk_profile, market_signals
+                )
+            )
+            _RESULTS.put(version, key, cached)
+        if groups is not None:
+            groups[key] = cached
+    return [
+        {**recommendation, "allocation_weight": allocation_weights[asset_class]}
+        for asset_class, recommendation in cached
+    ]
+
+
+def _build_recommendations(
+    version: Optional[str],
+    universe: pd.DataFrame,
+    asset_classes: Tuple[str, ...],
+    risk_profile: str,
+    market_signals: Dict[str, Any],
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Steps 1-6 of ``run_dynamic_pipeline`` for the active asset classes."""
+    # 1-3. Load, quality-filter and score (memoized per universe version and signal regime)
+    df, index, score_column = _ranked_universe(version, universe, market_signals)
+
+    # 4. Filter by User Risk strictly (whole categories, so it narrows the index)
+    allows_risk = risk_category_rule(risk_profile)
+    bucket = risk_bucket(risk_profile)
+    if not len(index.rows(allows_risk, key=("*", bucket))):
         logger.warning(f"No funds survived filtering for risk: {risk_profile}")
         return []
 
     # 5. Diversification Engine & Allocation Mapping
     # Match the MPT desired asset classes (Equity - Large Cap, Debt, Gold) to dataset categories
     recommendations = []
+    selected = set()
     
-    # Sort the global dataframe by score highest first
-    df = df.sort_values(by="score", ascending=False)
-    
-    for asset_class, weight in allocation_weights.items():
-        if weight <= 0:
+    for asset_class in asset_classes:
+        targets = _target_categories(asset_class)
+        if not targets:
             continue
-            
-        target_cats = set()
-        ac_lower = asset_class.lower()
-        if "equity" in ac_lower:
-            if "large cap" in ac_lower: target_cats = {"Large Cap"}
-            elif "flexi" in ac_lower: target_cats = {"Flexi"}
-            elif "small" in ac_lower: target_cats = {"Small Cap"}
-            elif "mid" in ac_lower: target_cats = {"Mid Cap"}
-            elif "hybrid" in ac_lower: target_cats = {"Hybrid"}
-            else: target_cats = {"Large Cap", "Flexi"}
-        elif "debt" in ac_lower:
-            target_cats = {"Debt", "Liquid"}
-        elif "gold" in ac_lower:
-            target_cats = {"Gold", "Commodity"}
-
-        matched = df[df["category"].str.lower().apply(lambda x: any(t.lower() in x for t in target_cats))]
-        
-        if matched.empty:
+        candidates = index.rows(
+            lambda cat: allows_risk(cat) and any(t in cat for t in targets),
+            key=(targets, bucket),
+        )
+        # Ensure we pick the absolute best scoring fund not already recommended.
+        picked = index.top_k(candidates, 1, exclude=selected)
+        if not len(picked):
             continue
-            
-        # Diversification Rule: max 2 funds per category block.
-        # Ensure we pick the absolute best scoring fund.
-        top_fund = matched.iloc[0].to_dict()
+
+        top_fund = df.iloc[int(picked[0])].to_dict()
+        top_fund["score"] = top_fund[score_column]
+        selected.add(index.keys[int(picked[0])])
+        selected.update(_share_class_variants(index.keys[int(picked[0])]))
         
         # 6. Explanation Engine & Confidence Calculation
-        score = top_fund.get("score", 0.0)
+        score = _metric(top_fund, "score")
         
         if score > 80: confidence = "High"
         elif score > 50: confidence = "Medium"
@@ -129,12 +318,13 @@ def run_dynamic_pipeline(
 
         recommendation = {
             "name": top_fund.get("scheme_name", "Unknown Fund"),
+            "scheme_code": top_fund.get("scheme_code"),
             "category": top_fund.get("category", "N/A"),
             "risk": risk_profile,
-            "allocation_weight": weight,
-            "1y": top_fund.get("1y", 0.0),
-            "3y": top_fund.get("3y", 0.0),
-            "5y": top_fund.get("5y", 0.0),
+            "allocation_weight": None,  # stamped per caller
+            "1y": _metric(top_fund, "1y"),
+            "3y": _metric(top_fund, "3y"),
+            "5y": _metric(top_fund, "5y"),
             "score": score,
             "confidence": confidence,
             "reason": (
@@ -142,14 +332,14 @@ def run_dynamic_pipeline(
                 f"It matches your {risk_profile} risk profile with consistent historical returns and {vol_str} volatility. "
                 f"{market_reason}"
             ),
-            "nav": top_fund.get("nav", 0.0), # legacy support
+            "nav": _metric(top_fund, "nav"), # legacy support
             "date": top_fund.get("date", "N/A"), # legacy support
-            "volatility": top_fund.get("volatility", 0.0), # legacy support
-            "sharpe": top_fund.get("sharpe", 0.0), # legacy support
+            "volatility": _metric(top_fund, "volatility"), # legacy support
+            "sharpe": _metric(top_fund, "sharpe"), # legacy support
             "fund_type": top_fund.get("fund_type", infer_fund_type(top_fund.get("scheme_name", ""))),
             "market_reason": market_reason,
             "market_fit_reason": market_reason,
         }
-        recommendations.append(enrich_with_benchmark_metrics(recommendation))
+        recommendations.append((asset_class, enrich_with_benchmark_metrics(recommendation)))
 
     return recommendations
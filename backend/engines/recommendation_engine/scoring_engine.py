@@ -4,24 +4,64 @@ backend/engines/recommendation_engine/scoring_engine.py
 Multi-factor scoring engine to rank funds and adjust for market signals.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
-def score_funds(df: pd.DataFrame, signals: Dict[str, Any]) -> pd.DataFrame:
+from .category_lookup import category_column, map_categories
+
+MARKET_TRENDS = ("bullish", "bearish", "neutral")
+VOLATILITY_LEVELS = ("low", "medium", "high")
+Regime = Tuple[str, str]
+REGIMES: Tuple[Regime, ...] = tuple((t, v) for t in MARKET_TRENDS for v in VOLATILITY_LEVELS)
+
+
+def market_fit(cat: str, market_trend: str, market_volatility: str) -> float:
+    """Market fit in [0, 1] of a (lowercased) category under the given regime."""
+    fit = 0.5  # Base neutral fit (50%)
+
+    # Trend adjustments
+    if market_trend == "bearish":
+        if "large cap" in cat: fit += 0.3
+        if "small cap" in cat: fit -= 0.3
+        if "mid cap" in cat: fit -= 0.1
+    elif market_trend == "bullish":
+        if "flexi" in cat: fit += 0.2
+        if "mid cap" in cat: fit += 0.2
+        if "small cap" in cat: fit += 0.3
+        if "debt" in cat: fit -= 0.2
+
+    # Volatility adjustments
+    if market_volatility == "high":
+        if "debt" in cat or "hybrid" in cat: fit += 0.3
+        if "equity" in cat or "small cap" in cat: fit -= 0.2
+
+    return max(0.0, min(1.0, fit)) # clamp between 0 and 1
+
+
+def signal_regime(signals: Dict[str, Any]) -> Regime:
     """
-    Apply multi-factor scoring and market-aware adjustments.
-    Filters:
-     - 0.25 * 1Y
-     - 0.25 * 3Y
-     - 0.20 * 5Y
-     - 0.15 * Consistency
-     - 0.15 * Market fit
+    The discrete ``(market_trend, volatility)`` pair that scoring depends on.
+    ``market_fit`` only distinguishes the values in ``MARKET_TRENDS`` /
+    ``VOLATILITY_LEVELS``; anything else scores like neutral / medium.
     """
-    if df.empty:
-        return df
-        
-    df = df.copy()
+    trend = str(signals.get("market_trend") or "neutral").lower()
+    volatility = str(signals.get("volatility") or "medium").lower()
+    return (
+        trend if trend in MARKET_TRENDS else "neutral",
+        volatility if volatility in VOLATILITY_LEVELS else "medium",
+    )
+
 
+def regime_score_column(regime: Regime) -> str:
+    return f"score_{regime[0]}_{regime[1]}"
+
+
+def _static_score(df: pd.DataFrame) -> pd.Series:
+    """
+    The signal-independent part of the score (returns and consistency).
+    Adds ``consistency_score`` to ``df``.
+    """
     # 1. Feature Engineering: Consistency Score
     # Lower volatility = higher consistency
     # Adding 1.0 to avoid division by zero
@@ -39,44 +79,67 @@ def score_funds(df: pd.DataFrame, signals: Dict[str, Any]) -> pd.DataFrame:
     n_1y = normalize(df.get("1y", pd.Series(0, index=df.index)), 0.60)
     n_3y = normalize(df.get("3y", pd.Series(0, index=df.index)), 0.40)
     n_5y = normalize(df.get("5y", pd.Series(0, index=df.index)), 0.25)
-    
-    # 2. Market Fit Score
-    market_trend = signals.get("market_trend", "neutral").lower()
-    market_volatility = signals.get("volatility", "medium").lower()
 
-    def calculate_market_fit(row) -> float:
-        cat = str(row.get("category", "")).lower()
-        fit = 0.5  # Base neutral fit (50%)
-        
-        # Trend adjustments
-        if market_trend == "bearish":
-            if "large cap" in cat: fit += 0.3
-            if "small cap" in cat: fit -= 0.3
-            if "mid cap" in cat: fit -= 0.1
-        elif market_trend == "bullish":
-            if "flexi" in cat: fit += 0.2
-            if "mid cap" in cat: fit += 0.2
-            if "small cap" in cat: fit += 0.3
-            if "debt" in cat: fit -= 0.2
-
-        # Volatility adjustments
-        if market_volatility == "high":
-            if "debt" in cat or "hybrid" in cat: fit += 0.3
-            if "equity" in cat or "small cap" in cat: fit -= 0.2
-            
-        return max(0.0, min(1.0, fit)) # clamp between 0 and 1
-        
-    df["market_fit"] = df.apply(calculate_market_fit, axis=1)
-    
-    # 3. Final Multi-Factor Score (0 to 100)
-    df["score"] = (
+    return (
         (0.25 * n_1y) +
         (0.25 * n_3y) +
         (0.20 * n_5y) +
-        (0.15 * df["consistency_score"]) +
-        (0.15 * df["market_fit"])
-    ) * 100.0
-    
-    df["score"] = df["score"].fillna(0).round(2)
+        (0.15 * df["consistency_score"])
+    )
+
+
+def _market_fit_column(df: pd.DataFrame, regime: Regime) -> np.ndarray:
+    market_trend, market_volatility = regime
+    return map_categories(
+        category_column(df),
+        lambda cat: market_fit(cat, market_trend, market_volatility),
+        dtype=np.float64,
+    )
+
+
+def _final_score(static: pd.Series, fit) -> pd.Series:
+    # Final Multi-Factor Score (0 to 100)
+    return ((static + (0.15 * fit)) * 100.0).fillna(0).round(2)
+
+
+def score_funds(df: pd.DataFrame, signals: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Apply multi-factor scoring and market-aware adjustments.
+    Filters:
+     - 0.25 * 1Y
+     - 0.25 * 3Y
+     - 0.20 * 5Y
+     - 0.15 * Consistency
+     - 0.15 * Market fit
+    """
+    if df.empty:
+        return df
+        
+    df = df.copy()
+    static = _static_score(df)
+
+    # 2. Market Fit Score
+    df["market_fit"] = _market_fit_column(df, signal_regime(signals))
+
+    # 3. Final Multi-Factor Score (0 to 100)
+    df["score"] = _final_score(static, df["market_fit"])
     
     return df
+
+
+def score_all_regimes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy of ``df`` with one score column per signal regime
+    (``regime_score_column``), all nine sharing the static part. A request
+    then selects its regime's column instead of rescoring.
+    """
+    df = df.copy()
+    if df.empty:
+        for regime in REGIMES:
+            df[regime_score_column(regime)] = pd.Series(dtype=np.float64)
+        return df
+
+    static = _static_score(df)
+    for regime in REGIMES:
+        df[regime_score_column(regime)] = _final_score(static, _market_fit_column(df, regime))
+    return df
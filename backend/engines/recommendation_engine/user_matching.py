@@ -4,40 +4,46 @@ backend/engines/recommendation_engine/user_matching.py
 Align recommendations strictly with user risk appetite.
 """
 
+from typing import Callable
+
 import pandas as pd
 
-def apply_user_matching(df: pd.DataFrame, risk_profile: str) -> pd.DataFrame:
-    """
-    Filter the fund universe to strictly match the user's overall risk profile.
-    Penalize mismatches heavily if they happen to squeak by category matching.
-    """
-    if df.empty:
-        return df
-        
-    risk_level = risk_profile.lower()
-    
-    # Ensure all funds conform to the user risk bounding
-    # LOW risk: allow only debt, hybrid, large_cap
-    # MODERATE risk: allow large, flexi, index
-    # HIGH risk: mid, small, thematic
-    
-    allowed_categories = set()
-    penalized_categories = set()
-    
+from .category_lookup import category_column, map_categories
+
+# Ensure all funds conform to the user risk bounding
+# LOW risk: allow only debt, hybrid, large_cap
+# MODERATE risk: allow large, flexi, index
+# HIGH risk: mid, small, thematic
+# bucket → (allowed categories, penalized categories); empty allowed = no restriction
+_RISK_RULES = {
+    "conservative": (
+        {"debt", "hybrid", "liquid", "large cap"},
+        {"small cap", "mid cap", "sectoral", "thematic"},
+    ),
+    "moderate": (
+        {"large cap", "flexi", "multi cap", "hybrid", "debt"},
+        {"small cap", "sectoral"},
+    ),
+    # Aggressive users can buy anything, but prioritize alpha
+    "aggressive": (set(), set()),
+}
+
+
+def risk_bucket(risk_profile: str) -> str:
+    """Normalize a free-text risk profile to one of the ``_RISK_RULES`` buckets."""
+    risk_level = str(risk_profile).lower()
     if "conservative" in risk_level or "low" in risk_level:
-        allowed_categories = {"debt", "hybrid", "liquid", "large cap"}
-        penalized_categories = {"small cap", "mid cap", "sectoral", "thematic"}
-    elif "moderate" in risk_level:
-        allowed_categories = {"large cap", "flexi", "multi cap", "hybrid", "debt"}
-        penalized_categories = {"small cap", "sectoral"}
-    elif "aggressive" in risk_level or "high" in risk_level:
-        # Aggressive users can buy anything, but prioritize alpha
-        allowed_categories = set() # empty set means no restriction
-        pass
-        
-    def check_match(row) -> bool:
-        cat = str(row.get("category", "")).lower()
-        
+        return "conservative"
+    if "moderate" in risk_level:
+        return "moderate"
+    return "aggressive"
+
+
+def risk_category_rule(risk_profile: str) -> Callable[[str], bool]:
+    """Predicate over a lowercased category: may this risk profile hold it?"""
+    allowed_categories, penalized_categories = _RISK_RULES[risk_bucket(risk_profile)]
+
+    def check_match(cat: str) -> bool:
         # Hard exclusions
         for p in penalized_categories:
             if p in cat:
@@ -51,7 +57,19 @@ def apply_user_matching(df: pd.DataFrame, risk_profile: str) -> pd.DataFrame:
                 
         return True
 
-    matched_mask = df.apply(check_match, axis=1)
+    return check_match
+
+
+def apply_user_matching(df: pd.DataFrame, risk_profile: str) -> pd.DataFrame:
+    """
+    Filter the fund universe to strictly match the user's overall risk profile.
+    Penalize mismatches heavily if they happen to squeak by category matching.
+    """
+    if df.empty:
+        return df
+
+    # Evaluated once per distinct category, then gathered back onto the rows
+    matched_mask = map_categories(category_column(df), risk_category_rule(risk_profile), dtype=bool)
     df = df[matched_mask].copy()
     
     return df
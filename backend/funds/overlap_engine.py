@@ -6,11 +6,20 @@ def calculate_overlap(a, b):
     return round(len(set_a & set_b) / len(set_a | set_b) * 100, 1)
 
 
-def eliminate_overlapping_funds(funds, threshold=40):
+def eliminate_overlapping_funds(funds, threshold=40, approximate=False):
+    """
+    Greedily keep the best-scored funds, dropping any whose holdings overlap
+    an already kept fund by more than ``threshold`` %. ``approximate=True``
+    compares each fund only against kept funds that share a MinHash LSH band
+    with it (sub-quadratic for large screens; a rare borderline pair may be
+    missed).
+    """
     if not funds:
         return []
 
     funds = sorted(funds, key=lambda x: x.get("ai_score", 0), reverse=True)
+    if approximate:
+        return _eliminate_with_index(funds, threshold)
 
     result = []
 
@@ -30,6 +39,32 @@ def eliminate_overlapping_funds(funds, threshold=40):
     return result
 
 
+def _eliminate_with_index(funds, threshold):
+    from backend.engines.intelligence.minhash_index import MinHashIndex
+
+    holdings = [set(f.get("top_holdings", [])) for f in funds]
+    # Band layout tuned below the cut-off and towards recall: an extra
+    # candidate only costs one exact check, a missed one keeps a duplicate
+    index = MinHashIndex.from_token_sets(
+        dict(enumerate(holdings)), threshold=0.8 * threshold / 100, false_positive_weight=0.2
+    )
+
+    kept = set()
+    result = []
+    for i, fund in enumerate(funds):
+        keep = True
+        for j in index.candidates(index.signatures[i]).tolist():
+            if j in kept and calculate_overlap(holdings[i], holdings[j]) > threshold:
+                keep = False
+                break
+
+        if keep:
+            kept.add(i)
+            result.append(fund)
+
+    return result
+
+
 def analyze_portfolio_overlap(funds, threshold=30):
     if len(funds) < 2:
         return {"valid": False, "message": "Need at least 2 funds"}
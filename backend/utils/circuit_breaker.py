@@ -0,0 +1,299 @@
+"""
+backend/utils/circuit_breaker.py
+────────────────────────────────
+Shared retry policy and per-source circuit breakers for external data
+providers (AMFI, FRED, FBIL, Yahoo Finance).
+
+Every provider call goes through ``get_breaker(name).call(...)``:
+
+  CLOSED     calls pass through; ``RetryPolicy`` retries transient failures.
+  OPEN       after ``failure_threshold`` consecutive failures calls fail fast
+             with ``CircuitOpenError`` — no request, no backoff sleep.
+  HALF_OPEN  once ``reset_timeout`` has elapsed a single probe runs (in a
+             background thread when the breaker has a probe function,
+             otherwise the next caller is let through as the trial). Success
+             closes the circuit, failure re-opens it.
+
+Each breaker also keeps per-source latency and error counters, exposed via
+``source_health()``.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"circuit for {name!r} is open (retry in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter, bounded by an attempt count and a total budget."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        initial_backoff: float = 2.0,
+        multiplier: float = 2.0,
+        max_backoff: float = 10.0,
+        max_elapsed: Optional[float] = None,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.initial_backoff = initial_backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.retry_on = retry_on
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number ``attempt + 1`` (attempt is 0-based)."""
+        delay = min(self.initial_backoff * (self.multiplier ** attempt), self.max_backoff)
+        return delay * random.uniform(0.8, 1.2)
+
+
+DEFAULT_POLICY = RetryPolicy()
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 60.0,
+        probe: Optional[Callable[[], Any]] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._probing = False
+        self._stats: Dict[str, Any] = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "short_circuited": 0,
+            "latency_ms_total": 0.0,
+            "latency_ms_max": 0.0,
+            "last_latency_ms": None,
+            "last_error": None,
+            "last_failure_at": None,
+        }
+
+    # ── State ────────────────────────────────────────────────────────────────
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _retry_in(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """
+        True if a call may go to the provider now. While open, the first
+        check after ``reset_timeout`` moves to half-open and either starts the
+        background probe or admits this caller as the single trial.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._retry_in() == 0.0:
+                self._state = HALF_OPEN
+                if self.probe is not None:
+                    self._start_probe()
+                    return False
+                self._probing = True
+                return True
+            return False
+
+    def _start_probe(self) -> None:
+        if self._probing:
+            return
+        self._probing = True
+        threading.Thread(target=self._run_probe, name=f"probe-{self.name}", daemon=True).start()
+
+    def _run_probe(self) -> None:
+        started = time.monotonic()
+        try:
+            self.probe()
+        except Exception as exc:
+            self.record_failure(exc, time.monotonic() - started)
+        else:
+            self.record_success(time.monotonic() - started)
+
+    def record_success(self, elapsed: float) -> None:
+        with self._lock:
+            self._record_latency(elapsed)
+            self._stats["successes"] += 1
+            self._consecutive_failures = 0
+            self._probing = False
+            if self._state != CLOSED:
+                logger.info("[CircuitBreaker] %s recovered — circuit closed", self.name)
+            self._state = CLOSED
+
+    def record_failure(self, exc: BaseException, elapsed: float) -> None:
+        with self._lock:
+            self._record_latency(elapsed)
+            self._stats["failures"] += 1
+            self._stats["last_error"] = f"{type(exc).__name__}: {exc}"
+            self._stats["last_failure_at"] = time.time()
+            self._consecutive_failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(
+                        "[CircuitBreaker] %s opened after %d consecutive failures: %s",
+                        self.name, self._consecutive_failures, exc,
+                    )
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def _record_latency(self, elapsed: float) -> None:
+        ms = elapsed * 1000.0
+        self._stats["calls"] += 1
+        self._stats["latency_ms_total"] += ms
+        self._stats["latency_ms_max"] = max(self._stats["latency_ms_max"], ms)
+        self._stats["last_latency_ms"] = round(ms, 1)
+
+    # ── Calls ────────────────────────────────────────────────────────────────
+
+    def call(self, func: Callable[..., Any], *args, policy: RetryPolicy = DEFAULT_POLICY, **kwargs) -> Any:
+        """
+        Run ``func`` under this breaker with ``policy`` retries.
+
+        Raises ``CircuitOpenError`` without calling ``func`` while the circuit
+        is open, and stops retrying as soon as the circuit opens. Exceptions
+        outside ``policy.retry_on`` (e.g. parse errors) propagate at once; the
+        provider did answer, so they count as a success for the circuit.
+        """
+        if not self.allow():
+            with self._lock:
+                self._stats["short_circuited"] += 1
+            raise CircuitOpenError(self.name, self._retry_in())
+
+        started = time.monotonic()
+        for attempt in range(policy.max_attempts):
+            attempt_started = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except policy.retry_on as exc:
+                self.record_failure(exc, time.monotonic() - attempt_started)
+                if self._state == OPEN:
+                    raise
+                if attempt == policy.max_attempts - 1:
+                    logger.error("[CircuitBreaker] %s: all %d attempts failed: %s", self.name, policy.max_attempts, exc)
+                    raise
+                wait_time = policy.backoff(attempt)
+                if policy.max_elapsed is not None and time.monotonic() - started + wait_time > policy.max_elapsed:
+                    raise
+                logger.warning(
+                    "[CircuitBreaker] %s attempt %d failed: %s. Retrying in %.1fs...",
+                    self.name, attempt + 1, exc, wait_time,
+                )
+                with self._lock:
+                    self._stats["retries"] += 1
+                time.sleep(wait_time)
+            except Exception:
+                self.record_success(time.monotonic() - attempt_started)
+                raise
+            else:
+                self.record_success(time.monotonic() - attempt_started)
+                return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probing = False
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            total_ms = stats.pop("latency_ms_total")
+            stats["latency_ms_avg"] = round(total_ms / stats["calls"], 1) if stats["calls"] else None
+            stats["latency_ms_max"] = round(stats["latency_ms_max"], 1)
+            stats["state"] = self._state
+            stats["consecutive_failures"] = self._consecutive_failures
+            stats["retry_in_s"] = round(self._retry_in(), 1) if self._state == OPEN else 0.0
+            return stats
+
+
+# ── Registry ────────────────────────────────────────────────────────────────
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_breaker(name: str, **options) -> CircuitBreaker:
+    """Process-wide breaker for ``name``; ``options`` apply only on first creation."""
+    with _REGISTRY_LOCK:
+        breaker = _BREAKERS.get(name)
+        if breaker is None:
+            breaker = _BREAKERS[name] = CircuitBreaker(name, **options)
+        return breaker
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).hostname or url
+
+
+def breaker_for_url(url: str, **options) -> CircuitBreaker:
+    """Breaker keyed by the URL's host, with a lightweight HEAD probe."""
+    parsed = urlparse(url)
+    host = parsed.hostname or url
+    if "probe" not in options and parsed.scheme and parsed.hostname:
+        root = f"{parsed.scheme}://{parsed.netloc}/"
+
+        def _probe():
+            import requests
+
+            resp = requests.head(root, timeout=5, allow_redirects=True)
+            # Only a 2xx/3xx answer counts as recovered
+            if resp.status_code >= 400:
+                raise requests.HTTPError(f"{resp.status_code} from {root}")
+
+        options["probe"] = _probe
+    return get_breaker(host, **options)
+
+
+def yahoo_breaker(ticker: str, **options) -> CircuitBreaker:
+    """
+    Breaker for one Yahoo Finance ticker. Keyed per ticker so a delisted or
+    mistyped symbol, which fails every retry, cannot open the circuit for
+    every other ticker.
+    """
+    return get_breaker(f"yfinance:{ticker}", **options)
+
+
+def source_health() -> Dict[str, Dict[str, Any]]:
+    """Latency / error counters and circuit state for every source seen so far."""
+    with _REGISTRY_LOCK:
+        breakers = list(_BREAKERS.values())
+    return {b.name: b.health() for b in breakers}
+
+
+def reset_breakers() -> None:
+    """Forget all breakers (tests, or after a known provider outage is fixed)."""
+    with _REGISTRY_LOCK:
+        _BREAKERS.clear()
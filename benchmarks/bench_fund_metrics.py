@@ -0,0 +1,98 @@
+"""
+benchmarks/bench_fund_metrics.py
+────────────────────────────────
+Times the vectorised per-scheme metrics engine on a full-universe sized
+NAV matrix (every scheme in ai_agents/data/mutual_funds.csv × 5 years of
+trading days) and compares it with a per-scheme pandas loop on a sample.
+
+Run: python benchmarks/bench_fund_metrics.py [--schemes N] [--days N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.engines.fund_metrics_engine import (  # noqa: E402
+    RunningMetrics,
+    SETTLE_DAYS,
+    TRADING_DAYS,
+    compute_universe_metrics,
+    running_universe_metrics,
+)
+
+FUNDS_CSV = os.path.join(os.path.dirname(__file__), "..", "ai_agents", "data", "mutual_funds.csv")
+
+
+def _synthetic_navs(n_days: int, n_schemes: int, seed: int = 7) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    dates = np.busday_offset(np.datetime64("2026-03-23"), -np.arange(n_days)[::-1], roll="backward")
+    drift = rng.uniform(0.0, 0.0008, n_schemes)
+    vol = rng.uniform(0.001, 0.02, n_schemes)
+    log_ret = rng.normal(drift, vol, size=(n_days, n_schemes))
+    navs = (10.0 * np.exp(np.cumsum(log_ret, axis=0))).astype(np.float32)
+    # Young schemes and holiday gaps
+    starts = rng.integers(0, n_days // 2, n_schemes) * (rng.random(n_schemes) < 0.3)
+    navs[np.arange(n_days)[:, None] < starts] = np.nan
+    navs[rng.random((n_days, n_schemes)) < 0.01] = np.nan
+    return dates.astype("datetime64[D]"), navs
+
+
+def _pandas_loop(dates: np.ndarray, navs: np.ndarray, sample: int) -> None:
+    index = pd.DatetimeIndex(dates)
+    for col in range(sample):
+        prices = pd.Series(navs[:, col], index=index).dropna()
+        if len(prices) < 2:
+            continue
+        returns = prices.pct_change().dropna()
+        _ = returns.std() * np.sqrt(TRADING_DAYS)
+        _ = (prices / prices.cummax() - 1).min()
+        for years in (1, 3, 5):
+            past = prices.asof(index[-1] - pd.Timedelta(days=365 * years))
+            if pd.notna(past):
+                _ = (prices.iloc[-1] / past) ** (1 / years) - 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    default_schemes = len(pd.read_csv(FUNDS_CSV, usecols=["scheme_code"])) if os.path.exists(FUNDS_CSV) else 14327
+    parser.add_argument("--schemes", type=int, default=default_schemes)
+    parser.add_argument("--days", type=int, default=TRADING_DAYS * 5)
+    parser.add_argument("--loop-sample", type=int, default=500)
+    args = parser.parse_args()
+
+    dates, navs = _synthetic_navs(args.days, args.schemes)
+    print(f"NAV matrix: {args.days} dates × {args.schemes} schemes ({navs.nbytes / 1e6:.1f} MB float32)")
+
+    start = time.perf_counter()
+    metrics = compute_universe_metrics(dates, navs)
+    batch_s = time.perf_counter() - start
+    print(f"compute_universe_metrics      : {batch_s * 1000:8.1f} ms for all schemes")
+
+    start = time.perf_counter()
+    _pandas_loop(dates, navs, args.loop_sample)
+    loop_s = (time.perf_counter() - start) / args.loop_sample * args.schemes
+    print(f"per-scheme pandas loop (est.) : {loop_s * 1000:8.1f} ms ({loop_s / batch_s:.0f}x slower)")
+
+    state = RunningMetrics.from_history(navs[:-1])
+    start = time.perf_counter()
+    state.update(navs[-1])
+    state.snapshot(metrics["3y"])
+    print(f"RunningMetrics daily update   : {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    settled = RunningMetrics.from_history(navs[:-SETTLE_DAYS])
+    start = time.perf_counter()
+    running_universe_metrics(dates, navs, settled)
+    print(f"running_universe_metrics      : {(time.perf_counter() - start) * 1000:8.1f} ms (unsettled tail folded)")
+
+    covered = np.isfinite(metrics["1y"]).sum()
+    print(f"schemes with a 1Y return      : {covered}/{args.schemes}")
+
+
+if __name__ == "__main__":
+    main()
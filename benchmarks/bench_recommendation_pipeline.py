@@ -0,0 +1,117 @@
+"""
+benchmarks/bench_recommendation_pipeline.py
+───────────────────────────────────────────
+Times the per-fund passes of the dynamic recommendation pipeline on the real
+fund universe (ai_agents/data/mutual_funds.csv): market fit, user risk
+matching and fund-type inference, each as the previous row-wise
+``DataFrame.apply`` versus the per-category lookup tables / vectorised masks.
+Fund type is now derived once per snapshot by the universe store, so its
+per-request cost is a column read; the one-off load cost is printed too.
+Results are checked for equality before timings are printed. Finally a
+batch of synthetic clients goes through suggest_mutual_funds_batch and its
+throughput is reported in clients per second.
+
+Run: python benchmarks/bench_recommendation_pipeline.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.data.benchmark_indices import infer_fund_type, infer_fund_types  # noqa: E402
+from backend.data.fund_universe_store import FundUniverseStore  # noqa: E402
+from backend.engines.recommendation_engine import suggest_mutual_funds_batch  # noqa: E402
+from backend.engines.recommendation_engine.category_lookup import map_categories  # noqa: E402
+from backend.engines.recommendation_engine.dynamic_recommender import run_dynamic_pipeline  # noqa: E402
+from backend.engines.recommendation_engine.scoring_engine import market_fit  # noqa: E402
+from backend.engines.recommendation_engine.user_matching import apply_user_matching  # noqa: E402
+
+FUNDS_CSV = os.path.join(os.path.dirname(__file__), "..", "ai_agents", "data", "mutual_funds.csv")
+SIGNALS = {"market_trend": "bullish", "volatility": "high"}
+ALLOCATION = {"Equity - Large Cap": 0.4, "Equity - Mid Cap": 0.2, "Debt": 0.3, "Gold": 0.1}
+
+_ALLOWED = {"large cap", "flexi", "multi cap", "hybrid", "debt"}
+_PENALIZED = {"small cap", "sectoral"}
+
+
+def _row_market_fit(df: pd.DataFrame) -> np.ndarray:
+    return df.apply(lambda row: market_fit(str(row.get("category", "")).lower(), "bullish", "high"), axis=1).to_numpy()
+
+
+def _row_user_match(df: pd.DataFrame) -> np.ndarray:
+    def check(row) -> bool:
+        cat = str(row.get("category", "")).lower()
+        return not any(p in cat for p in _PENALIZED) and any(a in cat for a in _ALLOWED)
+
+    return df.apply(check, axis=1).to_numpy(dtype=bool)
+
+
+def _timed(func, repeat: int) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--clients", type=int, default=5000)
+    args = parser.parse_args()
+
+    df = FundUniverseStore(FUNDS_CSV).frame()
+    if df is None:
+        sys.exit(f"{FUNDS_CSV} not found — run the fund data agent first")
+    print(f"Fund universe: {len(df)} funds, {df['category'].nunique()} categories")
+
+    cases = [
+        (
+            "market fit",
+            lambda: _row_market_fit(df),
+            lambda: map_categories(df["category"], lambda c: market_fit(c, "bullish", "high"), dtype=np.float64),
+        ),
+        (
+            "user matching",
+            lambda: _row_user_match(df),
+            lambda: df.index.isin(apply_user_matching(df, "Moderate").index),
+        ),
+        (
+            "fund type",
+            lambda: df["scheme_name"].apply(infer_fund_type).to_numpy(),
+            lambda: df["fund_type"].to_numpy(),
+        ),
+    ]
+    for label, row_wise, vectorised in cases:
+        row_s, expected = _timed(row_wise, args.repeat)
+        vec_s, actual = _timed(vectorised, args.repeat)
+        assert np.array_equal(np.asarray(expected), np.asarray(actual)), f"{label}: results differ"
+        print(f"{label:<14}: row-wise {row_s * 1000:8.1f} ms   vectorised {vec_s * 1000:6.1f} ms   ({row_s / vec_s:.0f}x)")
+
+    load_s, _ = _timed(lambda: infer_fund_types(df["scheme_name"]), args.repeat)
+    print(f"fund type derivation at load  : {load_s * 1000:8.1f} ms (once per snapshot)")
+
+    run_dynamic_pipeline(ALLOCATION, "Moderate", SIGNALS)  # warm the universe store
+    pipeline_s, _ = _timed(lambda: run_dynamic_pipeline(ALLOCATION, "Moderate", SIGNALS), args.repeat)
+    print(f"run_dynamic_pipeline (warm)   : {pipeline_s * 1000:8.1f} ms")
+
+    profiles = ["Conservative", "Moderate", "Aggressive"]
+    clients = [
+        (i, {**ALLOCATION, "Gold": 0.1 * (i % 2)}, profiles[i % len(profiles)]) for i in range(args.clients)
+    ]
+    stats: dict = {}
+    for _ in suggest_mutual_funds_batch(clients, market_signals=SIGNALS, stats=stats):
+        pass
+    label = f"batch of {stats['clients']} clients"
+    print(f"{label:<30}: {stats['clients_per_second']:8.0f} clients/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,32 @@
 data/cache/cache_manager.py
 ───────────────────────────
 Thread-safe file-based cache with JSON persistence.
+
+Each cache file has its own lock. Writes go to a temp file in the same
+directory and are renamed over the live file, so readers never see a torn
+write. Parsed payloads are memoized in process keyed by the file's
+(mtime_ns, size); a hit re-validates with a single ``stat`` at most every
+``_STAT_INTERVAL_SECONDS`` and never re-reads or re-parses the file.
+Returned payloads are shallow copies — treat nested values as read-only.
 """
 
 import json
 import os
+import stat
+import tempfile
 import threading
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 _CACHE_DIR = Path(__file__).parent
-_LOCK = threading.Lock()
+_STAT_INTERVAL_SECONDS = 1.0
+# An unchanged payload is not rewritten unless the file is older than this
+_REWRITE_UNCHANGED_AFTER_SECONDS = 300
 
 _MARKET_CACHE_FILE = _CACHE_DIR / "market_cache.json"
 _SIGNALS_CACHE_FILE = _CACHE_DIR / "signals_cache.json"
@@ -118,63 +130,177 @@ def _normalize_macro_data(macro: Dict) -> Dict:
 def _read_json(file_path: Path) -> Optional[Dict]:
     """Read JSON from file. Returns None if file doesn't exist or is invalid."""
     try:
-        if file_path.exists():
-            with open(file_path, "r") as f:
-                return json.load(f)
+        with open(file_path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
     except (json.JSONDecodeError, IOError) as e:
         logger.warning(f"Cache read failed for {file_path}: {e}")
     return None
 
 
+def _file_mode(file_path: Path) -> int:
+    """Permission bits of the file being replaced, or 0644 for a new file."""
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except OSError:
+        return 0o644
+
+
 def _write_json(file_path: Path, data: Dict) -> bool:
-    """Write data to JSON file. Returns True on success."""
+    """Atomically replace ``file_path`` with compact JSON. Returns True on success."""
+    tmp_path = None
     try:
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"), default=str)
+        # mkstemp creates 0600; keep the file readable by other processes/users
+        os.chmod(tmp_path, _file_mode(file_path))
+        os.replace(tmp_path, file_path)
         return True
-    except IOError as e:
+    except (IOError, OSError, TypeError, ValueError) as e:
         logger.error(f"Cache write failed for {file_path}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
         return False
 
 
-def _get_cache_age(file_path: Path) -> Optional[float]:
-    """Return cache age in seconds. None if file doesn't exist."""
-    if not file_path.exists():
-        return None
-    try:
-        mtime = os.path.getmtime(file_path)
-        return datetime.now().timestamp() - mtime
-    except OSError:
-        return None
+class _CacheFile:
+    """
+    One JSON cache file: per-file lock, atomic writes and a parse-once memo.
+    ``transform`` post-processes a freshly parsed payload once per file
+    version (e.g. macro normalization).
+    """
+
+    def __init__(self, path: Path, transform: Optional[Callable[[Dict], Dict]] = None):
+        self.path = path
+        self.transform = transform
+        self.lock = threading.Lock()
+        self._key: Optional[Tuple[int, int]] = None
+        self._mtime = 0.0
+        self._data: Optional[Dict] = None
+        self._checked_at = float("-inf")
+
+    def _stat(self) -> Optional[os.stat_result]:
+        try:
+            return os.stat(self.path)
+        except OSError:
+            return None
+
+    def _forget(self) -> None:
+        self._key, self._data = None, None
+
+    def read(self) -> Tuple[Optional[Dict], Optional[float]]:
+        """Return ``(payload, age_seconds)``; ``(None, None)`` if the file is missing."""
+        with self.lock:
+            now = time.monotonic()
+            if self._data is None or now - self._checked_at >= _STAT_INTERVAL_SECONDS:
+                st = self._stat()
+                self._checked_at = now
+                if st is None:
+                    self._forget()
+                    return None, None
+                key = (st.st_mtime_ns, st.st_size)
+                if key != self._key:
+                    data = _read_json(self.path)
+                    if data is not None and self.transform is not None:
+                        data = self.transform(data)
+                    self._key, self._mtime, self._data = key, st.st_mtime, data
+            if self._key is None:
+                return None, None
+            return self._data, datetime.now().timestamp() - self._mtime
+
+    def write(self, data: Dict, unchanged: Optional[Callable[[Dict], bool]] = None) -> bool:
+        """
+        Atomically write ``data`` and memoize it. If ``unchanged(memo)`` says
+        the memoized payload already matches and the file is recent, skip I/O.
+        """
+        with self.lock:
+            if (
+                unchanged is not None
+                and self._data is not None
+                and unchanged(self._data)
+                and datetime.now().timestamp() - self._mtime < _REWRITE_UNCHANGED_AFTER_SECONDS
+            ):
+                return True
+            if not _write_json(self.path, data):
+                self._forget()
+                return False
+            st = self._stat()
+            if st is None:
+                self._forget()
+                return False
+            self._key, self._mtime = (st.st_mtime_ns, st.st_size), st.st_mtime
+            self._data = self.transform(data) if self.transform is not None else data
+            self._checked_at = time.monotonic()
+            return True
+
+    def clear(self) -> None:
+        with self.lock:
+            try:
+                if self.path.exists():
+                    self.path.unlink()
+                    logger.info(f"Cleared cache: {self.path}")
+            except OSError as e:
+                logger.error(f"Failed to clear {self.path}: {e}")
+            self._forget()
+
+
+def _normalize_macro_entry(data: Dict) -> Dict:
+    if isinstance(data, dict) and "macro" in data:
+        data = dict(data)
+        data["macro"] = _normalize_macro_data(data["macro"])
+    return data
+
+
+_MARKET_CACHE = _CacheFile(_MARKET_CACHE_FILE)
+_SIGNALS_CACHE = _CacheFile(_SIGNALS_CACHE_FILE)
+_MACRO_CACHE = _CacheFile(_MACRO_CACHE_FILE, transform=_normalize_macro_entry)
+
+_NAMED_FILES: Dict[str, _CacheFile] = {}
+_NAMED_FILES_LOCK = threading.Lock()
+
+
+def get_cache_file(name: str) -> _CacheFile:
+    """
+    Shared ``<name>_cache.json`` handle (same lock and memo as the
+    ``save_*`` / ``load_*`` helpers for the files they manage).
+    """
+    if name == "signals":
+        return _SIGNALS_CACHE
+    if name == "macro":
+        return _MACRO_CACHE
+    with _NAMED_FILES_LOCK:
+        cache = _NAMED_FILES.get(name)
+        if cache is None:
+            cache = _NAMED_FILES[name] = _CacheFile(_CACHE_DIR / f"{name}_cache.json")
+        return cache
 
 
 def save_market_data(stats: Dict, correlation_matrix: Any = None) -> None:
     """Save market statistics to cache."""
-    with _LOCK:
-        data = {
-            "stats": stats,
-            "correlation_matrix": correlation_matrix.to_dict()
-            if correlation_matrix is not None
-            else {},
-            "cached_at": datetime.now().isoformat(timespec="seconds"),
-        }
-        _write_json(_MARKET_CACHE_FILE, data)
+    data = {
+        "stats": stats,
+        "correlation_matrix": correlation_matrix.to_dict()
+        if correlation_matrix is not None
+        else {},
+        "cached_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    if _MARKET_CACHE.write(data):
         logger.info("Market data saved to cache")
 
 
 def load_market_data(max_age_seconds: float = 3600) -> Optional[Dict]:
     """Load market data from cache if fresh enough. Returns None if expired/missing."""
-    with _LOCK:
-        age = _get_cache_age(_MARKET_CACHE_FILE)
-        if age is not None and age <= max_age_seconds:
-            data = _read_json(_MARKET_CACHE_FILE)
-            if data:
-                logger.info(f"Market data loaded from cache (age: {age:.0f}s)")
-                return data
-
-        if age is not None:
-            logger.info(f"Market cache expired ({age:.0f}s old)")
-        return None
+    data, age = _MARKET_CACHE.read()
+    if age is not None and age <= max_age_seconds:
+        if data:
+            logger.debug(f"Market data loaded from cache (age: {age:.0f}s)")
+            return dict(data)
+
+    if age is not None:
+        logger.info(f"Market cache expired ({age:.0f}s old)")
+    return None
 
 
 def load_market_data_fallback() -> Dict:
@@ -187,26 +313,23 @@ def load_market_data_fallback() -> Dict:
 
 
 def save_signals(signals: Dict) -> None:
-    """Save market signals to cache."""
-    with _LOCK:
-        data = {
-            "signals": signals,
-            "cached_at": datetime.now().isoformat(timespec="seconds"),
-        }
-        _write_json(_SIGNALS_CACHE_FILE, data)
-        logger.info("Signals saved to cache")
+    """Save market signals to cache (skipped when identical to what is cached)."""
+    data = {
+        "signals": signals,
+        "cached_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    if _SIGNALS_CACHE.write(data, unchanged=lambda memo: memo.get("signals") == signals):
+        logger.debug("Signals saved to cache")
 
 
 def load_signals(max_age_seconds: float = 7200) -> Optional[Dict]:
     """Load signals from cache if fresh enough."""
-    with _LOCK:
-        age = _get_cache_age(_SIGNALS_CACHE_FILE)
-        if age is not None and age <= max_age_seconds:
-            data = _read_json(_SIGNALS_CACHE_FILE)
-            if data and "signals" in data:
-                logger.info(f"Signals loaded from cache (age: {age:.0f}s)")
-                return data["signals"]
-        return None
+    data, age = _SIGNALS_CACHE.read()
+    if age is not None and age <= max_age_seconds:
+        if data and "signals" in data:
+            logger.debug(f"Signals loaded from cache (age: {age:.0f}s)")
+            return dict(data["signals"])
+    return None
 
 
 def load_signals_fallback() -> Dict:
@@ -220,25 +343,22 @@ def load_signals_fallback() -> Dict:
 
 def save_macro_data(macro: Dict) -> None:
     """Save macro indicators to cache."""
-    with _LOCK:
-        data = {
-            "macro": _normalize_macro_data(macro),
-            "cached_at": datetime.now().isoformat(timespec="seconds"),
-        }
-        _write_json(_MACRO_CACHE_FILE, data)
+    data = {
+        "macro": _normalize_macro_data(macro),
+        "cached_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    if _MACRO_CACHE.write(data):
         logger.info("Macro data saved to cache")
 
 
 def load_macro_data(max_age_seconds: float = 43200) -> Optional[Dict]:
     """Load macro data from cache (valid for 12 hours)."""
-    with _LOCK:
-        age = _get_cache_age(_MACRO_CACHE_FILE)
-        if age is not None and age <= max_age_seconds:
-            data = _read_json(_MACRO_CACHE_FILE)
-            if data and "macro" in data:
-                logger.info(f"Macro data loaded from cache (age: {age:.0f}s)")
-                return _normalize_macro_data(data["macro"])
-        return None
+    data, age = _MACRO_CACHE.read()
+    if age is not None and age <= max_age_seconds:
+        if data and "macro" in data:
+            logger.debug(f"Macro data loaded from cache (age: {age:.0f}s)")
+            return dict(data["macro"])
+    return None
 
 
 def load_macro_fallback() -> Dict:
@@ -252,11 +372,5 @@ def load_macro_fallback() -> Dict:
 
 def clear_all_cache() -> None:
     """Clear all cache files."""
-    with _LOCK:
-        for f in [_MARKET_CACHE_FILE, _SIGNALS_CACHE_FILE, _MACRO_CACHE_FILE]:
-            try:
-                if f.exists():
-                    f.unlink()
-                    logger.info(f"Cleared cache: {f}")
-            except OSError as e:
-                logger.error(f"Failed to clear {f}: {e}")
+    for cache in (_MARKET_CACHE, _SIGNALS_CACHE, _MACRO_CACHE):
+        cache.clear()
@@ -0,0 +1,392 @@
+"""
+data/cache/tiered_cache.py
+──────────────────────────
+One cache service for market intelligence (signals, macro indicators,
+market snapshot, proxy market statistics, latest pipeline record), with
+three tiers:
+
+  L1  in-process LRU            — per-entry TTL, capped by ``L1_TTL_SECONDS``
+                                  so other processes' writes are picked up
+  L2  Redis                     — shared between the API, Celery and Streamlit
+  L3  JSON file (cache_manager) — survives restarts; last-resort stale reads
+
+Keys are versioned (``intel:v<SCHEMA_VERSION>:<name>``); bump
+``SCHEMA_VERSION`` when a payload shape changes and old entries are ignored.
+``set`` writes through all tiers; ``get`` reads the first tier that has a
+live entry and back-fills L1 from it. Per-tier hit counters are
+available from ``stats()``.
+
+Multi-section records (the latest pipeline run) use ``set_sections``
+instead: one Redis hash with a field per section plus a ``_version`` stamp,
+written in a single MULTI pipeline. Readers fetch only the sections they
+need, and a section already held in L1 at the current version is reused
+without being re-decoded; ``get_version`` is a single ``HGET``.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+SCHEMA_VERSION = 1
+KEY_PREFIX = f"intel:v{SCHEMA_VERSION}"
+
+L1_MAX_ENTRIES = 256
+L1_TTL_SECONDS = 30.0
+_REDIS_RETRY_SECONDS = 60.0
+
+# Default TTLs per cache name (seconds); L3 is only written for ``persist`` names
+DEFAULT_TTLS: Dict[str, float] = {
+    "signals": 7200,
+    "macro": 43200,
+    "market_snapshot": 3600,
+    "market_data": 3600,
+    "latest": 7200,
+}
+_DEFAULT_TTL = 3600
+PERSISTED_NAMES = frozenset({"signals", "macro", "market_snapshot", "market_data"})
+
+VERSION_FIELD = "_version"
+_COMPRESS_MIN_BYTES = 1024
+_RAW, _ZLIB = b"j", b"z"
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Compact encoding for one hash field: a one-byte codec tag followed by
+    JSON (orjson when installed), zlib-compressed for larger payloads.
+    """
+    if orjson is not None:
+        body = orjson.dumps(value, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    else:
+        body = json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+    if len(body) >= _COMPRESS_MIN_BYTES:
+        return _ZLIB + zlib.compress(body, 6)
+    return _RAW + body
+
+
+def decode_value(raw: bytes) -> Any:
+    tag, body = raw[:1], raw[1:]
+    if tag == _ZLIB:
+        body = zlib.decompress(body)
+    elif tag != _RAW:
+        raise ValueError(f"unknown cache codec tag {tag!r}")
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+class _Entry:
+    __slots__ = ("value", "version", "expires_at", "l1_expires_at")
+
+    def __init__(self, value: Any, version: int, expires_at: float, l1_expires_at: float):
+        self.value = value
+        self.version = version
+        self.expires_at = expires_at
+        self.l1_expires_at = l1_expires_at
+
+
+class TieredCache:
+    def __init__(
+        self,
+        redis_url: Optional[str] = REDIS_URL,
+        l1_max_entries: int = L1_MAX_ENTRIES,
+        l1_ttl: float = L1_TTL_SECONDS,
+        use_files: bool = True,
+    ):
+        self.redis_url = redis_url
+        self.l1_max_entries = l1_max_entries
+        self.l1_ttl = l1_ttl
+        self.use_files = use_files
+        self._l1: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_checked_at = float("-inf")
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "l3_hits": 0, "misses": 0, "sets": 0, "reused_sections": 0}
+
+    # ── Keys & tiers ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def key(name: str) -> str:
+        return f"{KEY_PREFIX}:{name}"
+
+    def _redis_client(self):
+        """Connected Redis client or None; a failed connect is retried after a pause."""
+        if self._redis is not None or self.redis_url is None:
+            return self._redis
+        now = time.monotonic()
+        if now - self._redis_checked_at < _REDIS_RETRY_SECONDS:
+            return None
+        self._redis_checked_at = now
+        try:
+            import redis
+
+            client = redis.Redis.from_url(self.redis_url, socket_connect_timeout=1, socket_timeout=1)
+            client.ping()
+            self._redis = client
+        except Exception as e:
+            logger.info(f"[TieredCache] Redis unavailable — L2 disabled for {_REDIS_RETRY_SECONDS:.0f}s ({e})")
+        return self._redis
+
+    def _drop_redis(self, e: Exception) -> None:
+        logger.warning(f"[TieredCache] Redis error, disabling L2 for now: {e}")
+        self._redis = None
+        self._redis_checked_at = time.monotonic()
+
+    @staticmethod
+    def _file(name: str):
+        from data.cache.cache_manager import get_cache_file
+
+        return get_cache_file(name)
+
+    @staticmethod
+    def _section_key(name: str, section: str) -> str:
+        return f"{name}#{section}"
+
+    def _l1_put(self, name: str, value: Any, version: int, ttl: float) -> None:
+        now = time.monotonic()
+        entry = _Entry(value, version, now + ttl, now + min(ttl, self.l1_ttl))
+        with self._lock:
+            self._l1[name] = entry
+            self._l1.move_to_end(name)
+            while len(self._l1) > self.l1_max_entries:
+                self._l1.popitem(last=False)
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def set(self, name: str, value: Any, ttl: Optional[float] = None, persist: Optional[bool] = None) -> int:
+        """Write ``value`` through L1, L2 and (for persisted names) L3. Returns its version."""
+        ttl = ttl if ttl is not None else DEFAULT_TTLS.get(name, _DEFAULT_TTL)
+        persist = name in PERSISTED_NAMES if persist is None else persist
+        version = time.time_ns()
+        self._l1_put(name, value, version, ttl)
+        with self._lock:
+            self._stats["sets"] += 1
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                payload = json.dumps({"v": version, "value": value}, separators=(",", ":"), default=str)
+                client.set(self.key(name), payload, ex=int(ttl))
+            except Exception as e:
+                self._drop_redis(e)
+
+        if persist and self.use_files:
+            envelope = {
+                name: value,
+                "version": version,
+                "cached_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            cache_file = self._file(name)
+            # The memo holds the file's transformed payload (e.g. normalised
+            # macro), so compare against the value in that same form
+            stored = cache_file.transform({name: value})[name] if cache_file.transform is not None else value
+            cache_file.write(envelope, unchanged=lambda memo: memo.get(name) == stored)
+        return version
+
+    def get_entry(self, name: str, allow_stale: bool = False) -> Tuple[Any, Optional[int]]:
+        """
+        ``(value, version)`` from the fastest tier holding a live entry, or
+        ``(None, None)``. With ``allow_stale`` an expired L3 file is accepted
+        as a last resort.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._l1.get(name)
+            if entry is not None and now < entry.l1_expires_at and now < entry.expires_at:
+                self._l1.move_to_end(name)
+                self._stats["l1_hits"] += 1
+                return entry.value, entry.version
+
+        ttl = DEFAULT_TTLS.get(name, _DEFAULT_TTL)
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw, remaining = client.pipeline().get(self.key(name)).ttl(self.key(name)).execute()
+                if raw is not None:
+                    payload = json.loads(raw)
+                    remaining = remaining if remaining and remaining > 0 else ttl
+                    self._l1_put(name, payload["value"], payload["v"], remaining)
+                    with self._lock:
+                        self._stats["l2_hits"] += 1
+                    return payload["value"], payload["v"]
+            except Exception as e:
+                self._drop_redis(e)
+
+        if self.use_files and name in PERSISTED_NAMES:
+            data, age = self._file(name).read()
+            if data and name in data and age is not None and (allow_stale or age <= ttl):
+                value, version = data[name], int(data.get("version") or 0)
+                if age <= ttl:
+                    self._l1_put(name, value, version, ttl - age)
+                with self._lock:
+                    self._stats["l3_hits"] += 1
+                return value, version
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None, None
+
+    def get(self, name: str, default: Any = None, allow_stale: bool = False) -> Any:
+        value, version = self.get_entry(name, allow_stale=allow_stale)
+        return default if version is None else value
+
+    # ── Sectioned records ────────────────────────────────────────────────────
+
+    def set_sections(self, name: str, sections: Dict[str, Any], ttl: Optional[float] = None) -> int:
+        """
+        Store ``sections`` as one hash (``<key>:fields``), replacing the previous
+        record atomically. The version comes from ``INCR <key>:version`` so it
+        is monotonic across processes. Returns the version.
+        """
+        ttl = ttl if ttl is not None else DEFAULT_TTLS.get(name, _DEFAULT_TTL)
+        version = None
+        client = self._redis_client()
+        if client is not None:
+            try:
+                fields = {section: encode_value(value) for section, value in sections.items()}
+                version = int(client.incr(self.key(f"{name}:version")))
+                fields[VERSION_FIELD] = str(version).encode()
+                hash_key = self.key(f"{name}:fields")
+                pipe = client.pipeline(transaction=True)
+                pipe.delete(hash_key)
+                pipe.hset(hash_key, mapping=fields)
+                pipe.expire(hash_key, int(ttl))
+                pipe.execute()
+            except Exception as e:
+                self._drop_redis(e)
+                version = None
+        if version is None:
+            version = time.time_ns()
+
+        for section, value in sections.items():
+            self._l1_put(self._section_key(name, section), value, version, ttl)
+        self._l1_put(self._section_key(name, VERSION_FIELD), tuple(sections), version, ttl)
+        with self._lock:
+            self._stats["sets"] += 1
+        return version
+
+    def get_version(self, name: str) -> Optional[int]:
+        """Version of the current sectioned record — one small ``HGET``, nothing decoded."""
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = client.hget(self.key(f"{name}:fields"), VERSION_FIELD)
+                return int(raw) if raw is not None else None
+            except Exception as e:
+                self._drop_redis(e)
+        with self._lock:
+            entry = self._l1.get(self._section_key(name, VERSION_FIELD))
+        if entry is not None and time.monotonic() < entry.expires_at:
+            return entry.version
+        return None
+
+    def get_sections(self, name: str, sections: Sequence[str]) -> Tuple[Dict[str, Any], Optional[int]]:
+        """
+        ``({section: value}, version)`` for the requested sections of the
+        current record, or ``({}, None)``. Sections missing from the record
+        are left out.
+        """
+        now = time.monotonic()
+        cached: Dict[str, _Entry] = {}
+        with self._lock:
+            for section in sections:
+                entry = self._l1.get(self._section_key(name, section))
+                if entry is not None and now < entry.expires_at:
+                    cached[section] = entry
+        versions = {entry.version for entry in cached.values()}
+
+        if len(cached) == len(sections) and len(versions) == 1 and all(
+            now < entry.l1_expires_at for entry in cached.values()
+        ):
+            with self._lock:
+                self._stats["l1_hits"] += 1
+            return {section: entry.value for section, entry in cached.items()}, versions.pop()
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                hash_key = self.key(f"{name}:fields")
+                raw_values, remaining = (
+                    client.pipeline().hmget(hash_key, [VERSION_FIELD, *sections]).ttl(hash_key).execute()
+                )
+                raw_version, raws = raw_values[0], raw_values[1:]
+                if raw_version is not None:
+                    version = int(raw_version)
+                    ttl = remaining if remaining and remaining > 0 else DEFAULT_TTLS.get(name, _DEFAULT_TTL)
+                    result: Dict[str, Any] = {}
+                    reused = 0
+                    for section, raw in zip(sections, raws):
+                        entry = cached.get(section)
+                        if entry is not None and entry.version == version:
+                            value = entry.value
+                            reused += 1
+                        elif raw is not None:
+                            value = decode_value(raw)
+                        else:
+                            continue
+                        result[section] = value
+                        self._l1_put(self._section_key(name, section), value, version, ttl)
+                    with self._lock:
+                        self._stats["l2_hits"] += 1
+                        self._stats["reused_sections"] += reused
+                    return result, version
+            except Exception as e:
+                self._drop_redis(e)
+        elif cached and len(versions) == 1:
+            # No shared tier to check against: L1 holds this process's own write
+            with self._lock:
+                self._stats["l1_hits"] += 1
+            return {section: entry.value for section, entry in cached.items()}, versions.pop()
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return {}, None
+
+    def get_section(self, name: str, section: str, default: Any = None) -> Any:
+        values, _ = self.get_sections(name, (section,))
+        return values.get(section, default)
+
+    def invalidate(self, name: str) -> None:
+        with self._lock:
+            self._l1.pop(name, None)
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.delete(self.key(name))
+            except Exception as e:
+                self._drop_redis(e)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["l1_entries"] = len(self._l1)
+        lookups = stats["l1_hits"] + stats["l2_hits"] + stats["l3_hits"] + stats["misses"]
+        stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 4) if lookups else None
+        stats["l1_hit_rate"] = round(stats["l1_hits"] / lookups, 4) if lookups else None
+        stats["redis"] = self._redis is not None
+        return stats
+
+
+_default_cache: Optional[TieredCache] = None
+_default_lock = threading.Lock()
+
+
+def get_intelligence_cache() -> TieredCache:
+    """Process-wide cache service instance."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = TieredCache()
+        return _default_cache
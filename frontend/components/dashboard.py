@@ -18,6 +18,7 @@ from backend.engines.recommendation_engine import (
     suggest_advanced_products,
 )
 from backend.engines.recommendation_engine import get_processed_fund_universe
+from backend.engines.recommendation_engine.category_index import index_for_frame
 try:
     from backend.api.report_generator import (
         generate_full_report,
@@ -66,6 +67,7 @@ from backend.processors.output_formatter import (
 
 # ── Real-Time AI Layer ──────────────────────────────────────────────────
 from ai_layer import get_live_intelligence
+from ai_layer.scoring_engine.fund_scoring import score_reason
 from ai_layer.scheduler.updater import start_scheduler
 
 # Start the background 15-minute data refresh once per app lifecycle
@@ -156,19 +158,19 @@ def _merge_replacements(base_funds: list[dict], replacements: dict) -> list[dict
 def _build_alternative_funds(current_fund: dict, universe_df, top_n: int = 3) -> list[dict]:
     if universe_df is None or getattr(universe_df, "empty", True):
         return []
-    same_category = universe_df[universe_df["category"] == current_fund.get("category")].copy()
-    same_category = same_category[
-        same_category["scheme_name"] != current_fund.get("name", "")
-    ].copy()
-    if same_category.empty:
-        return []
-    same_category["fund_type"] = same_category["scheme_name"].apply(infer_fund_type)
-    if EXCLUDE_ETF_FROM_ADVISORY:
-        same_category = same_category[same_category["fund_type"] != "ETF"].copy()
-    if same_category.empty:
+    index = index_for_frame(
+        universe_df,
+        "ranking_score" if "ranking_score" in universe_df.columns else "3y",
+        exclude_etf=EXCLUDE_ETF_FROM_ADVISORY,
+    )
+    rows = index.top_k(
+        index.category_rows(current_fund.get("category")),
+        top_n,
+        exclude={current_fund.get("name", "")},
+    )
+    if not len(rows):
         return []
-    sort_col = "ranking_score" if "ranking_score" in same_category.columns else "3y"
-    same_category = same_category.sort_values(by=sort_col, ascending=False).head(top_n)
+    same_category = universe_df.iloc[rows]
     alternatives = []
     for _, row in same_category.iterrows():
         candidate = enrich_with_benchmark_metrics(
@@ -1033,7 +1035,6 @@ def render_dashboard(client_data: dict):
             st.markdown("**Why was this fund selected for you?**")
             reason_dynamic = fund.get("reason", "")
             reason_xai = fund_explanations.get(fund["name"], {})
-            market_reason = fund.get("ai_reason", "")
             rationale = reason_xai.get("rationale", {})
 
             # Prefer dynamic recommender's native reason, then AI Layer's reason, then static XAI
@@ -1043,8 +1044,9 @@ def render_dashboard(client_data: dict):
                 st.markdown(f"**Risk note:** {rationale.get('risk_note', '-')}")
             elif reason_dynamic:
                 st.markdown(reason_dynamic)
-            elif market_reason:
-                st.markdown(market_reason)
+            elif "ai_reason" in fund or "market_fit_score" in fund:
+                # AI Layer ranks without reasons; render only the one shown here
+                st.markdown(fund.get("ai_reason") or score_reason(fund, signals))
             elif reason_xai.get("reason"):
                 st.markdown(reason_xai["reason"])
 
@@ -85,3 +85,94 @@ class TestApiEndpoints:
         response = client.post("/run-pipeline")
         assert response.status_code == 200
         assert response.json()["task_id"] == "mock-task-id-123"
+
+
+class TestFundDataAgent:
+
+    @staticmethod
+    def _amfi(rows):
+        import pandas as pd
+
+        return pd.DataFrame(
+            [{"scheme_code": c, "isin": f"INF{c}", "scheme_name": n, "nav": nav, "date": "24-Mar-2026", "amc": "X"}
+             for c, n, nav in rows]
+        )
+
+    @pytest.fixture
+    def sync(self, mocker, tmp_path):
+        import ai_agents.agents.fund_data_agent as module
+
+        mocker.patch.object(module, "DATA_DIR", str(tmp_path))
+        mocker.patch.object(module, "FUNDS_DATA_FILE", str(tmp_path / "mutual_funds.csv"))
+        mocker.patch.object(module, "get_nav_history_store")
+        mocker.patch.object(module, "fetch_benchmark_series")
+        mocker.patch.object(module, "publish_benchmark_analytics")
+        mocker.patch.object(module, "publish_fund_universe", return_value="v1")
+        mocker.patch.object(module, "publish_similarity_index", return_value="s1")
+
+        def fake_metrics(df):
+            for col, value in (("1y", 10.0), ("3y", 9.0), ("5y", 8.0), ("volatility", 15.0), ("sharpe", 1.0)):
+                df[col] = value
+            df["ranking_score"] = df["nav"]
+            return df.sort_values("ranking_score", ascending=False)
+
+        metrics = mocker.patch.object(module, "apply_performance_metrics", side_effect=fake_metrics)
+
+        def run(rows):
+            mocker.patch.object(module, "get_mutual_fund_universe", return_value=(self._amfi(rows), True))
+            return module.FundDataAgent.run()
+
+        return module, run, metrics
+
+    def test_enrichment_rules_are_vectorized_and_deterministic(self):
+        import pandas as pd
+        from ai_agents.agents.fund_data_agent import assign_aum, assign_expense_ratio, assign_risk
+
+        df = pd.DataFrame({
+            "scheme_code": ["1", "2", "3"],
+            "scheme_name": ["HDFC Liquid Fund", "Tiny Index Fund", "Tiny Flexi Cap Fund"],
+            "category": ["Debt", "Index", "Flexi"],
+            "volatility": [1.0, 0.1, 20.0],
+        })
+        aum = assign_aum(df)
+        assert 10000 <= aum[0] < 80000 and 100 <= aum[1] < 5000
+        er = assign_expense_ratio(df)
+        assert 0.1 <= er[0] <= 0.8 and 0.05 <= er[1] <= 0.4 and 0.5 <= er[2] <= 2.5
+        assert assign_risk(df).tolist() == ["low", "moderate", "high"]
+        # Same scheme, same values — independent of row order
+        assert assign_aum(df.iloc[::-1]).tolist() == aum[::-1].tolist()
+
+    def test_large_amc_rule_matches_the_original_classification(self):
+        import pandas as pd
+        from ai_agents.agents.fund_data_agent import assign_aum
+
+        df = pd.DataFrame({
+            "scheme_code": ["1", "2", "3", "4"],
+            "scheme_name": ["SBI Bluechip Fund", "hdfc Liquid Fund", "Nippon India Small Cap Fund", "Axis Gold Fund"],
+        })
+        aum = assign_aum(df)
+        # Mixed-case AMC names never matched the upper-cased scheme name
+        assert (aum[:2] >= 10000).all() and (aum[2:] < 5000).all()
+
+    def test_sync_only_enriches_added_and_renamed_schemes(self, sync, mocker):
+        import pandas as pd
+
+        module, run, metrics = sync
+        first = run([("1", "A Large Cap Fund", 10.0), ("2", "B Debt Fund", 20.0), ("3", "C Gold Fund", 30.0)])
+        assert first["added"] == 3 and first["snapshot_version"] == "v1"
+
+        fundamentals = mocker.spy(module, "assign_fundamentals")
+        metrics.reset_mock()
+        second = run([("1", "A Large Cap Fund", 11.0), ("2", "B Gilt Fund", 21.0), ("4", "D Mid Cap Fund", 5.0)])
+        # A NAV move alone is not a change; the rename is
+        assert (second["added"], second["changed"], second["removed"]) == (1, 1, 1)
+        assert sorted(fundamentals.call_args.args[0]["scheme_code"]) == ["2", "4"]
+        # Metrics follow the NAV history, so every scheme gets them
+        assert sorted(metrics.call_args.args[0]["scheme_code"]) == ["1", "2", "4"]
+
+        after = pd.read_csv(module.FUNDS_DATA_FILE, dtype={"scheme_code": str})
+        assert after["scheme_code"].tolist() == ["2", "1", "4"]  # ranking_score order
+        after = after.set_index("scheme_code")
+        assert after.loc["1", "category"] == "Large Cap" and after.loc["1", "nav"] == 11.0
+        assert after.loc["2", "category"] == "Other"
+        assert after.loc["2", "nav"] == 21.0 and after.loc["4", "category"] == "Mid Cap"
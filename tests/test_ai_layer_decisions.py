@@ -189,3 +189,53 @@ class TestFundScoring:
 
     def test_rank_funds_empty(self):
         assert rank_funds([], _neutral_signals()) == []
+
+    def test_rank_funds_matches_score_fund_per_fund(self):
+        signals = {**_neutral_signals(), "market_trend": "bearish", "volatility": "high"}
+        funds = [
+            _fund(name="Debt A", category="Debt", volatility=2.0),
+            _fund(name="Mid B", category="Mid Cap", volatility=22.0),
+            _fund(name="Debt C", category="Debt", volatility=2.0),  # ties with Debt A
+            _fund(name="Unknown D", category="Other", volatility=60.0),
+        ]
+        expected = sorted((score_fund(f, signals) for f in funds), key=lambda x: x["ai_score"], reverse=True)
+        ranked = rank_funds(funds, signals)
+        assert [r["name"] for r in ranked] == ["Debt A", "Debt C", "Mid B", "Unknown D"]
+        assert ranked == expected
+
+    def test_rank_funds_top_n_renders_only_returned_reasons(self, mocker):
+        from ai_layer.scoring_engine import fund_scoring
+
+        funds = [_fund(name="A", **{"1y": 5.0}), _fund(name="B", **{"1y": 20.0}), _fund(name="C", **{"1y": 10.0})]
+        expected = rank_funds(funds, _neutral_signals())
+        render = mocker.spy(fund_scoring, "_ai_reason")
+        top = rank_funds(funds, _neutral_signals(), top_n=2)
+        assert render.call_count == 2
+        assert top == expected[:2] and [f["name"] for f in top] == ["B", "C"]
+
+    def test_rank_funds_copies_shallowly_without_touching_inputs(self):
+        funds = [_fund(name="A", holdings={"INFY": 5.0}), _fund(name="B", **{"1y": 20.0})]
+        before = [dict(f) for f in funds]
+        ranked = rank_funds(funds, _neutral_signals())
+        assert funds == before  # scoring keys land on the copies only
+        assert all(r is not f for r in ranked for f in funds)
+        assert ranked[1]["holdings"] is funds[0]["holdings"]  # nested values are never mutated
+        assert score_fund(funds[0], _neutral_signals())["holdings"] is funds[0]["holdings"]
+
+    def test_reasons_are_rendered_only_when_read(self, mocker):
+        from ai_layer.scoring_engine import fund_scoring
+
+        funds = [_fund(name="A", **{"1y": 5.0}), _fund(name="B", **{"1y": 20.0}), _fund(name="C", **{"1y": 10.0})]
+        expected = rank_funds(funds, _neutral_signals())
+        render = mocker.spy(fund_scoring, "_ai_reason")
+        ranked = rank_funds(funds, _neutral_signals(), reasons=False)
+        assert render.call_count == 0 and all("ai_reason" not in r for r in ranked)
+        assert fund_scoring.score_reason(ranked[0], _neutral_signals()) == expected[0]["ai_reason"]
+        assert render.call_count == 1
+
+    def test_rank_funds_validates_metrics_like_score_fund(self):
+        bad = _fund(name="A", **{"3y": None})
+        with pytest.raises(TypeError, match="3y"):
+            score_fund(bad, _neutral_signals())
+        with pytest.raises(TypeError, match="3y"):
+            rank_funds([_fund(name="B"), bad], _neutral_signals())
@@ -0,0 +1,86 @@
+"""
+Tests for backend/engines/benchmark_analytics_engine.py
+"""
+import numpy as np
+import pytest
+
+from backend.data.benchmark_indices import enrich_with_benchmark_metrics
+from backend.engines import benchmark_analytics_engine
+from backend.engines.benchmark_analytics_engine import (
+    _regression_stats,
+    compute_benchmark_analytics,
+    rolling_alpha,
+)
+
+
+def _series(n_days=800, seed=11):
+    rng = np.random.default_rng(seed)
+    dates = np.arange(np.datetime64("2023-06-01"), np.datetime64("2023-06-01") + n_days).astype("datetime64[D]")
+    bench_r = rng.normal(0.0005, 0.01, n_days)
+    bench = 100.0 * np.cumprod(1 + bench_r)
+    noise = rng.normal(0.0, 0.002, n_days)
+    # fund 0 tracks with beta 1.5, fund 1 is the benchmark itself
+    fund0 = 10.0 * np.cumprod(1 + 1.5 * bench_r + noise)
+    fund1 = bench.copy()
+    return dates, np.column_stack([fund0, fund1]), bench[:, None]
+
+
+def test_beta_and_tracking_error_from_aligned_returns():
+    dates, funds, bench = _series()
+    out = compute_benchmark_analytics(dates, funds, dates, bench, np.array([0, 0]))
+
+    assert out["beta"][0] == pytest.approx(1.5, abs=0.05)
+    assert out["beta"][1] == pytest.approx(1.0, abs=1e-9)
+    assert out["tracking_error"][1] == pytest.approx(0.0, abs=1e-9)
+    assert out["tracking_error"][0] > 5.0
+    active = np.diff(funds[:, 0]) / funds[:-1, 0] - np.diff(bench[:, 0]) / bench[:-1, 0]
+    assert out["tracking_error"][0] == pytest.approx(active.std() * np.sqrt(252) * 100, rel=1e-6)
+    assert np.isfinite(out["alpha_1y"]).all() and np.isfinite(out["alpha_3y"]).all()
+
+
+def test_rolling_alpha_matches_a_regression_per_window():
+    dates, funds, bench = _series()
+    _, fund_r, bench_r = benchmark_analytics_engine.align_returns(dates, funds, dates, bench)
+    bench_r = np.repeat(bench_r, 2, axis=1)
+    daily_rf = 0.06 / 252
+    rolling = rolling_alpha(fund_r, bench_r, daily_rf, window=252, step=21)
+
+    assert rolling.shape == ((len(dates) - 252) // 21 + 1, 2)
+    for back, row in ((0, -1), (3, -4)):
+        end = len(dates) - 21 * back
+        expected = _regression_stats(fund_r[end - 252:end], bench_r[end - 252:end], daily_rf)["alpha"]
+        np.testing.assert_allclose(rolling[row], expected, rtol=1e-6, atol=1e-9)
+
+    out = compute_benchmark_analytics(dates, funds, dates, bench, np.array([0, 0]))
+    assert out["rolling_alpha_1y_median"][0] == pytest.approx(np.median(rolling[:, 0]))
+    assert 0.0 <= out["rolling_alpha_1y_positive"][0] <= 1.0
+
+
+def test_alignment_uses_only_common_dates():
+    dates, funds, bench = _series()
+    shifted = dates + 1  # only overlapping dates may be used
+    out = compute_benchmark_analytics(dates, funds, shifted[:-1], bench[:-1], np.array([0, -1]))
+    assert np.isfinite(out["beta"][0])
+    assert np.isnan(out["beta"][1])  # no benchmark mapped
+
+
+def test_enrich_prefers_published_analytics(monkeypatch):
+    monkeypatch.setattr(
+        benchmark_analytics_engine,
+        "lookup_benchmark_analytics",
+        lambda code: {"beta": 0.9, "tracking_error": 3.2, "information_ratio": 0.5, "alpha_1y": 1.1, "alpha_3y": np.nan},
+    )
+    fund = {"scheme_code": 120465, "category": "Large Cap", "1y": 20.0, "3y": 15.0, "volatility": 14.0}
+    enriched = enrich_with_benchmark_metrics(fund)
+    assert enriched["tracking_error"] == 3.2
+    assert enriched["beta"] == 0.9
+    assert enriched["alpha_1y"] == 1.1
+    assert enriched["alpha_3y"] == round(15.0 - 14.1, 2)  # falls back to fixture difference
+    assert enriched["benchmark_metrics_source"] == "nav_history"
+
+
+def test_enrich_without_scheme_code_uses_fixture():
+    enriched = enrich_with_benchmark_metrics({"category": "Large Cap", "1y": 20.0, "3y": 15.0, "volatility": 14.0})
+    assert enriched["tracking_error"] == round(abs(14.0 - 15.8), 2)
+    assert enriched["beta"] == 1.0
+    assert "benchmark_metrics_source" not in enriched
@@ -0,0 +1,86 @@
+"""
+Tests for data/cache/cache_manager.py
+"""
+import json
+import os
+
+import pytest
+
+from data.cache import cache_manager
+from data.cache.cache_manager import _CacheFile
+
+
+@pytest.fixture
+def cache_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_manager, "_SIGNALS_CACHE", _CacheFile(tmp_path / "signals_cache.json"))
+    monkeypatch.setattr(
+        cache_manager, "_MACRO_CACHE",
+        _CacheFile(tmp_path / "macro_cache.json", transform=cache_manager._normalize_macro_entry),
+    )
+    return tmp_path
+
+
+def test_writes_are_atomic_and_compact(cache_files):
+    cache_manager.save_signals({"market_trend": "bullish"})
+    path = cache_files / "signals_cache.json"
+    text = path.read_text()
+    assert "\n" not in text and ", " not in text
+    assert json.loads(text)["signals"] == {"market_trend": "bullish"}
+    assert [p.name for p in cache_files.iterdir()] == ["signals_cache.json"]  # no temp files left
+
+
+def test_writes_keep_the_existing_file_mode(cache_files):
+    path = cache_files / "signals_cache.json"
+    cache_manager.save_signals({"market_trend": "bullish"})
+    assert path.stat().st_mode & 0o777 == 0o644
+
+    os.chmod(path, 0o664)
+    cache_manager.save_signals({"market_trend": "bearish"})
+    assert path.stat().st_mode & 0o777 == 0o664
+
+
+def test_reads_are_parsed_once_per_file_version(cache_files, mocker, monkeypatch):
+    monkeypatch.setattr(cache_manager, "_STAT_INTERVAL_SECONDS", 0.0)
+    cache_manager.save_signals({"market_trend": "bullish"})
+    read = mocker.spy(cache_manager, "_read_json")
+
+    for _ in range(3):
+        assert cache_manager.load_signals_fallback()["market_trend"] == "bullish"
+    assert read.call_count == 0  # served from the write-through memo
+
+    # Another process rewrites the file → picked up via (mtime, size)
+    path = cache_files / "signals_cache.json"
+    path.write_text(json.dumps({"signals": {"market_trend": "bearish!"}, "cached_at": "x"}))
+    os.utime(path, ns=(1, 10 ** 18))
+    assert cache_manager.load_signals_fallback()["market_trend"] == "bearish!"
+    assert read.call_count == 1
+
+
+def test_macro_is_normalized_once(cache_files, mocker, monkeypatch):
+    monkeypatch.setattr(cache_manager, "_STAT_INTERVAL_SECONDS", 0.0)
+    cache_manager.save_macro_data({"cpi_yoy_pct": 5.0, "source": "live", "fetched_at": "2026-03-23T10:00:00"})
+    normalize = mocker.spy(cache_manager, "_normalize_macro_data")
+
+    first = cache_manager.load_macro_data()
+    second = cache_manager.load_macro_data()
+    assert normalize.call_count == 0
+    assert first["data_points"]["cpi_yoy_pct"]["value"] == 5.0
+    assert first is not second  # callers get their own top-level dict
+
+
+def test_unchanged_signals_are_not_rewritten(cache_files):
+    cache_manager.save_signals({"market_trend": "bullish"})
+    path = cache_files / "signals_cache.json"
+    before = os.stat(path).st_mtime_ns
+    os.utime(path, ns=(before - 10 ** 9, before - 10 ** 9))
+    cache_manager._SIGNALS_CACHE.read()
+
+    cache_manager.save_signals({"market_trend": "bullish"})
+    assert os.stat(path).st_mtime_ns == before - 10 ** 9
+    cache_manager.save_signals({"market_trend": "bearish"})
+    assert os.stat(path).st_mtime_ns != before - 10 ** 9
+
+
+def test_missing_file_falls_back_to_defaults(cache_files):
+    assert cache_manager.load_signals() is None
+    assert cache_manager.load_signals_fallback() == cache_manager.DEFAULT_SIGNALS
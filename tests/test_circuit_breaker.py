@@ -0,0 +1,134 @@
+"""
+Tests for backend/utils/circuit_breaker.py
+"""
+import threading
+
+import pytest
+
+from backend.utils import circuit_breaker
+from backend.utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+)
+
+FAST = RetryPolicy(max_attempts=3, initial_backoff=0.0)
+
+
+class _Flaky:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("down")
+        return "ok"
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    circuit_breaker.reset_breakers()
+    yield
+    circuit_breaker.reset_breakers()
+
+
+def test_retries_transient_failures_and_records_counters():
+    breaker = CircuitBreaker("amfi", failure_threshold=5)
+    flaky = _Flaky(failures=2)
+
+    assert breaker.call(flaky, policy=FAST) == "ok"
+    health = breaker.health()
+    assert flaky.calls == 3
+    assert health["failures"] == 2 and health["successes"] == 1 and health["retries"] == 2
+    assert health["state"] == CLOSED and health["latency_ms_avg"] is not None
+
+
+def test_open_circuit_fails_fast_without_calling_provider():
+    breaker = CircuitBreaker("fred", failure_threshold=2, reset_timeout=60)
+    flaky = _Flaky(failures=100)
+
+    with pytest.raises(ConnectionError):
+        breaker.call(flaky, policy=FAST)
+    assert breaker.state == OPEN
+    assert flaky.calls == 2  # stopped retrying as soon as the circuit opened
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(flaky, policy=FAST)
+    assert flaky.calls == 2
+    assert breaker.health()["short_circuited"] == 1
+
+
+def test_background_probe_closes_circuit(monkeypatch):
+    probed = threading.Event()
+    breaker = CircuitBreaker("yfinance", failure_threshold=1, reset_timeout=0.0, probe=probed.set)
+
+    with pytest.raises(ConnectionError):
+        breaker.call(_Flaky(failures=1), policy=FAST)
+
+    # Reset timeout elapsed: the caller still fails fast while the probe runs
+    monkeypatch.setattr(breaker, "_start_probe", lambda: None)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok", policy=FAST)
+    assert breaker.state == HALF_OPEN
+
+    breaker._run_probe()
+    assert probed.is_set()
+    assert breaker.state == CLOSED
+    assert breaker.call(lambda: "ok") == "ok"
+
+
+def test_half_open_trial_without_probe_reopens_on_failure():
+    breaker = CircuitBreaker("fbil", failure_threshold=1, reset_timeout=0.0)
+    with pytest.raises(ConnectionError):
+        breaker.call(_Flaky(failures=1), policy=FAST)
+
+    with pytest.raises(ConnectionError):
+        breaker.call(_Flaky(failures=1), policy=FAST)  # the single trial call
+    assert breaker.state == OPEN
+
+
+def test_non_retryable_errors_propagate_without_tripping():
+    breaker = CircuitBreaker("amfi", failure_threshold=1)
+    policy = RetryPolicy(max_attempts=3, initial_backoff=0.0, retry_on=(ConnectionError,))
+
+    def bad_payload():
+        raise ValueError("unparseable")
+
+    with pytest.raises(ValueError):
+        breaker.call(bad_payload, policy=policy)
+    assert breaker.state == CLOSED
+
+
+def test_breakers_are_shared_per_host():
+    a = circuit_breaker.breaker_for_url("https://fred.stlouisfed.org/graph/fredgraph.csv?id=A")
+    b = circuit_breaker.breaker_for_url("https://fred.stlouisfed.org/graph/fredgraph.csv?id=B")
+    assert a is b
+    assert "fred.stlouisfed.org" in circuit_breaker.source_health()
+
+
+def test_yahoo_breakers_are_keyed_per_ticker():
+    policy = RetryPolicy(max_attempts=3, initial_backoff=0.0)
+
+    def delisted():
+        raise ConnectionError("404 no data")
+
+    with pytest.raises(ConnectionError):
+        circuit_breaker.yahoo_breaker("DELISTED.NS").call(delisted, policy=policy)
+
+    assert circuit_breaker.yahoo_breaker("DELISTED.NS").state == OPEN
+    assert circuit_breaker.yahoo_breaker("^NSEI").call(lambda: 1.0, policy=policy) == 1.0
+
+
+def test_url_probe_treats_client_errors_as_unhealthy(mocker):
+    head = mocker.patch("requests.head", return_value=mocker.Mock(status_code=404))
+    breaker = circuit_breaker.breaker_for_url("https://probe.example.org/data.csv")
+    with pytest.raises(Exception):
+        breaker.probe()
+
+    head.return_value = mocker.Mock(status_code=301)
+    breaker.probe()
@@ -0,0 +1,60 @@
+"""
+Tests for ai_layer/data_ingestion/fred_cache.py
+"""
+import pytest
+
+from ai_layer.data_ingestion import fred_cache
+
+
+class _Resp:
+    def __init__(self, text):
+        self.text = text
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(fred_cache, "FRED_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _monthly_csv(start_year, months, header="observation_date,INDCPIALLMINMEI"):
+    rows = [header]
+    for i in range(months):
+        year, month = start_year + i // 12, i % 12 + 1
+        rows.append(f"{year}-{month:02d}-01,{100 + i}")
+    return "\n".join(rows) + "\n"
+
+
+def test_first_refresh_downloads_full_history_then_only_new_rows(cache_dir):
+    requested = []
+
+    def full_history(url):
+        requested.append(url)
+        return _Resp(_monthly_csv(2020, 24))
+
+    dates, values = fred_cache.refresh_series("CPI", http_get=full_history)
+    assert len(values) == 24 and dates[-1] == "2021-12-01"
+    assert "cosd" not in requested[0]
+
+    def incremental(url):
+        requested.append(url)
+        return _Resp("DATE,VALUE\n2022-01-01,124\n2022-02-01,.\n")
+
+    dates, values = fred_cache.refresh_series("CPI", http_get=incremental)
+    assert requested[-1].endswith("id=CPI&cosd=2021-12-02")
+    assert dates[-1] == "2022-01-01" and values[-1] == 124.0
+    assert len(values) == 25
+
+
+def test_queries_are_answered_from_cache(cache_dir):
+    fred_cache.refresh_series("CPI", http_get=lambda url: _Resp(_monthly_csv(2020, 13)))
+
+    assert fred_cache.last_value("CPI", refresh=False) == 112.0
+    assert fred_cache.yoy_change_pct("CPI", refresh=False) == 12.0
+    # network failure keeps serving cached observations
+    assert fred_cache.last_value("CPI", http_get=lambda url: None) == 112.0
+
+
+def test_short_history_has_no_yoy(cache_dir):
+    fred_cache.refresh_series("CPI", http_get=lambda url: _Resp(_monthly_csv(2020, 6)))
+    assert fred_cache.yoy_change_pct("CPI", refresh=False) is None
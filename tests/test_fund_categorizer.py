@@ -0,0 +1,55 @@
+"""
+Tests for backend/engines/fund_categorizer.py
+"""
+import pandas as pd
+import pytest
+
+from backend.engines import fund_categorizer
+from backend.engines.fund_categorizer import categorize_funds, classify_scheme_name, classify_scheme_names
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memo():
+    fund_categorizer.clear_category_memo()
+    yield
+    fund_categorizer.clear_category_memo()
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("HDFC Large Cap Fund - Growth", "Large Cap"),
+    ("Axis Mid Cap Fund", "Mid Cap"),
+    ("ICICI Banking Sector Fund", "Sectoral"),
+    ("SBI Balanced Advantage Fund", "Hybrid"),
+    # Later rules take precedence over earlier ones
+    ("Nippon Gold Liquid Bond Fund", "Gold"),
+    ("Quant Large Cap Thematic Fund", "Sectoral"),
+    # Overlapping keywords are both seen
+    ("XYZ Hybridebt Fund", "Debt"),
+    ("Some Index Fund", "Other"),
+    (None, "Other"),
+])
+def test_classify_scheme_name(name, expected):
+    assert classify_scheme_name(name) == expected
+    assert classify_scheme_names([name]).tolist() == [expected]
+
+
+def test_classify_scheme_names_matches_the_scalar_rules():
+    names = pd.Series(
+        ["HDFC Large Cap Fund", None, "XYZ Hybridebt Fund", 42, "Gold Liquid Fund", "Plain Fund"],
+        index=[5, 5, 3, 9, 1, 0],
+    )
+    assert classify_scheme_names(names).tolist() == [classify_scheme_name(n) for n in names]
+
+
+def test_categorize_funds_memoizes_by_scheme_code(mocker):
+    df = pd.DataFrame({"scheme_code": [1, 2], "scheme_name": ["A Large Cap Fund", "B Debt Fund"]})
+    assert categorize_funds(df)["category"].tolist() == ["Large Cap", "Debt"]
+
+    spy = mocker.spy(fund_categorizer, "classify_scheme_names")
+    renamed = pd.DataFrame({"scheme_code": [1, 2, 3], "scheme_name": ["A Large Cap Fund", "B Gold Fund", "C Fund"]})
+    assert categorize_funds(renamed)["category"].tolist() == ["Large Cap", "Gold", "Other"]
+    assert spy.call_count == 1
+    assert spy.call_args.args[0].tolist() == ["B Gold Fund", "C Fund"]
+
+    categorize_funds(renamed)
+    assert spy.call_count == 1
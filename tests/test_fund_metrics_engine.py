@@ -0,0 +1,137 @@
+"""
+Tests for backend/engines/fund_metrics_engine.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.engines import fund_metrics_engine
+from backend.engines.fund_metrics_engine import (
+    RunningMetrics,
+    compute_universe_metrics,
+    forward_fill,
+    update_running_metrics,
+)
+
+
+def _history(n_days=900, n_schemes=4, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = np.arange(np.datetime64("2023-01-02"), np.datetime64("2023-01-02") + n_days).astype("datetime64[D]")
+    navs = 10.0 * np.exp(np.cumsum(rng.normal(0.0004, 0.01, (n_days, n_schemes)), axis=0))
+    navs[rng.random((n_days, n_schemes)) < 0.05] = np.nan
+    navs[:400, 3] = np.nan  # a young scheme
+    return dates, navs
+
+
+def test_forward_fill_keeps_leading_nans():
+    navs = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, 3.0]])
+    filled, first_valid = forward_fill(navs)
+    assert np.isnan(filled[0, 0])
+    assert filled[:, 0][1:].tolist() == [2.0, 2.0]
+    assert filled[:, 1].tolist() == [1.0, 1.0, 3.0]
+    assert first_valid.tolist() == [1, 0]
+
+
+def test_metrics_match_per_scheme_pandas():
+    dates, navs = _history()
+    metrics = compute_universe_metrics(dates, navs)
+
+    prices = pd.Series(navs[:, 0], index=pd.DatetimeIndex(dates)).dropna()
+    # returns between consecutive published NAVs
+    returns = prices.pct_change().dropna()
+    expected_vol = returns.std() * np.sqrt(252) * 100
+    expected_dd = (prices / prices.cummax() - 1).min() * 100
+
+    assert metrics["volatility"][0] == pytest.approx(expected_vol, rel=1e-3)
+    assert metrics["max_drawdown"][0] == pytest.approx(expected_dd, rel=1e-3)
+    assert metrics["1y"][0] == pytest.approx(
+        ((prices.iloc[-1] / prices.asof(prices.index[-1] - pd.Timedelta(days=365))) ** (365.25 / 365) - 1) * 100,
+        rel=1e-2,
+    )
+
+
+def test_short_history_yields_nan_for_long_horizons():
+    dates, navs = _history()
+    metrics = compute_universe_metrics(dates, navs)
+    assert np.isnan(metrics["3y"][3])
+    assert np.isnan(metrics["5y"]).all()
+    assert np.isfinite(metrics["1y"][3])
+
+
+def test_running_metrics_incremental_matches_batch():
+    dates, navs = _history()
+    batch = RunningMetrics.from_history(navs)
+    incremental = RunningMetrics.from_history(navs[:-5])
+    for row in navs[-5:]:
+        incremental.update(row)
+
+    np.testing.assert_allclose(incremental.volatility(), batch.volatility(), rtol=1e-6)
+    np.testing.assert_allclose(incremental.max_drawdown, batch.max_drawdown, rtol=1e-6)
+    np.testing.assert_allclose(incremental.downside_deviation(), batch.downside_deviation(), rtol=1e-6)
+
+
+def _append_days(store, dates, navs):
+    codes = np.arange(101, 101 + navs.shape[1])
+    for day, row in zip(dates, navs):
+        store.append_snapshot(day, codes, row)
+        update_running_metrics(store, written_from=store.last_written_from)
+
+
+def test_sync_keeps_running_state_in_step_with_a_full_scan(tmp_path, monkeypatch):
+    from backend.data.nav_history_store import NavHistoryStore
+
+    dates, navs = _history(n_days=420)
+    store = NavHistoryStore(str(tmp_path / "nav_history"))
+    codes = np.arange(101, 105)
+    store.append_snapshot(np.repeat(dates[:400], 4), np.tile(codes, 400), navs[:400].ravel())
+    update_running_metrics(store)
+    _append_days(store, dates[400:], navs[400:])
+
+    state = RunningMetrics.load(fund_metrics_engine.running_state_path(store))
+    assert state.end_row == len(dates) - fund_metrics_engine.SETTLE_DAYS
+
+    expected = compute_universe_metrics(*store.window())
+    monkeypatch.setattr(fund_metrics_engine, "_CACHED", {"version": None, "frame": None})
+    monkeypatch.setattr(
+        fund_metrics_engine, "compute_universe_metrics", lambda *a, **k: pytest.fail("rescanned the window")
+    )
+    frame = fund_metrics_engine.get_scheme_metrics(store)
+    for name in fund_metrics_engine.METRIC_COLUMNS:
+        np.testing.assert_allclose(frame[name].to_numpy(), np.round(expected[name], 2), atol=0.011, err_msg=name)
+
+
+def test_restated_settled_nav_reseeds_the_running_state(tmp_path):
+    from backend.data.nav_history_store import NavHistoryStore
+
+    dates, navs = _history(n_days=60)
+    store = NavHistoryStore(str(tmp_path / "nav_history"))
+    _append_days(store, dates, navs)
+
+    store.append_snapshot(dates[5], [101], [navs[5, 0] * 0.5])
+    state = update_running_metrics(store, written_from=store.last_written_from)
+    reseeded = RunningMetrics.from_history(store.matrix()[: state.end_row])
+    np.testing.assert_allclose(state.max_drawdown, reseeded.max_drawdown)
+    assert state.max_drawdown[0] < -0.4
+
+
+def test_apply_performance_metrics_prefers_scheme_history(monkeypatch):
+    from backend.engines import fund_performance_engine
+
+    scheme_metrics = pd.DataFrame(
+        {"1y": [12.0], "3y": [10.0], "5y": [np.nan], "volatility": [9.0], "sharpe": [0.4], "sortino": [0.6], "max_drawdown": [-8.0]},
+        index=pd.Index([101], name="scheme_code"),
+    )
+    monkeypatch.setattr(fund_metrics_engine, "get_scheme_metrics", lambda store=None: scheme_metrics)
+    monkeypatch.setattr(
+        fund_performance_engine,
+        "get_category_performance",
+        lambda: {"Gold": {"1y": 50.0, "3y": 30.0, "5y": 20.0, "volatility": 17.0, "sharpe": 1.3}},
+    )
+
+    df = pd.DataFrame({"scheme_code": [101, 202], "category": ["Gold", "Gold"]})
+    out = fund_performance_engine.apply_performance_metrics(df).set_index("scheme_code")
+
+    assert out.loc[101, "1y"] == 12.0
+    assert out.loc[101, "5y"] == 20.0        # gap filled from the category proxy
+    assert out.loc[202, "1y"] == 50.0
+    assert out.loc[101, "max_drawdown"] == -8.0
@@ -0,0 +1,102 @@
+"""
+Tests for backend/data/fund_universe_store.py
+"""
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.data.fund_universe_store import FundUniverseStore
+
+
+def _write(path, rows, mtime_ns=None):
+    pd.DataFrame(rows).to_csv(path, index=False)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "mutual_funds.csv"
+    _write(path, [
+        {"scheme_code": 1, "scheme_name": "A Large Cap Fund", "amc": "A", "category": "Large Cap", "1y": 12.5, "risk": "moderate"},
+        {"scheme_code": 2, "scheme_name": "B Debt Fund", "amc": "B", "category": "Debt", "1y": 7.1, "risk": "low"},
+    ], mtime_ns=1_000_000_000)
+    return path
+
+
+def test_loads_once_with_compact_dtypes(csv_path):
+    store = FundUniverseStore(str(csv_path), stat_interval=0)
+    df = store.frame()
+
+    assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["risk"].dtype, pd.CategoricalDtype)
+    assert df["1y"].dtype == np.float32
+    assert df["scheme_code"].tolist() == ["1", "2"]
+    assert store.frame() is df
+
+
+def test_new_snapshot_is_swapped_in(csv_path):
+    store = FundUniverseStore(str(csv_path), stat_interval=0)
+    first, first_version = store.frame(), store.version
+
+    _write(csv_path, [{"scheme_code": 3, "scheme_name": "C Gold Fund", "category": "Gold"}], mtime_ns=2_000_000_000)
+    second = store.frame()
+
+    assert second is not first
+    assert second["scheme_code"].tolist() == ["3"]
+    assert store.version != first_version
+
+
+def test_keeps_last_good_frame_when_reload_fails(csv_path):
+    store = FundUniverseStore(str(csv_path), stat_interval=0)
+    good = store.frame()
+
+    csv_path.write_text("")
+    assert store.frame() is good
+
+    os.unlink(csv_path)
+    assert store.frame() is good
+    assert FundUniverseStore(str(csv_path)).frame() is None
+
+
+def test_stat_interval_throttles_rechecks(csv_path):
+    store = FundUniverseStore(str(csv_path), stat_interval=3600)
+    first = store.frame()
+    _write(csv_path, [{"scheme_code": 3, "scheme_name": "C", "category": "Gold"}], mtime_ns=2_000_000_000)
+    assert store.frame() is first
+
+    store.invalidate()
+    assert store.frame()["scheme_code"].tolist() == ["3"]
+
+
+def _is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+def test_columnar_snapshot_is_preferred_and_memory_mapped(csv_path, tmp_path):
+    from backend.data.fund_universe_store import publish_fund_universe, read_fund_universe
+
+    root = str(tmp_path / "fund_universe")
+    first_version = publish_fund_universe(read_fund_universe(str(csv_path)), root)
+    store = FundUniverseStore(str(csv_path), snapshot_root=root, stat_interval=0)
+
+    version, df = store.snapshot()
+    assert version == first_version
+    assert _is_memory_mapped(df["1y"].to_numpy())
+    assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+    assert df["scheme_name"].tolist() == ["A Large Cap Fund", "B Debt Fund"]
+    assert df["scheme_code"].tolist() == ["1", "2"]
+    assert df["fund_type"].tolist() == ["Mutual Fund", "Mutual Fund"]
+    assert store.snapshot()[1] is df
+
+    second_version = publish_fund_universe(df.iloc[:1], root, version="next")
+    assert second_version != first_version
+    assert store.snapshot()[0] == "next"
+    assert len(store.frame()) == 1
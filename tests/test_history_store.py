@@ -0,0 +1,73 @@
+"""
+Tests for ai_agents/db/history_store.py
+"""
+import os
+
+import pytest
+
+from ai_agents.db.history_store import HistoryStore
+
+
+def _record(ts, trend="neutral"):
+    return {"timestamp": ts, "market": {"nifty": 1}, "signals": {"market_trend": trend}, "prediction": {}, "decision": {}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history"))
+
+
+def test_latest_reads_last_indexed_record(store):
+    assert store.latest() is None
+    store.append(_record("2026-03-23T09:00:00", "bearish"))
+    store.append(_record("2026-03-23T09:15:00", "bullish"))
+    assert store.latest()["signals"]["market_trend"] == "bullish"
+
+
+def test_segments_roll_daily_and_old_ones_are_compressed(store):
+    store.append(_record("2026-03-22T23:45:00"))
+    store.append(_record("2026-03-23T00:00:00", "bullish"))
+
+    files = sorted(os.listdir(store.root))
+    assert "2026-03-22.ndjson.gz" in files and "2026-03-22.ndjson" not in files
+    assert "2026-03-23.ndjson" in files
+    assert store.segments() == ["2026-03-22", "2026-03-23"]
+    assert store.latest()["signals"]["market_trend"] == "bullish"
+
+
+def test_range_query_spans_compressed_segments(store):
+    for day in (21, 22, 23):
+        for hour in (9, 12, 15):
+            store.append(_record(f"2026-03-{day}T{hour:02d}:00:00", f"{day}-{hour}"))
+
+    rows = store.range("2026-03-21T12:00:00", "2026-03-22T12:00:00", fields=("signals",))
+    assert [r["signals"]["market_trend"] for r in rows] == ["21-12", "21-15", "22-9", "22-12"]
+    assert set(rows[0]) == {"timestamp", "signals"}
+    assert len(store.range()) == 9
+
+
+def test_legacy_ndjson_import(store, tmp_path):
+    legacy = tmp_path / "history.ndjson"
+    legacy.write_text(
+        '{"timestamp": "2026-03-24T16:23:57.951064", "signals": {"market_trend": "bearish"}}\n'
+        '{"timestamp": "2026-03-25T23:50:09.177367", "signals": {"test": "signals"}}\n'
+    )
+    assert store.import_ndjson(str(legacy)) == 2
+    assert store.latest()["signals"] == {"test": "signals"}
+
+
+def test_storage_reads_sections_from_cache_then_history(store, monkeypatch):
+    from ai_agents.db import storage
+    from data.cache import tiered_cache
+
+    monkeypatch.setattr(storage, "get_history_store", lambda: store)
+    monkeypatch.setattr(tiered_cache, "_default_cache", tiered_cache.TieredCache(redis_url=None, use_files=False))
+
+    storage.save({"nifty": 1}, {"trend": "up"}, {"p": 0.6}, {"action": "hold"})
+    assert storage.get_section("signals") == {"trend": "up"}
+    assert storage.get_latest()["decision"] == {"action": "hold"}
+    assert storage.get_latest_version() is not None
+
+    monkeypatch.setattr(tiered_cache, "_default_cache", tiered_cache.TieredCache(redis_url=None, use_files=False))
+    assert storage.get_section("prediction") == {"p": 0.6}
+    assert storage.get_latest_version() is None
@@ -0,0 +1,70 @@
+"""
+Tests for the concurrent macro indicator fetch in ai_layer/data_ingestion/macro_data.py
+"""
+import time
+
+import pytest
+
+from ai_layer.data_ingestion import macro_data
+from data.cache import tiered_cache
+
+
+@pytest.fixture
+def no_cache_writes(monkeypatch, mocker):
+    cache = tiered_cache.TieredCache(redis_url=None, use_files=False)
+    monkeypatch.setattr(tiered_cache, "_default_cache", cache)
+    return mocker.spy(cache, "set")
+
+
+def test_sources_run_concurrently_within_deadline(monkeypatch, no_cache_writes):
+    def slow(value):
+        def fetch():
+            time.sleep(0.3)
+            return value
+        return fetch
+
+    monkeypatch.setattr(macro_data, "_compute_cpi_yoy", slow(5.1))
+    monkeypatch.setattr(macro_data, "_fetch_repo_rate", slow(6.25))
+    monkeypatch.setattr(macro_data, "_fetch_bond_yield", slow(6.9))
+
+    started = time.perf_counter()
+    result = macro_data.get_macro_indicators(use_cache=False, deadline=2.0)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.8  # bounded by the slowest source, not the sum (0.9s)
+    assert result["source"] == "live"
+    assert result["repo_rate_pct"] == 6.25
+    assert not any(p["is_fallback"] for p in result["data_points"].values())
+
+
+def test_late_source_degrades_to_last_cached_value(monkeypatch, no_cache_writes):
+    monkeypatch.setattr(macro_data, "_compute_cpi_yoy", lambda: 5.1)
+    monkeypatch.setattr(macro_data, "_fetch_repo_rate", lambda: 6.25)
+    monkeypatch.setattr(macro_data, "_fetch_bond_yield", lambda: time.sleep(1.0) or 6.9)
+    monkeypatch.setattr(
+        macro_data,
+        "_last_known_points",
+        lambda: {"bond_yield_pct": {"value": 7.02, "source": "FRED/yfinance", "fetched_at": "2026-03-20T10:00:00", "is_fallback": False}},
+    )
+
+    started = time.perf_counter()
+    result = macro_data.get_macro_indicators(use_cache=False, deadline=0.2)
+
+    assert time.perf_counter() - started < 0.6
+    assert result["source"] == "partial"
+    assert result["bond_yield_pct"] == 7.02
+    assert result["data_points"]["bond_yield_pct"] == {
+        "value": 7.02, "source": "cache", "fetched_at": "2026-03-20T10:00:00", "is_fallback": True,
+    }
+    no_cache_writes.assert_called_once()
+
+
+def test_failed_source_without_cache_uses_hardcoded_fallback(monkeypatch, no_cache_writes):
+    monkeypatch.setattr(macro_data, "_compute_cpi_yoy", lambda: None)
+    monkeypatch.setattr(macro_data, "_fetch_repo_rate", lambda: 6.25)
+    monkeypatch.setattr(macro_data, "_fetch_bond_yield", lambda: 6.9)
+    monkeypatch.setattr(macro_data, "_last_known_points", lambda: {})
+
+    result = macro_data.get_macro_indicators(use_cache=False, concurrent=False)
+    assert result["cpi_yoy_pct"] == macro_data._FALLBACKS["cpi_yoy_pct"]
+    assert result["data_points"]["cpi_yoy_pct"]["source"] == "fallback"
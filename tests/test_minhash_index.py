@@ -0,0 +1,118 @@
+"""
+Tests for backend/engines/intelligence/minhash_index.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.engines.intelligence.minhash_index import (
+    MinHasher,
+    MinHashIndex,
+    load_similarity_index,
+    lsh_params,
+    publish_similarity_index,
+    shingle_scheme_name,
+    union_signature,
+)
+
+
+def _stocks(start, stop):
+    return {f"stock{i}" for i in range(start, stop)}
+
+
+def test_signature_agreement_estimates_jaccard():
+    hasher = MinHasher(num_perm=256)
+    a, b, empty = hasher.signatures([_stocks(0, 100), _stocks(50, 150), set()])
+    assert abs((a == b).mean() - 50 / 150) < 0.08
+    assert (hasher.signatures([_stocks(0, 100)])[0] == a).all()  # deterministic
+    assert (union_signature([a, b]) == hasher.signatures([_stocks(0, 150)])[0]).all()
+    assert not (empty == a).any()
+
+
+def test_lsh_params_trade_accuracy_for_speed():
+    bands, rows = lsh_params(128, 0.8)
+    assert bands * rows <= 128
+    # A lower threshold needs more, shorter bands
+    assert lsh_params(128, 0.3)[0] > bands
+
+
+@pytest.fixture
+def index():
+    sets = {
+        "a": _stocks(0, 40),
+        "a-direct": _stocks(0, 40),
+        "a-close": _stocks(0, 38) | {"x", "y"},
+        "b": _stocks(100, 140),
+        "c": _stocks(200, 240),
+        "empty": set(),
+    }
+    return MinHashIndex.from_token_sets(sets, threshold=0.8)
+
+
+def test_near_duplicates(index):
+    found = dict(index.near_duplicates("a"))
+    assert set(found) == {"a-direct", "a-close"}
+    assert found["a-direct"] == 1.0
+    assert index.near_duplicates("empty") == [] and index.near_duplicates("missing") == []
+
+
+def test_low_overlap_candidates_skip_similar_funds(index):
+    portfolio = index.hasher.signatures([_stocks(0, 40) | _stocks(300, 310)])[0]
+    picks = index.low_overlap_candidates(portfolio, max_overlap=0.25, order=["a", "b", "a-close", "c", "empty"])
+    assert [key for key, _ in picks] == ["b", "c"]
+    assert all(similarity < 0.25 for _, similarity in picks)
+    assert index.low_overlap_candidates(portfolio, 0.25, limit=1, exclude={"b"})[0][0] == "c"
+
+    # The walk is lazy and stops at ``limit``
+    order = iter(["b", "c", "a"])
+    assert [key for key, _ in index.low_overlap_candidates(portfolio, 0.25, order=order, limit=1)] == ["b"]
+    assert list(order) == ["c", "a"]
+
+
+def test_scheme_name_variants_share_a_token_set():
+    assert shingle_scheme_name("SBI Gold Fund - Direct Plan - Growth") == shingle_scheme_name(
+        "SBI GOLD FUND REGULAR PLAN - Income Distribution cum Capital Withdrawal Option (IDCW)"
+    )
+    assert shingle_scheme_name("SBI Gold Fund") != shingle_scheme_name("SBI Silver Fund")
+
+
+def test_published_index_round_trips(tmp_path):
+    universe = pd.DataFrame({
+        "scheme_code": [1, 2, 3],
+        "scheme_name": ["HDFC Mid Cap Fund - Direct Growth", "HDFC Mid Cap Fund - Regular IDCW", "Axis Gold ETF"],
+    })
+    root = str(tmp_path / "fund_similarity")
+    assert publish_similarity_index(universe, root) is not None
+
+    loaded = load_similarity_index(root)
+    assert isinstance(loaded.signatures, np.memmap) or isinstance(loaded.signatures.base, np.memmap)
+    assert [key for key, _ in loaded.near_duplicates("1")] == ["2"]
+
+
+def test_diversification_and_elimination_via_index():
+    from backend.engines.intelligence.overlap_engine import build_holdings_index, suggest_diversification
+    from backend.funds.overlap_engine import eliminate_overlapping_funds
+
+    universe = [
+        {"fund_name": f"F{i}", "category": "Equity", "top_holdings": ", ".join(sorted(_stocks(10 * i, 10 * i + 20)))}
+        for i in range(30)
+    ]
+    current = [universe[0]]
+    exact = suggest_diversification(current, universe, max_overlap=0.25)
+    index = build_holdings_index(universe, threshold=0.25)
+    approx = suggest_diversification(current, universe, max_overlap=0.25, index=index)
+    assert [s["fund_name"] for s in exact] == [f"F{i}" for i in range(2, 12)]
+    assert [s["fund_name"] for s in approx] == [f"F{i}" for i in range(2, 12)]
+
+    # The index path returns the first passing funds in the given order
+    reranked = current + universe[:0:-1]
+    approx = suggest_diversification(current, reranked, max_overlap=0.25, index=index)
+    assert [s["fund_name"] for s in approx] == [f"F{i}" for i in range(29, 19, -1)]
+
+    funds = [
+        {"fund_name": f"F{i}", "ai_score": 100 - i, "top_holdings": sorted(_stocks(10 * i, 10 * i + 20))}
+        for i in range(30)
+    ]
+    assert eliminate_overlapping_funds(funds, threshold=30, approximate=True) == eliminate_overlapping_funds(
+        funds, threshold=30
+    )
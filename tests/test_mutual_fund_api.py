@@ -0,0 +1,133 @@
+"""
+Tests for the streaming AMFI NAVAll parser and the columnar snapshot round-trip.
+"""
+import numpy as np
+import pytest
+
+from backend.data import mutual_fund_api
+from backend.data.columnar_store import load_snapshot, publish_snapshot, current_version
+
+
+NAVALL_SAMPLE = [
+    "Scheme Code;ISIN Div Payout/ ISIN Growth;ISIN Div Reinvestment;Scheme Name;Net Asset Value;Date",
+    "",
+    "Open Ended Schemes(Debt Scheme - Banking and PSU Fund)",
+    "",
+    "Aditya Birla Sun Life Mutual Fund",
+    "",
+    "119551;INF209KA12Z1;INF209KA13Z9;Aditya Birla Sun Life Banking & PSU Debt Fund - DIRECT - IDCW;105.2349;23-Mar-2026",
+    "119552;INF209K01YM2;-;Aditya Birla Sun Life Banking & PSU Debt Fund - Direct - Growth;N.A.;23-Mar-2026",
+    "Axis Mutual Fund",
+    "120465;INF846K01EW2;-;Axis Large Cap Fund - Direct Plan - Growth;62.11;23-Mar-2026",
+    "120466;INF846K01EX0;-;Axis Gold Fund - Direct Plan - Growth;31.5;22-Mar-2026",
+]
+
+
+class _FakeResponse:
+    def __init__(self, status_code, lines=(), headers=None):
+        self.status_code = status_code
+        self._lines = list(lines)
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self._lines)
+
+
+class _PassThroughBreaker:
+    def call(self, fn, *args, policy=None, **kwargs):
+        return fn(*args, **kwargs)
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    root = str(tmp_path / "amfi")
+    monkeypatch.setattr(mutual_fund_api, "AMFI_SNAPSHOT_DIR", root)
+    mutual_fund_api.fetch_live_amfi_nav_data.clear()
+    yield root
+    mutual_fund_api.fetch_live_amfi_nav_data.clear()
+
+
+def test_parse_navall_builds_columns_and_skips_invalid_rows():
+    columns = mutual_fund_api.parse_navall_lines(NAVALL_SAMPLE)
+    assert columns["scheme_code"].tolist() == ["119551", "120465", "120466"]
+    assert columns["nav"].dtype == np.float64
+    assert columns["nav"].tolist() == [105.2349, 62.11, 31.5]
+    codes, table = columns["amc"]
+    assert table[codes].tolist() == [
+        "Aditya Birla Sun Life Mutual Fund",
+        "Axis Mutual Fund",
+        "Axis Mutual Fund",
+    ]
+    codes, table = columns["date"]
+    assert table[codes].tolist() == ["23-Mar-2026", "23-Mar-2026", "22-Mar-2026"]
+
+
+def test_snapshot_round_trip_is_memory_mapped(tmp_path):
+    root = str(tmp_path / "snap")
+    columns = mutual_fund_api.parse_navall_lines(NAVALL_SAMPLE)
+    version = publish_snapshot(root, columns, dictionary_columns=("date", "amc"), meta={"etag": "abc"})
+
+    assert current_version(root) == version
+    loaded, meta = load_snapshot(root)
+    assert meta["etag"] == "abc"
+    assert isinstance(loaded["nav"], np.memmap)
+    codes, table = columns["amc"]
+    assert loaded["amc"].tolist() == table[codes].tolist()
+
+
+def test_fetch_sends_validators_and_serves_snapshot_on_304(snapshot_dir, mocker):
+    get = mocker.patch(
+        "backend.data.mutual_fund_api.requests.get",
+        return_value=_FakeResponse(200, NAVALL_SAMPLE, {"ETag": '"v1"', "Last-Modified": "Mon, 23 Mar 2026 18:00:00 GMT"}),
+    )
+    first = mutual_fund_api.fetch_amfi_nav_data()
+    assert len(first) == 3
+    assert "If-None-Match" not in get.call_args.kwargs["headers"]
+
+    mutual_fund_api.fetch_live_amfi_nav_data.clear()
+    get.return_value = _FakeResponse(304)
+    second = mutual_fund_api.fetch_amfi_nav_data()
+
+    headers = get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Mon, 23 Mar 2026 18:00:00 GMT"
+    assert second["scheme_name"].tolist() == first["scheme_name"].tolist()
+
+
+def test_fetch_failure_serves_last_snapshot_as_not_live(snapshot_dir, mocker):
+    mocker.patch("backend.data.mutual_fund_api.breaker_for_url", side_effect=lambda url: _PassThroughBreaker())
+    get = mocker.patch("backend.data.mutual_fund_api.requests.get", return_value=_FakeResponse(200, NAVALL_SAMPLE))
+    assert mutual_fund_api.get_mutual_fund_universe()[1] is True
+
+    mutual_fund_api.fetch_live_amfi_nav_data.clear()
+    get.side_effect = mutual_fund_api.requests.exceptions.ConnectionError("down")
+    df, is_live = mutual_fund_api.get_mutual_fund_universe()
+
+    assert is_live is False
+    assert df["scheme_code"].tolist() == ["119551", "120465", "120466"]
+    assert df["amc"].tolist()[0] == "Aditya Birla Sun Life Mutual Fund"
+
+
+def test_empty_response_and_recovery_are_not_served_from_a_stale_memo(snapshot_dir, mocker):
+    mocker.patch("backend.data.mutual_fund_api.breaker_for_url", side_effect=lambda url: _PassThroughBreaker())
+    get = mocker.patch("backend.data.mutual_fund_api.requests.get", return_value=_FakeResponse(200, NAVALL_SAMPLE))
+    assert mutual_fund_api.get_mutual_fund_universe()[1] is True
+
+    mutual_fund_api.fetch_live_amfi_nav_data.clear()
+    get.return_value = _FakeResponse(200, ["<html>Service Unavailable</html>"])
+    df, is_live = mutual_fund_api.get_mutual_fund_universe()
+    assert is_live is False and len(df) == 3  # last snapshot, not an empty universe
+
+    get.return_value = _FakeResponse(200, NAVALL_SAMPLE[:-1])
+    df, is_live = mutual_fund_api.get_mutual_fund_universe()
+    assert is_live is True and len(df) == 2
@@ -0,0 +1,65 @@
+"""
+Tests for backend/data/nav_history_store.py
+"""
+import numpy as np
+import pytest
+
+from backend.data import nav_history_store
+from backend.data.nav_history_store import NavHistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NavHistoryStore(str(tmp_path / "nav_history"))
+
+
+def test_append_and_read_series(store):
+    store.append_snapshot("21-Mar-2026", [101, 102], [10.0, 20.0])
+    store.append_snapshot("23-Mar-2026", [101, 102, 103], [10.5, 19.0, 5.0])
+
+    dates, navs = store.series(101)
+    assert [str(d) for d in dates] == ["2026-03-21", "2026-03-23"]
+    assert navs.tolist() == [10.0, 10.5]
+    assert navs.dtype == np.float32
+
+    # Scheme added on the second day has NaN for the first
+    _, late = store.series(103)
+    assert np.isnan(late[0]) and late[1] == 5.0
+
+
+def test_series_is_a_view_of_the_memory_map(store):
+    store.append_snapshot("2026-03-23", [101], [10.0])
+    _, navs = store.series(101)
+    assert not navs.flags.owndata
+    assert np.shares_memory(navs, store.matrix())
+
+
+def test_per_row_dates_and_out_of_order_days(store):
+    store.append_snapshot("2026-03-23", [101], [10.0])
+    written = store.append_snapshot(
+        ["2026-03-20", "2026-03-23", "2026-03-24"], [101, 102, 101], [9.0, 7.0, 11.0]
+    )
+    # The 20th predates the stored history and is skipped; the 23rd is updated in place
+    assert written == 2
+    assert len(store) == 2
+    assert store.series(102)[1].tolist()[0] == 7.0
+    assert store.series(101)[1].tolist() == [10.0, 11.0]
+
+
+def test_grows_past_initial_scheme_capacity(store, monkeypatch):
+    monkeypatch.setattr(nav_history_store, "_MIN_SCHEME_CAPACITY", 4)
+    store.append_snapshot("2026-03-23", [1, 2, 3], [1.0, 2.0, 3.0])
+    store.append_snapshot("2026-03-24", list(range(1, 11)), [float(i) for i in range(1, 11)])
+    assert store.matrix().shape == (2, 10)
+    assert store.series(3)[1].tolist() == [3.0, 3.0]
+
+
+def test_readonly_reader_sees_appends_after_refresh(store):
+    store.append_snapshot("2026-03-23", [101], [10.0])
+    reader = NavHistoryStore(store.root, readonly=True)
+    old_version = reader.version
+
+    store.append_snapshot("2026-03-24", [101], [10.2])
+    assert reader.refresh()
+    assert reader.version != old_version
+    assert reader.series(101)[1].tolist() == pytest.approx([10.0, 10.2])
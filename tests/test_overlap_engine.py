@@ -0,0 +1,85 @@
+"""
+Tests for backend/engines/intelligence/overlap_engine.py
+"""
+import numpy as np
+import pytest
+
+from backend.engines.intelligence import overlap_engine
+from backend.engines.intelligence.overlap_engine import (
+    build_incidence_matrix,
+    calculate_jaccard_similarity,
+    calculate_portfolio_overlap,
+    parse_holdings,
+    parse_weighted_holdings,
+    weighted_overlap_matrix,
+)
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch):
+    monkeypatch.setattr(overlap_engine, "_OVERLAP_CACHE", overlap_engine.OrderedDict())
+
+
+FUNDS = [
+    {"fund_name": "A", "top_holdings": "TCS, Infosys, HDFC Bank, ICICI Bank"},
+    {"fund_name": "B", "top_holdings": "tcs, Infosys, Wipro"},
+    {"fund_name": "C", "top_holdings": "Reliance, ITC"},
+    {"fund_name": "D", "top_holdings": ""},
+]
+
+
+def test_matrix_matches_pairwise_jaccard():
+    result = calculate_portfolio_overlap(FUNDS)
+    matrix = result["overlap_matrix"]
+    for i, fund_a in enumerate(FUNDS):
+        for j, fund_b in enumerate(FUNDS):
+            expected = 1.0 if i == j else round(calculate_jaccard_similarity(
+                parse_holdings(fund_a["top_holdings"]), parse_holdings(fund_b["top_holdings"])
+            ), 4)
+            assert matrix[i][j] == expected
+    assert result["overlap_method"] == "jaccard"
+    assert result["high_overlap_pairs"] == [{"fund_a": "A", "fund_b": "B", "overlap": 0.4}]
+
+
+def test_incidence_matrix_interns_holdings_once():
+    matrix, vocabulary = build_incidence_matrix([parse_weighted_holdings(f["top_holdings"]) for f in FUNDS])
+    assert matrix.shape == (4, len(vocabulary)) == (4, 7)
+    assert matrix.nnz == 9
+
+
+def test_weighted_overlap_uses_min_of_normalised_weights():
+    funds = [
+        {"fund_name": "A", "top_holdings": {"TCS": 6, "Infosys": 4}},
+        {"fund_name": "B", "top_holdings": {"tcs": 3, "HDFC Bank": 7}},
+        {"fund_name": "C", "top_holdings": {"TCS": 60, "Infosys": 40}},
+    ]
+    result = calculate_portfolio_overlap(funds)
+    assert result["overlap_method"] == "weighted"
+    assert np.allclose(result["overlap_matrix"], [[1.0, 0.3, 1.0], [0.3, 1.0, 0.3], [1.0, 0.3, 1.0]])
+
+    jaccard = calculate_portfolio_overlap(funds, weighted=False)
+    assert jaccard["overlap_matrix"][0][1] == round(1 / 3, 4)
+
+
+def test_results_are_cached_per_fund_set(mocker):
+    compute = mocker.spy(overlap_engine, "_portfolio_overlap")
+    first = calculate_portfolio_overlap(FUNDS)
+    first["overlap_matrix"][0][1] = 99
+    second = calculate_portfolio_overlap([dict(f) for f in FUNDS])
+    assert compute.call_count == 1
+    assert second["overlap_matrix"][0][1] == 0.4
+
+    calculate_portfolio_overlap(FUNDS[::-1])
+    assert compute.call_count == 2
+
+
+def test_weighted_overlap_matrix_matches_brute_force():
+    rng = np.random.default_rng(5)
+    holdings = [
+        {f"s{k}": float(w) for k, w in zip(rng.choice(40, size=rng.integers(0, 12), replace=False), rng.random(12) + 0.1)}
+        for _ in range(25)
+    ]
+    matrix, _ = build_incidence_matrix(holdings)
+    normalised = [{k: w / sum(h.values()) for k, w in h.items()} for h in holdings]
+    expected = [[sum(min(a[k], b[k]) for k in a.keys() & b.keys()) for b in normalised] for a in normalised]
+    np.testing.assert_allclose(weighted_overlap_matrix(matrix), expected, atol=1e-12)
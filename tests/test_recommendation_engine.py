@@ -1,3 +1,5 @@
+import os
+
 import pytest
 import pandas as pd
 from backend.engines.recommendation_engine.quality_filter import apply_quality_filter
@@ -82,3 +84,228 @@ def test_user_matching(mock_fund_data):
     # Aggressive keeps Small Cap
     agg_df = apply_user_matching(df, "Aggressive")
     assert "Small Cap High Risk" in agg_df["scheme_name"].tolist()
+
+def test_category_rules_are_evaluated_once_per_category(mock_fund_data):
+    from backend.engines.recommendation_engine.category_lookup import map_categories
+
+    calls = []
+    categories = mock_fund_data["category"].astype("category")
+    result = map_categories(categories, lambda cat: calls.append(cat) or "small cap" in cat, dtype=bool)
+    assert result.tolist() == [False, False, True, False]
+    assert sorted(calls) == ["", "equity - large cap", "equity - mid cap", "equity - small cap"]
+
+    with_missing = pd.Series(["Debt", None, "Debt"])
+    assert map_categories(with_missing, lambda cat: cat or "missing").tolist() == ["debt", "missing", "debt"]
+
+def test_market_fit_without_category_column():
+    df = pd.DataFrame({"1y": [10.0, 20.0], "3y": [5.0, 6.0], "5y": [4.0, 4.0], "volatility": [0.1, 0.2]})
+    scored = score_funds(df, {"market_trend": "bearish", "volatility": "high"})
+    assert scored["market_fit"].tolist() == [0.5, 0.5]
+
+def test_infer_fund_types_matches_scalar_rule():
+    from backend.data.benchmark_indices import infer_fund_type, infer_fund_types
+
+    names = pd.Series(["Nippon India ETF Nifty 50", "HDFC Gold ETF", "XYZ Exchange Traded Fund", "Axis Bluechip Fund", None])
+    assert infer_fund_types(names).tolist() == [infer_fund_type(n) for n in names]
+
+def test_category_index_slices_and_exclusions():
+    from backend.engines.recommendation_engine.category_index import CategoryIndex
+
+    df = pd.DataFrame({
+        "scheme_code": [1, 2, 3, 4, 5],
+        "category": ["Debt", "Large Cap", "Debt", "Liquid", "Large Cap"],
+        "score": [50.0, 70.0, 90.0, 60.0, float("nan")],
+    })
+    index = CategoryIndex(df["category"], df["score"].to_numpy(), keys=df["scheme_code"].to_numpy())
+
+    assert index.category_rows("Debt").tolist() == [2, 0]
+    assert index.category_rows("Large Cap").tolist() == [1, 4]  # NaN score ranks last
+    debt_like = index.rows(lambda cat: "debt" in cat or "liquid" in cat, key="debt")
+    assert debt_like.tolist() == [2, 3, 0]
+    assert index.rows(lambda cat: False, key="debt") is debt_like  # memoized
+    assert index.top_k(debt_like, 2, exclude={3}).tolist() == [3, 0]
+    assert index.top_k(debt_like, 5, exclude={3, 1}).tolist() == [3]  # keys are scheme codes
+
+@pytest.fixture
+def tiny_universe(tmp_path, monkeypatch):
+    from backend.data.fund_universe_store import FundUniverseStore
+    from backend.engines.recommendation_engine import dynamic_recommender
+
+    csv_path = tmp_path / "mutual_funds.csv"
+    base = {"expense_ratio": 1.0, "aum_crore": 1000.0, "5y": 10.0, "volatility": 0.1, "nav": 10.0, "date": "01-Jan-2026"}
+    pd.DataFrame([
+        {**base, "scheme_code": 1, "scheme_name": "Alpha Large Cap Fund", "category": "Large Cap", "1y": 0.5, "3y": 0.3},
+        {**base, "scheme_code": 2, "scheme_name": "Beta Large Cap Fund", "category": "Large Cap", "1y": 0.2, "3y": 0.2},
+        {**base, "scheme_code": 3, "scheme_name": "Gamma Small Cap Fund", "category": "Small Cap", "1y": 0.6, "3y": 0.4},
+        {**base, "scheme_code": 4, "scheme_name": "Delta Liquid Fund", "category": "Liquid", "1y": 0.1, "3y": 0.1},
+    ]).to_csv(csv_path, index=False)
+    store = FundUniverseStore(str(csv_path))
+    monkeypatch.setattr(dynamic_recommender, "get_fund_universe_store", lambda: store)
+    monkeypatch.setattr(dynamic_recommender, "enrich_with_benchmark_metrics", lambda rec: rec)
+    monkeypatch.setattr(dynamic_recommender, "_RANKED", {"version": None, "frame": None, "indexes": {}})
+    monkeypatch.setattr(dynamic_recommender, "_RESULTS", dynamic_recommender._ResultCache())
+    return csv_path, store
+
+def test_pipeline_picks_from_index_without_repeating_funds(tiny_universe):
+    recs = run_dynamic_pipeline(
+        {"Equity - Large Cap": 0.4, "Equity": 0.3, "Debt": 0.3}, "Conservative", {"market_trend": "neutral"}
+    )
+    assert [r["scheme_code"] for r in recs] == ["1", "2", "4"]
+
+def test_pipeline_skips_share_class_variants_of_picked_funds(tiny_universe, monkeypatch):
+    from backend.engines.intelligence import minhash_index
+
+    variants = minhash_index.MinHashIndex.from_token_sets(
+        {"1": {"alpha", "large", "cap"}, "2": {"alpha", "large", "cap"}, "4": {"delta", "liquid"}}
+    )
+    monkeypatch.setattr(minhash_index, "get_similarity_index", lambda: variants)
+    recs = run_dynamic_pipeline(
+        {"Equity - Large Cap": 0.4, "Equity": 0.3, "Debt": 0.3}, "Conservative", {"market_trend": "neutral"}
+    )
+    assert [r["scheme_code"] for r in recs] == ["1", "4"]
+
+def test_pipeline_results_are_memoized_as_copies(tiny_universe, monkeypatch):
+    from backend.engines.recommendation_engine import dynamic_recommender
+
+    csv_path, store = tiny_universe
+    calls = []
+    build = dynamic_recommender._build_recommendations
+    monkeypatch.setattr(dynamic_recommender, "_build_recommendations", lambda *a: calls.append(a) or build(*a))
+    signals = {"market_trend": "neutral"}
+
+    first = run_dynamic_pipeline({"Equity - Large Cap": 0.4, "Debt": 0.6}, "Conservative", signals)
+    first[0]["name"] = "mutated by caller"
+    second = run_dynamic_pipeline({"Equity - Large Cap": 0.5, "Debt": 0.5, "Gold": 0.0}, "Conservative", signals)
+    assert len(calls) == 1
+    assert second[0]["name"] == "Alpha Large Cap Fund"
+    assert [r["allocation_weight"] for r in second] == [0.5, 0.5]
+
+    run_dynamic_pipeline({"Equity - Large Cap": 0.4, "Debt": 0.6}, "Conservative", {"market_trend": "bullish"})
+    assert len(calls) == 2
+
+    os.utime(csv_path, ns=(1, 1))  # new universe version
+    store.invalidate()
+    run_dynamic_pipeline({"Equity - Large Cap": 0.4, "Debt": 0.6}, "Conservative", signals)
+    assert len(calls) == 3
+
+def test_precomputed_regime_scores_match_score_funds(mock_fund_data):
+    from backend.engines.recommendation_engine.scoring_engine import (
+        REGIMES,
+        regime_score_column,
+        score_all_regimes,
+        signal_regime,
+    )
+
+    all_regimes = score_all_regimes(mock_fund_data)
+    assert len(REGIMES) == 9
+    for trend, volatility in REGIMES:
+        expected = score_funds(mock_fund_data, {"market_trend": trend, "volatility": volatility})["score"]
+        pd.testing.assert_series_equal(
+            all_regimes[regime_score_column((trend, volatility))], expected, check_names=False
+        )
+
+    assert signal_regime({"market_trend": "Bullish", "volatility": "HIGH"}) == ("bullish", "high")
+    assert signal_regime({"market_trend": "sideways"}) == ("neutral", "medium")
+    sideways = score_funds(mock_fund_data, {"market_trend": "sideways", "volatility": "extreme"})["score"]
+    pd.testing.assert_series_equal(all_regimes["score_neutral_medium"], sideways, check_names=False)
+
+def test_batch_matches_single_runs_and_builds_once_per_group(tiny_universe, monkeypatch):
+    from backend.engines.recommendation_engine import dynamic_recommender, suggest_mutual_funds_batch
+
+    calls = []
+    build = dynamic_recommender._build_recommendations
+    monkeypatch.setattr(dynamic_recommender, "_build_recommendations", lambda *a: calls.append(a) or build(*a))
+    signals = {"market_trend": "neutral"}
+    clients = [
+        ("c1", {"Equity - Large Cap": 0.4, "Debt": 0.6}, "Conservative"),
+        ("c2", {"Equity - Large Cap": 0.7, "Debt": 0.3}, "Conservative"),
+        ("c3", {"Equity - Small Cap": 1.0}, "Aggressive"),
+        ("c4", {"Equity - Large Cap": 0.5, "Debt": 0.5}, "Conservative"),
+    ]
+
+    stats = {}
+    results = list(suggest_mutual_funds_batch(clients, market_signals=signals, stats=stats))
+    assert [r["client_id"] for r in results] == ["c1", "c2", "c3", "c4"]
+    assert len(calls) == 2
+    assert stats["clients"] == 4 and stats["clients_per_second"] > 0
+
+    for (client_id, allocation, risk_profile), result in zip(clients, results):
+        assert result["recommendations"] == run_dynamic_pipeline(allocation, risk_profile, signals)
+    assert [r["allocation_weight"] for r in results[1]["recommendations"]] == [0.7, 0.3]
+
+
+def test_batch_endpoint_streams_ndjson(tiny_universe, tmp_path, monkeypatch):
+    import json
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'api.db'}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    from fastapi.testclient import TestClient
+    from backend.api.main import app
+
+    response = TestClient(app).post("/api/recommendations/batch", json={
+        "clients": [
+            {"client_id": 7, "allocation": {"Equity - Large Cap": 1.0}, "risk_profile": "Moderate"},
+            {"client_id": "x", "allocation": {"Debt": 1.0}, "risk_profile": "Conservative"},
+        ],
+        "market_signals": {"market_trend": "neutral", "volatility": "medium"},
+    })
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line.get("client_id") for line in lines[:2]] == [7, "x"]
+    assert lines[0]["recommendations"][0]["scheme_code"] == "1"
+    assert lines[2]["summary"]["clients"] == 2
+
+
+def test_batch_endpoint_writes_missing_metrics_as_null(tmp_path, monkeypatch):
+    import json
+    import numpy as np
+    from backend.engines import recommendation_engine
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'api.db'}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    from fastapi.testclient import TestClient
+    from backend.api.main import app
+
+    fund = {"scheme_code": "1", "sharpe": float("nan"), "alpha_3y": np.float32("nan"), "3y": np.float64(12.5), "5y": float("inf")}
+    monkeypatch.setattr(
+        recommendation_engine, "suggest_mutual_funds_batch",
+        lambda rows, market_signals=None, stats=None: iter([{"client_id": 1, "recommendations": [fund]}]),
+    )
+    response = TestClient(app).post("/api/recommendations/batch", json={
+        "clients": [{"client_id": 1, "allocation": {"Debt": 1.0}, "risk_profile": "Conservative"}],
+    })
+
+    def reject(constant):
+        raise ValueError(f"non-standard JSON constant {constant}")
+
+    lines = [json.loads(line, parse_constant=reject) for line in response.text.splitlines()]
+    assert lines[0]["recommendations"][0] == {"scheme_code": "1", "sharpe": None, "alpha_3y": None, "3y": 12.5, "5y": None}
+
+def test_batch_endpoint_rejects_oversized_batches(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'api.db'}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    from fastapi.testclient import TestClient
+    from backend.api import main
+
+    client = {"allocation": {"Debt": 1.0}, "risk_profile": "Conservative"}
+    response = TestClient(main.app).post(
+        "/api/recommendations/batch", json={"clients": [client] * (main.MAX_BATCH_CLIENTS + 1)}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("is_live_amfi", [True, False])
+def test_published_universe_reports_its_amfi_liveness(tmp_path, monkeypatch, is_live_amfi):
+    import backend.engines.recommendation_engine as recommendation_engine
+    from backend.data.fund_universe_store import FundUniverseStore, publish_fund_universe
+
+    root = str(tmp_path / "fund_universe")
+    frame = pd.DataFrame([{"scheme_code": "1", "scheme_name": "A Large Cap Fund", "category": "Large Cap", "1y": 12.5}])
+    publish_fund_universe(frame, root, meta={"is_live_amfi": is_live_amfi})
+    store = FundUniverseStore(str(tmp_path / "missing.csv"), snapshot_root=root, stat_interval=0)
+    monkeypatch.setattr(recommendation_engine, "get_fund_universe_store", lambda: store)
+
+    df, is_live = recommendation_engine.get_processed_fund_universe()
+    assert len(df) == 1
+    assert is_live is is_live_amfi
@@ -0,0 +1,147 @@
+"""
+Tests for the per-source refresh jobs and the intelligence cache in
+ai_layer/scheduler/updater.py
+"""
+import threading
+from types import MappingProxyType
+
+import pytest
+
+from ai_layer.scheduler import updater
+from data.cache import tiered_cache
+
+
+def _market(price=22500.0, fetched_at="2026-03-23T10:00:00"):
+    return {
+        "nifty": {"price": price, "change_pct": 0.4, "dma_50": 22000.0, "dma_200": 21500.0, "fetched_at": fetched_at},
+        "vix": {"price": 14.0, "change_pct": 0.0},
+        "_meta": {"is_fully_live": True, "fetched_at": fetched_at},
+    }
+
+
+def _macro():
+    return {"cpi_yoy_pct": 5.1, "repo_rate_pct": 6.25, "inflation_trend": "stable", "rate_trend": "stable", "source": "live"}
+
+
+@pytest.fixture
+def sources(monkeypatch, mocker):
+    monkeypatch.setattr(tiered_cache, "_default_cache", tiered_cache.TieredCache(redis_url=None, use_files=False))
+    monkeypatch.setattr(updater, "_SNAPSHOT", MappingProxyType({}))
+    monkeypatch.setattr(updater, "_PUBLISHED_AT", 0.0)
+    monkeypatch.setattr(updater, "_IN_FLIGHT", None)
+    monkeypatch.setattr(updater, "_SOURCE_STATE", {})
+    monkeypatch.setattr(updater, "_SIGNALS_INPUT_FINGERPRINT", None)
+
+    calls = {"market": 0, "macro": 0, "signals": 0}
+    payloads = {"market": _market(), "macro": _macro()}
+
+    def fetcher(name):
+        def fetch():
+            calls[name] += 1
+            return payloads[name]
+        return fetch
+
+    for name in ("market", "macro"):
+        monkeypatch.setitem(updater._SOURCES, name, {**updater._SOURCES[name], "fetch": fetcher(name)})
+
+    from ai_layer.signal_engine import market_signals
+
+    real_generate = market_signals.generate_signals
+
+    def counting_generate(*args):
+        calls["signals"] += 1
+        return real_generate(*args)
+
+    monkeypatch.setattr(market_signals, "generate_signals", counting_generate)
+    return calls, payloads
+
+
+def test_sources_refresh_independently_within_freshness_budget(sources):
+    calls, _ = sources
+    updater._do_refresh()
+    assert calls == {"market": 1, "macro": 1, "signals": 1}
+
+    # A macro job right after start-up is inside its freshness budget
+    updater._refresh_job("macro")
+    assert calls["macro"] == 1
+
+
+def test_signals_recomputed_only_when_inputs_change(sources, monkeypatch):
+    calls, payloads = sources
+    updater._do_refresh()
+
+    # Same prices, new fetch timestamp → no recompute
+    payloads["market"] = _market(fetched_at="2026-03-23T10:20:00")
+    monkeypatch.setitem(updater._SOURCES["market"], "max_age_seconds", 0)
+    updater._refresh_job("market")
+    assert calls["market"] == 2
+    assert calls["signals"] == 1
+
+    payloads["market"] = _market(price=22650.0)
+    updater._refresh_job("market")
+    assert calls["signals"] == 2
+    assert updater.get_cached_intelligence()["signals"]["nifty_price"] == 22650.0
+
+
+def test_failed_job_keeps_previous_data(sources, monkeypatch):
+    calls, _ = sources
+    updater._do_refresh()
+    before = updater.get_cached_intelligence()["signals"]
+
+    def boom():
+        raise RuntimeError("provider down")
+
+    monkeypatch.setitem(updater._SOURCES, "market", {**updater._SOURCES["market"], "fetch": boom, "max_age_seconds": 0})
+    updater._refresh_job("market")
+    assert updater.get_cached_intelligence()["signals"] == before
+
+
+def test_snapshot_is_shared_and_read_only(sources):
+    updater._do_refresh()
+    first = updater.get_cached_intelligence()
+    assert updater.get_cached_intelligence() is first  # no per-read copy
+    with pytest.raises(TypeError):
+        first["signals"] = {}
+
+
+def test_empty_cache_runs_a_single_refresh_for_concurrent_callers(sources, monkeypatch):
+    calls, _ = sources
+    release = threading.Event()
+    real_refresh = updater._do_refresh
+
+    def slow_refresh():
+        release.wait(5)
+        real_refresh()
+
+    monkeypatch.setattr(updater, "_do_refresh", slow_refresh)
+    results = []
+    readers = [threading.Thread(target=lambda: results.append(updater.get_cached_intelligence())) for _ in range(5)]
+    for t in readers:
+        t.start()
+    release.set()
+    for t in readers:
+        t.join(5)
+
+    assert calls["market"] == 1 and calls["macro"] == 1
+    assert len(results) == 5 and all("signals" in r for r in results)
+
+
+def test_stale_snapshot_is_served_while_revalidating(sources, monkeypatch):
+    updater._do_refresh()
+    stale = updater.get_cached_intelligence()
+    monkeypatch.setattr(updater, "_PUBLISHED_AT", updater._PUBLISHED_AT - updater._STALE_AFTER_SECONDS - 1)
+
+    started = []
+    monkeypatch.setattr(updater, "_start_refresh", lambda: started.append(True))
+    assert updater.get_cached_intelligence() is stale
+    assert started == [True]
+
+
+def test_empty_cache_falls_back_to_shared_cache_after_wait(sources, monkeypatch):
+    never = threading.Event()
+    monkeypatch.setattr(updater, "_start_refresh", lambda: never)
+    tiered_cache.get_intelligence_cache().set("signals", {"market_trend": "neutral"})
+    tiered_cache.get_intelligence_cache().set("macro", {"source": "fallback"})
+
+    result = updater.get_cached_intelligence(wait_timeout=0.01)
+    assert result["signals"] == {"market_trend": "neutral"}
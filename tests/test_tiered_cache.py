@@ -0,0 +1,210 @@
+"""
+Tests for data/cache/tiered_cache.py
+"""
+import pandas as pd
+import pytest
+
+from data.cache import cache_manager, tiered_cache
+from data.cache.cache_manager import _CacheFile
+from data.cache.tiered_cache import TieredCache
+
+
+class _FakePipeline:
+    def __init__(self, store):
+        self.store, self.ops = store, []
+
+    def get(self, key):
+        self.ops.append(lambda: self.store.data.get(key))
+        return self
+
+    def ttl(self, key):
+        self.ops.append(lambda: self.store.ttls.get(key, -2))
+        return self
+
+    def hmget(self, key, fields):
+        self.ops.append(lambda: self.store.hmget(key, fields))
+        return self
+
+    def delete(self, key):
+        self.ops.append(lambda: self.store.delete(key))
+        return self
+
+    def hset(self, key, mapping):
+        self.ops.append(lambda: self.store.hashes.setdefault(key, {}).update(mapping))
+        return self
+
+    def expire(self, key, seconds):
+        self.ops.append(lambda: self.store.ttls.__setitem__(key, seconds))
+        return self
+
+    def execute(self):
+        return [op() for op in self.ops]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data, self.ttls, self.hashes = {}, {}, {}
+        self.hget_calls = 0
+
+    def set(self, key, value, ex=None):
+        self.data[key], self.ttls[key] = value, ex
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+        self.hashes.pop(key, None)
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def hget(self, key, field):
+        self.hget_calls += 1
+        return self.hashes.get(key, {}).get(field)
+
+    def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(f) for f in fields]
+
+
+@pytest.fixture
+def signals_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_manager, "_SIGNALS_CACHE", _CacheFile(tmp_path / "signals_cache.json"))
+    return tmp_path / "signals_cache.json"
+
+
+def _cache(redis=None, **kwargs):
+    cache = TieredCache(redis_url="redis://fake" if redis is not None else None, **kwargs)
+    cache._redis = redis
+    return cache
+
+
+def test_write_through_and_l1_hits(signals_file):
+    redis = _FakeRedis()
+    cache = _cache(redis)
+    version = cache.set("signals", {"market_trend": "bullish"})
+
+    assert redis.data["intel:v1:signals"]
+    assert signals_file.exists()
+    assert cache.get_entry("signals") == ({"market_trend": "bullish"}, version)
+    assert cache.get("signals") == {"market_trend": "bullish"}
+
+    stats = cache.stats()
+    assert stats["l1_hits"] == 2 and stats["l1_hit_rate"] == 1.0
+
+
+def test_other_process_reads_through_redis_then_l1(signals_file):
+    redis = _FakeRedis()
+    _cache(redis).set("signals", {"market_trend": "bearish"})
+
+    reader = _cache(redis, use_files=False)
+    assert reader.get("signals") == {"market_trend": "bearish"}
+    assert reader.get("signals") == {"market_trend": "bearish"}
+    stats = reader.stats()
+    assert (stats["l2_hits"], stats["l1_hits"]) == (1, 1)
+
+
+def test_file_tier_serves_restarts_and_stale_reads(signals_file, monkeypatch):
+    _cache().set("signals", {"market_trend": "neutral"})
+
+    fresh_process = _cache()
+    assert fresh_process.get("signals") == {"market_trend": "neutral"}
+    assert fresh_process.stats()["l3_hits"] == 1
+
+    monkeypatch.setitem(tiered_cache.DEFAULT_TTLS, "signals", -1)
+    expired = _cache()
+    assert expired.get("signals") is None
+    assert expired.get("signals", allow_stale=True) == {"market_trend": "neutral"}
+
+
+def test_unchanged_macro_is_not_rewritten(tmp_path, monkeypatch, mocker):
+    monkeypatch.setattr(
+        cache_manager, "_MACRO_CACHE",
+        _CacheFile(tmp_path / "macro_cache.json", transform=cache_manager._normalize_macro_entry),
+    )
+    write = mocker.spy(cache_manager, "_write_json")
+    cache = _cache()
+    cache.set("macro", {"cpi_yoy_pct": 5.2, "source": "FRED"})
+    cache.set("macro", {"cpi_yoy_pct": 5.2, "source": "FRED"})
+    assert write.call_count == 1
+
+    cache.set("macro", {"cpi_yoy_pct": 5.4, "source": "FRED"})
+    assert write.call_count == 2
+
+
+def test_l1_is_bounded_lru():
+    cache = _cache(use_files=False, l1_max_entries=2)
+    for name in ("a", "b", "c"):
+        cache.set(name, name, persist=False)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+
+
+def test_codec_round_trip_and_compression():
+    small = {"market_trend": "bullish"}
+    large = {"rows": [{"scheme": i, "score": i / 7} for i in range(200)]}
+    assert tiered_cache.decode_value(tiered_cache.encode_value(small)) == small
+    encoded = tiered_cache.encode_value(large)
+    assert encoded[:1] == b"z" and len(encoded) < len(str(large))
+    assert tiered_cache.decode_value(encoded) == large
+
+
+def test_sections_are_separate_fields_with_a_version():
+    redis = _FakeRedis()
+    version = _cache(redis).set_sections("latest", {"signals": {"trend": "up"}, "market": {"nifty": 1}})
+
+    fields = redis.hashes["intel:v1:latest:fields"]
+    assert set(fields) == {"signals", "market", "_version"}
+    assert version == 1 and fields["_version"] == b"1"
+
+    reader = _cache(redis, use_files=False)
+    assert reader.get_version("latest") == 1
+    assert reader.get_section("latest", "signals") == {"trend": "up"}
+    assert reader.get_sections("latest", ("market", "missing")) == ({"market": {"nifty": 1}}, 1)
+
+
+def test_unchanged_sections_are_reused_without_decoding(monkeypatch):
+    redis = _FakeRedis()
+    writer = _cache(redis)
+    writer.set_sections("latest", {"signals": {"trend": "up"}})
+
+    reader = _cache(redis, use_files=False, l1_ttl=0)
+    assert reader.get_section("latest", "signals") == {"trend": "up"}
+
+    monkeypatch.setattr(tiered_cache, "decode_value", lambda raw: pytest.fail("re-decoded"))
+    assert reader.get_section("latest", "signals") == {"trend": "up"}
+    assert reader.stats()["reused_sections"] == 1
+
+    monkeypatch.undo()
+    writer.set_sections("latest", {"signals": {"trend": "down"}})
+    assert reader.get_version("latest") == 2
+    assert reader.get_section("latest", "signals") == {"trend": "down"}
+
+
+def test_sections_without_redis_stay_in_process():
+    cache = _cache(use_files=False, l1_ttl=0)
+    version = cache.set_sections("latest", {"signals": {"trend": "up"}})
+    assert cache.get_version("latest") == version
+    assert cache.get_section("latest", "signals") == {"trend": "up"}
+    assert _cache(use_files=False).get_section("latest", "signals") is None
+
+
+def test_legacy_producers_and_consumers_share_the_cache(signals_file, tmp_path, monkeypatch):
+    from backend.data.market_data_fetcher import MarketDataFetcher
+    from backend.engines.v1 import recommendation_engine as v1_engine
+
+    monkeypatch.setattr(cache_manager, "_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(cache_manager, "_NAMED_FILES", {})
+    cache = _cache()
+    monkeypatch.setattr(tiered_cache, "_default_cache", cache)
+
+    # What storage.save writes is what the v1 engine reads
+    cache.set("signals", {"market_trend": "bearish", "signal_source": "live"})
+    assert v1_engine._get_signals_with_fallback()["market_trend"] == "bearish"
+
+    fetcher = MarketDataFetcher()
+    monkeypatch.setattr(fetcher, "compute_statistics", lambda: ({"Gold": {"return": 0.09}}, pd.DataFrame()))
+    fetcher.save_computed_stats(str(tmp_path / "live_assumptions.json"))
+    assert _cache().get("market_data") == {"stats": {"Gold": {"return": 0.09}}, "correlation_matrix": {}}
+    assert (tmp_path / "market_data_cache.json").exists()